@@ -7,13 +7,19 @@ Dijkstra interactivo paso a paso en estilo "tabla de video":
           marcarlo como visitado,
           relajar a sus vecinos y mostrar qué distancias CAMBIAN
           o NO CAMBIAN.
+- Modo bidireccional (origen → destino): dos búsquedas, una desde cada
+  extremo, con sus fronteras en colores distintos; termina cuando se
+  encuentran.
+- Cambiar el peso de una arista: el árbol de caminos mínimos del origen
+  se repara solo donde hace falta (caminos_dinamicos), sin repetir
+  Dijkstra completo.
 
 Requisitos:
     pip install matplotlib networkx
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
 
 import matplotlib
@@ -23,7 +29,14 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 import networkx as nx
 import math
-import heapq   # cola de prioridad
+
+from motor_caminos import CSRGraph, dijkstra_events, bidirectional_dijkstra_events
+from traza_pasos import DijkstraTrace, StepProducer
+from cache_resultados import GraphVersion, ResultCache
+from caminos_dinamicos import DynamicSSSP
+from carga_aristas import parse_edge_text, load_edges
+from capa_estatica import StaticGraphLayer, edge_layer
+from cache_posiciones import LayoutCache
 
 
 class DijkstraApp:
@@ -34,9 +47,14 @@ class DijkstraApp:
         # Grafo y estados
         self.G = nx.Graph()
         self.pos = {}
-        self.steps = []        # lista de iteraciones
-        self.current_step = -1
+        self.layouts = LayoutCache()   # posiciones guardadas en disco por firma del grafo
+        self.producer = None   # productor perezoso de pasos (DijkstraTrace)
         self.source = None
+        self.sssp = None       # árbol de caminos mínimos reparable (DynamicSSSP)
+
+        # Trazas ya calculadas por (versión del grafo, origen)
+        self.graph_version = GraphVersion()
+        self.cache = ResultCache(max_entries=32, max_bytes=128 * 1024 * 1024)
 
         self._create_widgets()
         self._create_matplotlib_canvas()
@@ -83,7 +101,13 @@ D E 2"""
             controls_frame,
             text="Construir grafo",
             command=self.build_graph
-        ).pack(fill=tk.X, pady=(0, 10))
+        ).pack(fill=tk.X)
+
+        ttk.Button(
+            controls_frame,
+            text="Cargar aristas de archivo...",
+            command=self.load_edges_file
+        ).pack(fill=tk.X, pady=(2, 10))
 
         # Nodo origen
         ttk.Label(controls_frame, text="Nodo origen para Dijkstra:").pack(anchor="w")
@@ -91,6 +115,18 @@ D E 2"""
         self.entry_source.insert(0, "A")
         self.entry_source.pack(anchor="w", pady=(0, 5))
 
+        # Modo bidireccional (consulta origen → destino)
+        self.bidirectional_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            controls_frame,
+            text="Bidireccional (origen → destino)",
+            variable=self.bidirectional_var
+        ).pack(anchor="w")
+        ttk.Label(controls_frame, text="Nodo destino (modo bidireccional):").pack(anchor="w")
+        self.entry_target = ttk.Entry(controls_frame, width=10)
+        self.entry_target.insert(0, "E")
+        self.entry_target.pack(anchor="w", pady=(0, 5))
+
         # Botones Dijkstra
         buttons_frame = ttk.Frame(controls_frame)
         buttons_frame.pack(fill=tk.X, pady=(5, 5))
@@ -107,12 +143,34 @@ D E 2"""
             command=self.reset_steps
         ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
 
-        # Siguiente paso
+        # Paso anterior / siguiente
+        step_frame = ttk.Frame(controls_frame)
+        step_frame.pack(fill=tk.X, pady=(5, 10))
+
         ttk.Button(
-            controls_frame,
+            step_frame,
+            text="Paso anterior",
+            command=self.prev_step
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X)
+
+        ttk.Button(
+            step_frame,
             text="Paso siguiente",
             command=self.next_step
-        ).pack(fill=tk.X, pady=(5, 10))
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
+
+        # Cambio de peso con reparación incremental
+        ttk.Label(controls_frame, text="Cambiar peso (origen destino peso):").pack(anchor="w")
+        weight_frame = ttk.Frame(controls_frame)
+        weight_frame.pack(fill=tk.X, pady=(0, 10))
+        self.entry_edge_update = ttk.Entry(weight_frame, width=14)
+        self.entry_edge_update.insert(0, "C E 3")
+        self.entry_edge_update.pack(side=tk.LEFT)
+        ttk.Button(
+            weight_frame,
+            text="Actualizar peso",
+            command=self.update_edge_weight
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
 
         # Estado textual
         ttk.Label(controls_frame, text="Tabla de distancias / pasos:").pack(anchor="w")
@@ -124,15 +182,13 @@ D E 2"""
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Capa estática en caché + blitting por paso
+        self.layer = StaticGraphLayer(self.fig, self.ax, self.canvas)
+
     # -----------------------------------------------------------
     # Construcción del grafo
     # -----------------------------------------------------------
     def build_graph(self):
-        self.G.clear()
-        self.steps.clear()
-        self.current_step = -1
-        self.source = None
-
         # Nodos
         nodes_text = self.entry_nodes.get().strip()
         if not nodes_text:
@@ -142,7 +198,6 @@ D E 2"""
         if not nodes:
             messagebox.showerror("Error", "La lista de nodos no es válida.")
             return
-        self.G.add_nodes_from(nodes)
 
         # Aristas
         edges_text = self.text_edges.get("1.0", tk.END).strip()
@@ -150,41 +205,60 @@ D E 2"""
             messagebox.showerror("Error", "Debes ingresar al menos una arista.")
             return
 
-        for line in edges_text.splitlines():
-            parts = line.split()
-            if len(parts) != 3:
-                messagebox.showerror(
-                    "Error",
-                    f"La línea '{line}' no tiene formato 'u v peso'."
-                )
-                return
-            u, v, w = parts
-            if u not in self.G.nodes or v not in self.G.nodes:
-                messagebox.showerror(
-                    "Error",
-                    f"Los nodos '{u}' o '{v}' de la línea '{line}' no están en la lista de nodos."
-                )
-                return
-            try:
-                weight = float(w)
-            except ValueError:
-                messagebox.showerror(
-                    "Error",
-                    f"El peso '{w}' en la línea '{line}' no es un número."
-                )
-                return
-            self.G.add_edge(u, v, weight=weight)
+        edges = parse_edge_text(edges_text, nodes=nodes)
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        self._install_graph(edges)
+
+    def load_edges_file(self):
+        """Lista de aristas desde archivo (texto, CSV o binario); los nodos salen del archivo."""
+        path = filedialog.askopenfilename(
+            title="Lista de aristas",
+            filetypes=[("Listas de aristas", "*.txt *.csv *.edgb"), ("Todos", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            edges = load_edges(path)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        if len(edges.nodes) == 0:
+            messagebox.showerror("Error", "El archivo no tiene aristas.")
+            return
+        self._install_graph(edges)
+
+    def _install_graph(self, edges):
+        self.G.clear()
+        self.producer = None
+        self.source = None
+        self.sssp = None
+
+        nodes = edges.nodes.names
+        self.G.add_nodes_from(nodes)
+        self.G.add_weighted_edges_from(edges.named_edges())
 
         # Posiciones para dibujar
         if len(self.G.nodes) > 1:
-            self.pos = nx.spring_layout(self.G, seed=42)
+            self.pos = self.layouts.layout(self.G, previous=self.pos, seed=42)
         else:
             self.pos = {nodes[0]: (0, 0)}
+        self.layer.invalidate()
 
+        self._sync_graph_version()
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Grafo construido correctamente.\n")
 
+    def _sync_graph_version(self):
+        """Sube la versión solo si el grafo cambió; libera trazas viejas."""
+        if self.graph_version.update(self.G):
+            self.cache.retain_version(self.graph_version.version)
+
     # -----------------------------------------------------------
     # Dijkstra con cola de prioridad
     # -----------------------------------------------------------
@@ -201,36 +275,51 @@ D E 2"""
             )
             return
 
+        if self.bidirectional_var.get():
+            target = self.entry_target.get().strip()
+            if target not in self.G.nodes:
+                messagebox.showerror(
+                    "Error",
+                    f"El nodo destino '{target}' no existe en el grafo."
+                )
+                return
+            self.producer = StepProducer(self._iter_bidirectional_steps(self.G, source, target))
+        else:
+            # Mismo grafo y mismo origen: se reutiliza la traza ya grabada
+            self._sync_graph_version()
+            self.producer = self.cache.get_or_compute(
+                (self.graph_version.version, "dijkstra", source),
+                lambda: self._make_dijkstra_producer(self.G, source)
+            )
+            self.producer.rewind()
+
         self.source = source
-        self.steps = self._compute_dijkstra_iterations(self.G, source)
-        if not self.steps:
+        if self.producer.forward() is None:
             messagebox.showinfo(
                 "Información",
                 "No se pudieron generar pasos para Dijkstra."
             )
             return
 
-        self.current_step = 0
         self.show_current_step()
 
     def reset_steps(self):
-        self.current_step = -1
-        self.steps = []
+        self.producer = None
         self.source = None
+        self.sssp = None
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Estados reiniciados.\n")
 
     def next_step(self):
-        if not self.steps:
+        if self.producer is None:
             messagebox.showinfo(
                 "Información",
                 "Primero inicia Dijkstra (botón 'Iniciar Dijkstra')."
             )
             return
 
-        if self.current_step < len(self.steps) - 1:
-            self.current_step += 1
+        if self.producer.forward() is not None:
             self.show_current_step()
         else:
             messagebox.showinfo(
@@ -238,9 +327,91 @@ D E 2"""
                 "Ya estás en el último paso."
             )
 
-    def _compute_dijkstra_iterations(self, G, source):
+    def prev_step(self):
+        if self.producer is None:
+            messagebox.showinfo(
+                "Información",
+                "Primero inicia Dijkstra (botón 'Iniciar Dijkstra')."
+            )
+            return
+
+        if self.producer.back() is not None:
+            self.show_current_step()
+        else:
+            messagebox.showinfo(
+                "Información",
+                "Ya estás en el primer paso."
+            )
+
+    # -----------------------------------------------------------
+    # Cambio de peso de una arista (actualización dinámica)
+    # -----------------------------------------------------------
+    def update_edge_weight(self):
+        parts = self.entry_edge_update.get().split()
+        if len(parts) != 3:
+            messagebox.showerror("Error", "Escribe el cambio como 'u v peso'.")
+            return
+        u, v, w = parts
+        if u not in self.G.nodes or v not in self.G.nodes:
+            messagebox.showerror(
+                "Error",
+                f"Los nodos '{u}' o '{v}' no están en el grafo."
+            )
+            return
+        try:
+            weight = float(w)
+        except ValueError:
+            messagebox.showerror("Error", f"El peso '{w}' no es un número.")
+            return
+
+        if self.source is None:
+            # Sin origen todavía: solo se cambia el grafo
+            self.G.add_edge(u, v, weight=weight)
+            self._after_edge_update()
+            self.layer.invalidate()
+            self.draw_graph()
+            return
+
+        if self.sssp is None or self.sssp.source != self.source:
+            self.sssp = DynamicSSSP(self.G, self.source)
+        changed = self.sssp.set_weight(u, v, weight)
+        self._after_edge_update()
+        self.layer.invalidate()    # cambian las etiquetas de peso
+
+        # Los pasos grabados ya no corresponden al grafo: se muestra el
+        # estado final reparado.
+        self.producer = None
+        dist, prev = self.sssp.dist, self.sssp.prev
+        step = {
+            "action": "dynamic",
+            "iter_num": None,
+            "current": None,
+            "edge": (u, v, weight),
+            "visited": {n for n in self.G.nodes if dist[n] != math.inf},
+            "dist": dist,
+            "prev": prev,
+            "updates": [(n, old, new, True) for n, (old, new) in sorted(changed.items())],
+            "highlight_edges": [(prev[n], n) for n in changed if prev[n] is not None],
+        }
+        self.draw_graph(step)
+        self.update_state_text(step)
+
+    def _after_edge_update(self):
+        """Deja el texto de aristas igual al grafo y sube su versión."""
+        self.text_edges.delete("1.0", tk.END)
+        self.text_edges.insert(tk.END, "\n".join(
+            f"{a} {b} {d['weight']:g}" for a, b, d in self.G.edges(data=True)
+        ))
+        self._sync_graph_version()
+
+    def _make_dijkstra_producer(self, G, source):
         """
-        Dijkstra usando cola de prioridad (heapq).
+        Dijkstra usando cola de prioridad (heapq) del motor sin interfaz
+        (motor_caminos.dijkstra_events) sobre el grafo en formato CSR.
+
+        Devuelve una DijkstraTrace (traza_pasos) perezosa: cada iteración
+        se calcula cuando forward() la pide y se guarda solo como delta
+        (nodo fijado + relajaciones); trace[k] reconstruye el paso k:
 
         - step 0: acción 'init'
         - step k: acción 'iter', contiene:
@@ -251,128 +422,124 @@ D E 2"""
              * updates: lista de (v, dist_v_antes, dist_v_despues, changed)
              * highlight_edges: aristas (u, v) que se relajaron y CAMBIARON
         """
-        dist = {n: math.inf for n in G.nodes}
-        prev = {n: None for n in G.nodes}
-        dist[source] = 0.0
-
-        visited = set()
-        steps = []
-
-        # Paso 0: inicialización
-        steps.append({
-            "action": "init",
-            "iter_num": 0,
-            "current": None,
-            "visited": visited.copy(),
-            "dist": dist.copy(),
-            "prev": prev.copy(),
-            "updates": [],
-            "highlight_edges": []
-        })
-
-        # Cola de prioridad: (distancia, nodo)
-        pq = []
-        heapq.heappush(pq, (0.0, source))
-
-        iter_num = 1
-
-        while pq:
-            current_dist, u = heapq.heappop(pq)
-
-            # Si ya está visitado o desactualizado, lo ignoramos
-            if u in visited:
-                continue
-            if current_dist > dist[u]:
-                continue
-
-            updates = []
-            highlight_edges = []
-
-            # Relajar vecinos no visitados
-            for v, data in G[u].items():
-                if v in visited:
-                    continue
-
-                w = data.get("weight", 1.0)
-                old = dist[v]
-                new = dist[u] + w
-
-                if new < old:
-                    dist[v] = new
-                    prev[v] = u
-                    updates.append((v, old, new, True))   # CAMBIA
-                    highlight_edges.append((u, v))
-                    heapq.heappush(pq, (new, v))
-                else:
-                    updates.append((v, old, new, False))  # NO CAMBIA
-
-            visited.add(u)
-
-            steps.append({
-                "action": "iter",
+        # Índices en orden alfabético: así los empates en la cola se
+        # resuelven por nombre, igual que con (distancia, nodo).
+        graph = CSRGraph.from_networkx(G, nodes=sorted(G.nodes))
+        names = graph.nodes
+
+        events = (
+            (names[u_idx],
+             [(names[v_idx], old, new, changed) for v_idx, old, new, changed in relaxed])
+            for u_idx, relaxed in dijkstra_events(graph, graph.index[source])
+        )
+        return DijkstraTrace(G.nodes, source, events=events)
+
+    def _iter_bidirectional_steps(self, G, source, target):
+        """
+        Pasos del Dijkstra bidireccional (motor_caminos), con nombres:
+
+        - mode: 'bidirectional'
+        - side: 'origen' o 'destino' (búsqueda que avanzó en este paso)
+        - visited_f / visited_b: fijados por cada búsqueda
+        - frontier_f / frontier_b: alcanzados pero aún no fijados
+        - dist_f / dist_b, prev_f / prev_b: solo los nodos alcanzados
+        - best, meet: mejor distancia origen→destino y nodo de encuentro
+        - path: ruta final (solo en el último paso)
+        """
+        graph = CSRGraph.from_networkx(G, nodes=sorted(G.nodes))
+        names = graph.nodes
+        visited = (set(), set())
+
+        def snapshot(event, action, iter_num):
+            dist, prev = event["dist"], event["prev"]
+            tables = []
+            for s in (0, 1):
+                d = {names[i]: x for i, x in enumerate(dist[s]) if x != math.inf}
+                p = {names[i]: (names[x] if x != -1 else None)
+                     for i, x in enumerate(prev[s]) if dist[s][i] != math.inf}
+                tables.append((d, p))
+            current = names[event["current"]] if event["current"] is not None else None
+            side = event["side"]
+            if current is not None:
+                visited[side].add(current)
+            return {
+                "action": action,
+                "mode": "bidirectional",
                 "iter_num": iter_num,
-                "current": u,
-                "visited": visited.copy(),
-                "dist": dist.copy(),
-                "prev": prev.copy(),
-                "updates": updates,
-                "highlight_edges": highlight_edges
-            })
+                "side": None if side is None else ("origen", "destino")[side],
+                "current": current,
+                "source": source,
+                "target": target,
+                "visited_f": set(visited[0]),
+                "visited_b": set(visited[1]),
+                "frontier_f": set(tables[0][0]) - visited[0],
+                "frontier_b": set(tables[1][0]) - visited[1],
+                "dist_f": tables[0][0], "prev_f": tables[0][1],
+                "dist_b": tables[1][0], "prev_b": tables[1][1],
+                "updates": [(names[v], old, new, ch) for v, old, new, ch in event["updates"]],
+                "highlight_edges": [(current, names[v]) for v, _, _, ch in event["updates"] if ch],
+                "best": event["best"],
+                "meet": names[event["meet"]] if event["meet"] != -1 else None,
+                "path": [names[i] for i in event.get("path", [])],
+            }
+
+        i_s, i_t = graph.index[source], graph.index[target]
+        yield {
+            "action": "init", "mode": "bidirectional", "iter_num": 0,
+            "side": None, "current": None, "source": source, "target": target,
+            "visited_f": set(), "visited_b": set(),
+            "frontier_f": {source}, "frontier_b": {target},
+            "dist_f": {source: 0.0}, "prev_f": {source: None},
+            "dist_b": {target: 0.0}, "prev_b": {target: None},
+            "updates": [], "highlight_edges": [],
+            "best": 0.0 if source == target else math.inf,
+            "meet": source if source == target else None, "path": [],
+        }
 
+        iter_num = 1
+        for event in bidirectional_dijkstra_events(graph, i_s, i_t):
+            action = "final" if event["finished"] else "iter"
+            yield snapshot(event, action, iter_num)
             iter_num += 1
 
-            if len(visited) == len(G.nodes):
-                break
-
-        return steps
-
     # -----------------------------------------------------------
     # Visualización
     # -----------------------------------------------------------
     def show_current_step(self):
-        if self.current_step < 0 or self.current_step >= len(self.steps):
+        if self.producer is None or self.producer.current is None:
             return
-        step = self.steps[self.current_step]
+        step = self.producer.current
         self.draw_graph(step)
         self.update_state_text(step)
 
     def draw_graph(self, step=None):
-        self.ax.clear()
-
-        if not self.pos:
-            self.canvas.draw()
-            return
-
         visited = set()
         current = None
         prev = None
         highlight_edges = []
+        bidirectional = step is not None and step.get("mode") == "bidirectional"
 
         if step is not None:
-            visited = step["visited"]
             current = step["current"]
-            prev = step["prev"]
             highlight_edges = step["highlight_edges"]
+            if not bidirectional:
+                visited = step["visited"]
+                prev = step["prev"]
 
-        # Colores de nodos
-        node_colors = []
+        # Colores de nodos (solo los que no quedan en azul)
+        node_colors = {}
         for n in self.G.nodes:
-            if n == current:
-                node_colors.append("#ff9800")  # naranja
+            if bidirectional:
+                color = self._bidirectional_color(step, n)
+            elif n == current:
+                color = "#ff9800"  # naranja
             elif n in visited:
-                node_colors.append("#8bc34a")  # verde
+                color = "#8bc34a"  # verde
             else:
-                node_colors.append("#90caf9")  # azul
-
-        nx.draw_networkx_nodes(self.G, self.pos, node_color=node_colors, ax=self.ax)
-        nx.draw_networkx_labels(self.G, self.pos, ax=self.ax)
-
-        # Todas las aristas en gris
-        nx.draw_networkx_edges(self.G, self.pos, edge_color="#9e9e9e", ax=self.ax)
+                continue           # azul (color base de la capa estática)
+            node_colors[n] = color
 
-        # Pesos
-        edge_labels = {(u, v): f'{d["weight"]}' for u, v, d in self.G.edges(data=True)}
-        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels=edge_labels, ax=self.ax)
+        layers = []
 
         # Árbol de caminos mínimos SOLO con nodos visitados
         if step is not None and prev is not None:
@@ -380,32 +547,105 @@ D E 2"""
             for v, u in prev.items():
                 if u is not None and v in visited:
                     tree_edges.append((u, v))
-            if tree_edges:
-                nx.draw_networkx_edges(
-                    self.G, self.pos,
-                    edgelist=tree_edges,
-                    width=3,
-                    edge_color="#4caf50",
-                    ax=self.ax
-                )
+            layers.append(edge_layer(tree_edges, "#4caf50", width=3))
+
+        # Bidireccional: árbol de cada búsqueda y ruta final
+        if bidirectional:
+            for prev_side, visited_side, color in (
+                (step["prev_f"], step["visited_f"], "#4caf50"),
+                (step["prev_b"], step["visited_b"], "#9c27b0"),
+            ):
+                tree_edges = [(u, v) for v, u in prev_side.items()
+                              if u is not None and v in visited_side]
+                layers.append(edge_layer(tree_edges, color, width=3))
+            route = step["path"]
+            layers.append(edge_layer(zip(route, route[1:]), "#ff9800", width=5))
 
         # Aristas relajadas que cambiaron en esta iteración
-        if highlight_edges:
-            nx.draw_networkx_edges(
-                self.G, self.pos,
-                edgelist=highlight_edges,
-                width=4,
-                edge_color="#f44336",
-                ax=self.ax
+        layers.append(edge_layer(highlight_edges, "#f44336", width=4))
+
+        self.layer.render(self.G, self.pos, node_colors, layers)
+
+    def _bidirectional_color(self, step, n):
+        """Color de un nodo en modo bidireccional."""
+        if n == step["current"]:
+            return "#ff9800"  # naranja: nodo fijado en este paso
+        if n == step["meet"]:
+            return "#f44336"  # rojo: mejor punto de encuentro
+        if n in step["visited_f"]:
+            return "#8bc34a"  # verde: fijado desde el origen
+        if n in step["visited_b"]:
+            return "#ba68c8"  # morado: fijado desde el destino
+        if n in step["frontier_f"]:
+            return "#dcedc8"  # verde claro: frontera del origen
+        if n in step["frontier_b"]:
+            return "#e1bee7"  # morado claro: frontera del destino
+        return "#90caf9"      # azul: sin explorar
+
+    def _update_bidirectional_text(self, step):
+        def fmt(d):
+            return "∞" if d == math.inf else f"{d:.2f}"
+
+        action = step["action"]
+        if action == "init":
+            self.text_state.insert(tk.END, "Paso 0: INICIALIZACIÓN (bidireccional)\n")
+            self.text_state.insert(
+                tk.END,
+                f"Búsqueda desde {step['source']} (verde) y desde {step['target']} (morado).\n"
+            )
+        elif action == "final":
+            self.text_state.insert(tk.END, "FIN: las dos fronteras se encontraron.\n")
+        else:
+            self.text_state.insert(
+                tk.END,
+                f"Paso {step['iter_num']}: avanza la búsqueda desde el {step['side']}\n"
+            )
+            self.text_state.insert(tk.END, f"Nodo fijado: {step['current']}\n")
+
+        self.text_state.insert(tk.END, "-" * 30 + "\n")
+        self.text_state.insert(tk.END, f"Fijados desde origen: {sorted(step['visited_f'])}\n")
+        self.text_state.insert(tk.END, f"Fijados desde destino: {sorted(step['visited_b'])}\n")
+        self.text_state.insert(
+            tk.END,
+            f"Mejor distancia conocida: {fmt(step['best'])} (encuentro en {step['meet']})\n"
+        )
+
+        if action == "iter":
+            self.text_state.insert(tk.END, "-" * 30 + "\n")
+            for v, old, new, changed in step["updates"]:
+                if changed:
+                    self.text_state.insert(tk.END, f"✔ dist[{v}] CAMBIA de {fmt(old)} → {fmt(new)}\n")
+                else:
+                    self.text_state.insert(tk.END, f"✘ dist[{v}] NO CAMBIA ({fmt(old)} ≤ {fmt(new)})\n")
+
+        if action == "final":
+            if step["path"]:
+                self.text_state.insert(
+                    tk.END,
+                    f"\nCamino mínimo: {' → '.join(step['path'])} | distancia = {fmt(step['best'])}\n"
+                )
+            else:
+                self.text_state.insert(tk.END, "\nNo existe camino entre origen y destino.\n")
+            total = len(step["visited_f"]) + len(step["visited_b"])
+            self.text_state.insert(
+                tk.END,
+                f"Nodos fijados: {total} de {self.G.number_of_nodes()}\n"
             )
 
-        self.ax.set_axis_off()
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self.text_state.insert(tk.END, "\nNodo | dist origen | dist destino\n")
+        self.text_state.insert(tk.END, "----------------------------------\n")
+        for n in sorted(self.G.nodes):
+            d_f = fmt(step["dist_f"].get(n, math.inf))
+            d_b = fmt(step["dist_b"].get(n, math.inf))
+            self.text_state.insert(tk.END, f" {n:>4} | {d_f:>11} | {d_b:>12}\n")
 
     def update_state_text(self, step):
         self.text_state.delete("1.0", tk.END)
 
+        if step.get("mode") == "bidirectional":
+            self._update_bidirectional_text(step)
+            return
+
         action = step["action"]
         iter_num = step["iter_num"]
         current = step["current"]
@@ -417,16 +657,26 @@ D E 2"""
         if action == "init":
             self.text_state.insert(tk.END, "Paso 0: INICIALIZACIÓN\n")
             self.text_state.insert(tk.END, "Todas las distancias = ∞ excepto el origen.\n")
+        elif action == "dynamic":
+            u, v, w = step["edge"]
+            self.text_state.insert(tk.END, f"Peso ({u}, {v}) = {w:g}: árbol reparado\n")
+            self.text_state.insert(tk.END, f"Nodos con distancia nueva: {len(updates)}\n")
         else:
             self.text_state.insert(tk.END, f"Paso {iter_num}: Iteración {iter_num}\n")
 
         self.text_state.insert(tk.END, "-" * 30 + "\n")
-        self.text_state.insert(tk.END, f"Nodo actual (elegido con menor distancia): {current}\n")
+        if action != "dynamic":
+            self.text_state.insert(tk.END, f"Nodo actual (elegido con menor distancia): {current}\n")
         self.text_state.insert(tk.END, f"Nodos visitados (permanentes): {sorted(list(visited))}\n")
         self.text_state.insert(tk.END, "-" * 30 + "\n")
 
         # Actualizaciones en esta iteración
-        if action == "iter":
+        if action == "dynamic":
+            for v, old, new, _ in updates:
+                old_str = "∞" if old == math.inf else f"{old:.2f}"
+                new_str = "∞" if new == math.inf else f"{new:.2f}"
+                self.text_state.insert(tk.END, f"✔ dist[{v}]: {old_str} → {new_str}\n")
+        elif action == "iter":
             if updates:
                 self.text_state.insert(tk.END, "Actualizaciones en esta iteración:\n")
                 for v, old, new, changed in updates:
@@ -11,7 +11,7 @@ Requisitos:
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
 
 import matplotlib
@@ -22,6 +22,14 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import networkx as nx
 import math
 
+from traza_pasos import MatrixTrace
+from cache_resultados import GraphVersion, ResultCache
+from carga_aristas import parse_edge_text, load_edges
+from capa_estatica import StaticGraphLayer, edge_layer
+from cache_posiciones import LayoutCache
+from caminos_todos_pares import NO_HOP, initial_matrices, iter_pivots
+from matrices_en_disco import open_or_compute, extend_store
+
 
 class FloydApp:
     def __init__(self, root):
@@ -31,9 +39,14 @@ class FloydApp:
         # Grafo y estado
         self.G = nx.Graph()
         self.pos = {}
+        self.layouts = LayoutCache()   # posiciones guardadas en disco por firma del grafo
         self.nodes = []       # lista ordenada de nodos
-        self.steps = []       # lista de pasos del algoritmo
-        self.current_step = -1
+        self.producer = None  # productor perezoso de pasos del algoritmo
+
+        # Matrices finales por versión del grafo
+        self.graph_version = GraphVersion()
+        self.cache = ResultCache(max_entries=8, max_bytes=256 * 1024 * 1024)
+        self._last_final = None   # (nodos, {(i, j): peso}, matrices) del último cálculo final
 
         # Para resaltar un camino final
         self.highlight_path_nodes = set()
@@ -85,7 +98,13 @@ D E 2"""
             controls_frame,
             text="Construir grafo",
             command=self.build_graph
-        ).pack(fill=tk.X, pady=(0, 10))
+        ).pack(fill=tk.X)
+
+        ttk.Button(
+            controls_frame,
+            text="Cargar aristas de archivo...",
+            command=self.load_edges_file
+        ).pack(fill=tk.X, pady=(2, 10))
 
         # Botones Floyd
         buttons_frame = ttk.Frame(controls_frame)
@@ -103,12 +122,21 @@ D E 2"""
             command=self.reset_steps
         ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
 
-        # Paso siguiente
+        # Paso anterior / siguiente
+        step_frame = ttk.Frame(controls_frame)
+        step_frame.pack(fill=tk.X, pady=(5, 10))
+
         ttk.Button(
-            controls_frame,
+            step_frame,
+            text="Paso anterior",
+            command=self.prev_step
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X)
+
+        ttk.Button(
+            step_frame,
             text="Paso siguiente",
             command=self.next_step
-        ).pack(fill=tk.X, pady=(5, 10))
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
 
         # Área de texto (matrices)
         ttk.Label(controls_frame, text="Matrices D(k) y P(k):").pack(anchor="w")
@@ -139,17 +167,13 @@ D E 2"""
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Capa estática en caché + blitting por paso
+        self.layer = StaticGraphLayer(self.fig, self.ax, self.canvas)
+
     # -----------------------------------------------------------
     # Construcción del grafo
     # -----------------------------------------------------------
     def build_graph(self):
-        self.G.clear()
-        self.steps.clear()
-        self.current_step = -1
-        self.nodes = []
-        self.highlight_path_nodes.clear()
-        self.highlight_path_edges = []
-
         # Leer nodos
         nodes_text = self.entry_nodes.get().strip()
         if not nodes_text:
@@ -161,8 +185,48 @@ D E 2"""
             messagebox.showerror("Error", "La lista de nodos no es válida.")
             return
 
-        self.nodes = sorted(nodes)
+        # Leer aristas
+        edges_text = self.text_edges.get("1.0", tk.END).strip()
+        if not edges_text:
+            messagebox.showerror("Error", "Debes ingresar al menos una arista.")
+            return
+
+        edges = parse_edge_text(edges_text, nodes=nodes)
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        self._install_graph(edges)
+
+    def load_edges_file(self):
+        """Lista de aristas desde archivo (texto, CSV o binario); los nodos salen del archivo."""
+        path = filedialog.askopenfilename(
+            title="Lista de aristas",
+            filetypes=[("Listas de aristas", "*.txt *.csv *.edgb"), ("Todos", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            edges = load_edges(path)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        if len(edges.nodes) == 0:
+            messagebox.showerror("Error", "El archivo no tiene aristas.")
+            return
+        self._install_graph(edges)
+
+    def _install_graph(self, edges):
+        self.G.clear()
+        self.producer = None
+        self.highlight_path_nodes.clear()
+        self.highlight_path_edges = []
+
+        self.nodes = sorted(edges.nodes.names)
         self.G.add_nodes_from(self.nodes)
+        self.G.add_weighted_edges_from(edges.named_edges())
 
         # Actualizar combos de origen/destino
         self.combo_src["values"] = self.nodes
@@ -171,48 +235,23 @@ D E 2"""
             self.combo_src.set(self.nodes[0])
             self.combo_dst.set(self.nodes[-1])
 
-        # Leer aristas
-        edges_text = self.text_edges.get("1.0", tk.END).strip()
-        if not edges_text:
-            messagebox.showerror("Error", "Debes ingresar al menos una arista.")
-            return
-
-        for line in edges_text.splitlines():
-            parts = line.split()
-            if len(parts) != 3:
-                messagebox.showerror(
-                    "Error",
-                    f"La línea '{line}' no tiene formato 'u v peso'."
-                )
-                return
-            u, v, w = parts
-            if u not in self.nodes or v not in self.nodes:
-                messagebox.showerror(
-                    "Error",
-                    f"Los nodos '{u}' o '{v}' de la línea '{line}' no están en la lista de nodos."
-                )
-                return
-            try:
-                w_val = float(w)
-            except ValueError:
-                messagebox.showerror(
-                    "Error",
-                    f"El peso '{w}' en la línea '{line}' no es un número."
-                )
-                return
-
-            self.G.add_edge(u, v, weight=w_val)
-
         # Posiciones del grafo
         if len(self.G.nodes) > 1:
-            self.pos = nx.spring_layout(self.G, seed=42)
+            self.pos = self.layouts.layout(self.G, previous=self.pos, seed=42)
         else:
             self.pos = {self.nodes[0]: (0, 0)}
+        self.layer.invalidate()
 
+        self._sync_graph_version()
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Grafo construido correctamente.\n")
 
+    def _sync_graph_version(self):
+        """Sube la versión solo si el grafo cambió; libera resultados viejos."""
+        if self.graph_version.update(self.G):
+            self.cache.retain_version(self.graph_version.version)
+
     # -----------------------------------------------------------
     # Floyd-Warshall paso a paso
     # -----------------------------------------------------------
@@ -221,17 +260,15 @@ D E 2"""
             messagebox.showerror("Error", "Primero construye un grafo.")
             return
 
-        self.steps = self._compute_floyd_steps()
-        if not self.steps:
+        self.producer = self._floyd_trace()
+        if self.producer.forward() is None:
             messagebox.showinfo("Información", "No se pudieron generar pasos.")
             return
 
-        self.current_step = 0
         self.show_current_step()
 
     def reset_steps(self):
-        self.steps.clear()
-        self.current_step = -1
+        self.producer = None
         self.highlight_path_nodes.clear()
         self.highlight_path_edges = []
         self.draw_graph()
@@ -239,15 +276,14 @@ D E 2"""
         self.text_state.insert(tk.END, "Estados reiniciados.\n")
 
     def next_step(self):
-        if not self.steps:
+        if self.producer is None:
             messagebox.showinfo(
                 "Información",
                 "Primero inicia Floyd (botón 'Iniciar Floyd')."
             )
             return
 
-        if self.current_step < len(self.steps) - 1:
-            self.current_step += 1
+        if self.producer.forward() is not None:
             self.show_current_step()
         else:
             messagebox.showinfo(
@@ -255,147 +291,121 @@ D E 2"""
                 "Ya estás en el último paso."
             )
 
-    def _compute_floyd_steps(self):
+    def prev_step(self):
+        if self.producer is None:
+            messagebox.showinfo(
+                "Información",
+                "Primero inicia Floyd (botón 'Iniciar Floyd')."
+            )
+            return
+
+        if self.producer.back() is not None:
+            self.show_current_step()
+        else:
+            messagebox.showinfo(
+                "Información",
+                "Ya no hay pasos anteriores en el historial."
+            )
+
+    def _edge_arrays(self):
+        """Aristas como (orígenes, destinos, pesos) con índices de self.nodes."""
+        index = {node: i for i, node in enumerate(self.nodes)}
+        edges = list(self.G.edges(data="weight", default=1.0))
+        return (
+            [index[u] for u, _, _ in edges],
+            [index[v] for _, v, _ in edges],
+            [w for _, _, w in edges],
+        )
+
+    def _initial_matrices(self):
+        return initial_matrices(len(self.nodes), *self._edge_arrays())
+
+    def _hop_name(self, hop):
+        return "-" if hop == NO_HOP else self.nodes[hop]
+
+    def _floyd_trace(self):
         """
-        Genera pasos para Floyd-Warshall con:
-        - dist: matriz de distancias
-        - path: matriz de recorridos (siguiente nodo desde i para ir a j)
+        Pasos de Floyd-Warshall, un k por vez y de forma perezosa. Cada paso
+        trae:
+        - dist: matriz de distancias (numpy)
+        - path: matriz de recorridos (índice del siguiente nodo desde i
+          para ir a j; NO_HOP si no hay)
+        - updates: solo las celdas que cambiaron (arreglo estructurado con
+          i, j, old_dist, new_dist, old_path, new_path)
+        Las matrices de cada paso se reconstruyen desde esos deltas.
         """
-        n = len(self.nodes)
-        index = {node: i for i, node in enumerate(self.nodes)}
+        dist, path = self._initial_matrices()
+        return MatrixTrace({"dist": dist, "path": path}, self.nodes, iter_pivots(dist, path))
 
-        # Matriz de distancias inicial
-        dist = [[math.inf] * n for _ in range(n)]
-        path = [["-"] * n for _ in range(n)]
+    def _compute_final_floyd_step(self):
+        """
+        Solo las matrices finales, sin pasos intermedios, en disco
+        (dist float32 / path int32 mapeados en memoria; ver
+        matrices_en_disco). Si este grafo ya se calculó antes, incluso en
+        otra ejecución, se reutiliza. El motor elige Floyd-Warshall o
+        Johnson según la densidad del grafo.
+
+        Si desde el último cálculo solo se agregaron o abarataron unas
+        cuantas aristas, se actualizan las matrices anteriores con
+        insert_edge (O(n²) por arista) en lugar de recalcular todo.
+        """
+        sources, targets, weights = arrays = self._edge_arrays()
+        edges = {(min(i, j), max(i, j)): w for i, j, w in zip(sources, targets, weights)}
+        added = self._added_edges(edges)
+        if added is None:
+            final = open_or_compute(len(self.nodes), *arrays, nodes=self.nodes)
+        else:
+            final = extend_store(self._last_final[2], added, len(self.nodes), *arrays,
+                                 nodes=self.nodes)
+        self._last_final = (list(self.nodes), edges, final)
+        return final
 
-        for i in range(n):
-            dist[i][i] = 0.0
-            path[i][i] = "-"
-
-        for u, v, data in self.G.edges(data=True):
-            w = data.get("weight", 1.0)
-            i, j = index[u], index[v]
-            if w < dist[i][j]:
-                dist[i][j] = w
-                dist[j][i] = w
-                path[i][j] = v
-                path[j][i] = u
-
-        steps = []
-
-        # Paso 0: matrices iniciales D(0), P(0)
-        steps.append({
-            "action": "init",
-            "k_index": None,
-            "k_node": None,
-            "dist": [row[:] for row in dist],
-            "path": [row[:] for row in path],
-            "updates": []
-        })
-
-        # Floyd-Warshall
-        for k in range(n):
-            k_node = self.nodes[k]
-            updates = []
-
-            for i in range(n):
-                for j in range(n):
-                    old_d = dist[i][j]
-                    old_p = path[i][j]
-
-                    via_k = dist[i][k] + dist[k][j]
-
-                    if via_k < old_d:
-                        dist[i][j] = via_k
-                        # nuevo recorrido: primer salto desde i hacia j
-                        path[i][j] = path[i][k]
-                        updates.append({
-                            "i": self.nodes[i],
-                            "j": self.nodes[j],
-                            "old_d": old_d,
-                            "new_d": via_k,
-                            "old_p": old_p,
-                            "new_p": path[i][j],
-                            "via": k_node,
-                            "changed": True
-                        })
-                    else:
-                        updates.append({
-                            "i": self.nodes[i],
-                            "j": self.nodes[j],
-                            "old_d": old_d,
-                            "new_d": via_k,
-                            "old_p": old_p,
-                            "new_p": old_p,
-                            "via": k_node,
-                            "changed": False
-                        })
-
-            steps.append({
-                "action": "k_step",
-                "k_index": k,
-                "k_node": k_node,
-                "dist": [row[:] for row in dist],
-                "path": [row[:] for row in path],
-                "updates": updates
-            })
-
-        return steps
+    def _added_edges(self, edges):
+        """
+        Aristas [(i, j, peso)] nuevas o más baratas respecto al último
+        cálculo final; None si hay que recalcular (cambiaron los nodos, se
+        borró o encareció una arista, o son demasiadas).
+        """
+        if self._last_final is None:
+            return None
+        nodes, old_edges, _ = self._last_final
+        if nodes != self.nodes:
+            return None
+        if any(edges.get(e, math.inf) > w for e, w in old_edges.items()):
+            return None
+        added = [(i, j, w) for (i, j), w in edges.items() if w < old_edges.get((i, j), math.inf)]
+        # Cada arista son dos pasadas de O(n²) (una por sentido); con n / 2
+        # aristas ya cuesta lo mismo que Floyd-Warshall completo
+        if 2 * len(added) >= len(self.nodes):
+            return None
+        return added
 
     # -----------------------------------------------------------
     # Visualización
     # -----------------------------------------------------------
     def show_current_step(self):
-        step = self.steps[self.current_step]
+        step = self.producer.current
         self.draw_graph(step)
         self.update_state_text(step)
 
     def draw_graph(self, step=None):
-        self.ax.clear()
-
-        if not self.pos:
-            self.canvas.draw()
-            return
-
         current_k_node = None
         if step is not None:
             current_k_node = step["k_node"]
 
         # Colores de nodos: si están en el camino final → verde,
-        # si son el k actual → naranja, si no → azul.
-        node_colors = []
+        # si son el k actual → naranja, si no → azul (color base).
+        node_colors = {}
         for n in self.nodes:
             if n in self.highlight_path_nodes:
-                node_colors.append("#4caf50")  # verde camino final
+                node_colors[n] = "#4caf50"  # verde camino final
             elif n == current_k_node:
-                node_colors.append("#ff9800")  # k
-            else:
-                node_colors.append("#90caf9")  # otros
-
-        nx.draw_networkx_nodes(self.G, self.pos, node_color=node_colors, ax=self.ax)
-        nx.draw_networkx_labels(self.G, self.pos, ax=self.ax)
-
-        # Todas las aristas base en gris
-        nx.draw_networkx_edges(self.G, self.pos, edge_color="#9e9e9e", ax=self.ax)
-
-        # Pesos
-        edge_labels = {(u, v): f'{d["weight"]}' for u, v, d in self.G.edges(data=True)}
-        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels=edge_labels, ax=self.ax)
+                node_colors[n] = "#ff9800"  # k
 
         # Aristas del camino final resaltadas en rojo
-        if self.highlight_path_edges:
-            nx.draw_networkx_edges(
-                self.G,
-                self.pos,
-                edgelist=self.highlight_path_edges,
-                width=4,
-                edge_color="#f44336",
-                ax=self.ax
-            )
+        layers = [edge_layer(self.highlight_path_edges, "#f44336", width=4)]
 
-        self.ax.set_axis_off()
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self.layer.render(self.G, self.pos, node_colors, layers)
 
     # -----------------------------------------------------------
     # Mostrar matrices D(k) y P(k) y cambios
@@ -409,11 +419,9 @@ D E 2"""
         n = len(self.nodes)
         width = 6
 
-        # Pares (i,j) que cambiaron en este paso
-        changed_pairs = set()
-        for upd in step["updates"]:
-            if upd["changed"]:
-                changed_pairs.add((upd["i"], upd["j"]))
+        # Pares (i,j) (índices) que cambiaron en este paso
+        updates = step["updates"]
+        changed_pairs = set(zip(updates["i"].tolist(), updates["j"].tolist()))
 
         # Encabezado
         if action == "init":
@@ -441,7 +449,7 @@ D E 2"""
                     cell = "∞"
                 else:
                     cell = f"{d:.0f}"
-                if (self.nodes[i], self.nodes[j]) in changed_pairs:
+                if (i, j) in changed_pairs:
                     cell = cell + "*"
                 row_str += f"{cell:>{width}}"
             self.text_state.insert(tk.END, row_str + "\n")
@@ -456,8 +464,8 @@ D E 2"""
         for i in range(n):
             row_str = f"{self.nodes[i]:>{width}}"
             for j in range(n):
-                cell = path[i][j]
-                if (self.nodes[i], self.nodes[j]) in changed_pairs:
+                cell = self._hop_name(path[i][j])
+                if (i, j) in changed_pairs:
                     cell = cell + "*"
                 row_str += f"{cell:>{width}}"
             self.text_state.insert(tk.END, row_str + "\n")
@@ -465,18 +473,16 @@ D E 2"""
         # Lista de cambios
         if action == "k_step":
             self.text_state.insert(tk.END, "\nCambios en este paso:\n")
-            any_change = False
-            for upd in step["updates"]:
-                if upd["changed"]:
-                    any_change = True
-                    old_d = "∞" if upd["old_d"] == math.inf else f"{upd['old_d']:.0f}"
-                    new_d = "∞" if upd["new_d"] == math.inf else f"{upd['new_d']:.0f}"
-                    self.text_state.insert(
-                        tk.END,
-                        f"  dist[{upd['i']}][{upd['j']}]: {old_d} → {new_d} (vía {upd['via']}) | "
-                        f"recorrido: {upd['old_p']} → {upd['new_p']}\n"
-                    )
-            if not any_change:
+            for upd in updates:
+                old_d = "∞" if upd["old_dist"] == math.inf else f"{upd['old_dist']:.0f}"
+                new_d = "∞" if upd["new_dist"] == math.inf else f"{upd['new_dist']:.0f}"
+                self.text_state.insert(
+                    tk.END,
+                    f"  dist[{self.nodes[upd['i']]}][{self.nodes[upd['j']]}]: {old_d} → {new_d} "
+                    f"(vía {step['k_node']}) | "
+                    f"recorrido: {self._hop_name(upd['old_path'])} → {self._hop_name(upd['new_path'])}\n"
+                )
+            if len(updates) == 0:
                 self.text_state.insert(
                     tk.END,
                     "  No hubo cambios de distancias al usar este k.\n"
@@ -486,7 +492,7 @@ D E 2"""
     # Camino mínimo entre dos nodos (usando el último paso)
     # -----------------------------------------------------------
     def show_shortest_path(self):
-        if not self.steps:
+        if self.producer is None:
             messagebox.showinfo(
                 "Información",
                 "Primero ejecuta Floyd (botón 'Iniciar Floyd')."
@@ -503,16 +509,21 @@ D E 2"""
             )
             return
 
-        final_step = self.steps[-1]
-        dist = final_step["dist"]
-        path = final_step["path"]
-        n = len(self.nodes)
-        index = {node: i for i, node in enumerate(self.nodes)}
-
-        i = index[src]
-        j = index[dst]
+        # Matrices finales: una vez por versión del grafo, sin mover el paso actual
+        self._sync_graph_version()
+        try:
+            final = self.cache.get_or_compute(
+                (self.graph_version.version, "floyd"),
+                self._compute_final_floyd_step
+            )
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        i, j = final.indices((src, dst))
 
-        if math.isinf(dist[i][j]):
+        # Solo se leen del disco las celdas de esta consulta
+        total_dist = final.distance(i, j)
+        if math.isinf(total_dist):
             messagebox.showinfo(
                 "Camino",
                 f"No existe camino entre {src} y {dst}."
@@ -520,21 +531,9 @@ D E 2"""
             return
 
         # Reconstruir camino usando la matriz de recorridos (next-hop)
-        route = [src]
-        current = src
-        max_iter = n + 5  # seguridad por si acaso
-        steps_used = 0
-
-        while current != dst and steps_used < max_iter:
-            ci = index[current]
-            next_node = path[ci][j]
-            if next_node == "-" or next_node not in index:
-                break
-            route.append(next_node)
-            current = next_node
-            steps_used += 1
-
-        if route[-1] != dst:
+        route = [self.nodes[x] for x in final.route(i, j)]
+
+        if not route:
             messagebox.showinfo(
                 "Camino",
                 f"No se pudo reconstruir completamente el camino de {src} a {dst}."
@@ -552,10 +551,9 @@ D E 2"""
 
         # Redibujar grafo con el camino resaltado
         # (usamos el último paso para conservar el color de k, aunque ya no importe mucho)
-        self.draw_graph(self.steps[self.current_step])
+        self.draw_graph(self.producer.current)
 
         # Mostrar camino y distancia en el cuadro de texto
-        total_dist = dist[i][j]
         self.text_state.insert(
             tk.END,
             f"\nCamino mínimo de {src} a {dst}:  " +
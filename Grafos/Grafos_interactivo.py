@@ -6,6 +6,8 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import numpy as np
 
+from cache_posiciones import LayoutCache
+
 class Grafo:
     def __init__(self):
         self.G = nx.MultiDiGraph()
@@ -248,6 +250,7 @@ class GrafoGUI:
         
         self.grafo = Grafo()
         self.pos = {}  # Posiciones de nodos
+        self.layouts = LayoutCache()  # Posiciones guardadas por firma del grafo
         self.selected_node = None
         self.first_node_for_edge = None
         self.modo = "seleccionar"  # modos: seleccionar, agregar_vertice, agregar_arista
@@ -868,10 +871,12 @@ class GrafoGUI:
         for v in self.grafo.vertices():
             G_visual.add_node(v)
         
-        # Calcular posiciones si no existen
+        # Calcular posiciones si no existen (los nodos que ya tenían lugar
+        # lo conservan; solo se acomodan los nuevos)
         if not self.pos or len(self.pos) != self.grafo.numVertices():
             try:
-                self.pos = nx.spring_layout(G_visual, k=2, iterations=50, seed=42)
+                self.pos = self.layouts.layout(G_visual, previous=self.pos,
+                                               k=2, iterations=50, seed=42)
             except:
                 self.pos = nx.circular_layout(G_visual)
         
@@ -19,6 +19,9 @@ matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
+from motor_caminos import CSRGraph, astar
+from caminos_dinamicos import DynamicSSSP
+
 # Cartopy
 try:
     import cartopy.crs as ccrs
@@ -93,6 +96,23 @@ def hamiltoniano_minimo(G):
     return mejor_coste, mejor_camino
 
 
+def ruta_astar(G, origen, destino):
+    """
+    Ruta más corta origen → destino con A* (motor_caminos), usando la
+    distancia de gran círculo entre capitales como heurística.
+
+    Devuelve (costo, camino, expandidos_astar, expandidos_dijkstra);
+    costo es None si no hay camino.
+    """
+    grafo = CSRGraph.from_networkx(G, coords={n: CAPITALES_MX[n] for n in G.nodes()})
+    s, t = grafo.index[origen], grafo.index[destino]
+    costo, camino, expandidos = astar(grafo, s, t)
+    _, _, expandidos_dijkstra = astar(grafo, s, t, heuristic=lambda v: 0.0)
+    if not camino:
+        return None, None, expandidos, expandidos_dijkstra
+    return costo, [grafo.nodes[i] for i in camino], expandidos, expandidos_dijkstra
+
+
 def _diametro_en_arbol(T):
     if T.number_of_nodes() == 0:
         return 0, []
@@ -167,6 +187,11 @@ class AppGrafoMexico:
         self.resalta_a = []
         self.resalta_b = []
 
+        # Árbol de caminos mínimos de la última ruta (c); se repara al
+        # bajar un costo o agregar una conexión.
+        self.arbol_ruta = None
+        self.ruta_destino = None
+
         self.modo_actual = "seleccionar"
 
         self.crear_interfaz()
@@ -288,6 +313,10 @@ class AppGrafoMexico:
                   command=self.calcular_con_repeticiones,
                   bg='#f39c12', fg='white', font=('Arial', 10, 'bold'),
                   pady=6, cursor='hand2').pack(fill=tk.X, pady=3)
+        tk.Button(calc_frame, text="(c) Ruta más corta entre 2 estados (A*)",
+                  command=self.calcular_ruta_astar,
+                  bg='#8e44ad', fg='white', font=('Arial', 10, 'bold'),
+                  pady=6, cursor='hand2').pack(fill=tk.X, pady=3)
 
         output_frame = tk.LabelFrame(right_panel, text="📝 Resultados",
                                      font=('Arial', 11, 'bold'), bg='white')
@@ -475,6 +504,7 @@ class AppGrafoMexico:
             self.alternar_estado(estado_cercano)
 
     def alternar_estado(self, estado):
+        self.arbol_ruta = None
         if estado in self.activos:
             self.activos.remove(estado)
             if estado in self.G:
@@ -524,19 +554,36 @@ class AppGrafoMexico:
         if costo is None:
             self.log(f"❌ Conexión cancelada: {u} ↔ {v}\n")
             self.seleccion_par = []; self.dibujar_mapa(); return
-        if self.G.has_edge(u, v):
-            if float(costo) < self.G[u][v]["weight"]:
-                self.G[u][v]["weight"] = float(costo)
+        cambios = None
+        if self.G.has_edge(u, v) and float(costo) >= self.G[u][v]["weight"]:
+            self.log(f"ℹ️ Ya existe {u} ↔ {v} con menor costo\n")
+        else:
+            existia = self.G.has_edge(u, v)
+            if self.arbol_ruta is not None:
+                cambios = self.arbol_ruta.set_weight(u, v, float(costo))
+            else:
+                self.G.add_edge(u, v, weight=float(costo))
+            if existia:
                 self.log(f"🔄 Actualizado: {u} ↔ {v} = {costo:.0f}\n")
             else:
-                self.log(f"ℹ️ Ya existe {u} ↔ {v} con menor costo\n")
-        else:
-            self.G.add_edge(u, v, weight=float(costo))
-            self.log(f"🔗 Conectado: {u} ↔ {v} = {costo:.0f}\n")
+                self.log(f"🔗 Conectado: {u} ↔ {v} = {costo:.0f}\n")
         self.seleccion_par = []
         self.limpiar_resaltados(silencioso=True)
+        if cambios is not None:
+            self._actualizar_ruta(cambios)
         self.dibujar_mapa()
 
+    def _actualizar_ruta(self, cambios):
+        """Muestra la ruta (c) reparada tras un cambio de costo."""
+        origen, destino = self.arbol_ruta.source, self.ruta_destino
+        camino = self.arbol_ruta.path_to(destino)
+        if cambios:
+            self.log(f"♻️ Árbol desde {origen} reparado: {len(cambios)} estado(s) con costo nuevo\n")
+        if camino:
+            self.log(f"📍 Ruta {origen} → {destino}: {' → '.join(camino)} "
+                     f"({self.arbol_ruta.dist[destino]:.2f})\n")
+            self.resalta_a = [(camino[i], camino[i+1]) for i in range(len(camino)-1)]
+
     def calcular_sin_repetir(self):
         self.limpiar_resaltados(silencioso=True)
         if len(self.activos) != 7:
@@ -584,6 +631,39 @@ class AppGrafoMexico:
         self.resalta_b = [(recorrido[i], recorrido[i+1]) for i in range(len(recorrido)-1)]
         self.dibujar_mapa()
 
+    def calcular_ruta_astar(self):
+        self.limpiar_resaltados(silencioso=True)
+        if len(self.activos) < 2:
+            messagebox.showwarning("Estados insuficientes", "Selecciona al menos 2 estados.")
+            return
+        opciones = ", ".join(sorted(self.activos))
+        origen = simpledialog.askstring("Origen", f"Estado origen:\n({opciones})")
+        if origen is None:
+            return
+        destino = simpledialog.askstring("Destino", f"Estado destino:\n({opciones})")
+        if destino is None:
+            return
+        origen, destino = origen.strip(), destino.strip()
+        if origen not in self.activos or destino not in self.activos:
+            messagebox.showerror("Error", "Origen y destino deben ser estados activos.")
+            return
+
+        costo, camino, expandidos, expandidos_dijkstra = ruta_astar(self.G, origen, destino)
+        if camino is None:
+            messagebox.showinfo("Sin ruta", f"No hay conexión entre {origen} y {destino}.")
+            return
+        self.log("\n" + "="*50)
+        self.log("\n(c) RUTA MÁS CORTA (A* con distancia geográfica)")
+        self.log("\n" + "="*50 + "\n")
+        self.log(f"📍 Ruta: {' → '.join(camino)}\n")
+        self.log(f"💰 Costo total: {costo:.2f} unidades\n")
+        self.log(f"🔎 Nodos expandidos: A* = {expandidos}, Dijkstra = {expandidos_dijkstra}\n")
+        self.log("="*50 + "\n")
+        self.resalta_a = [(camino[i], camino[i+1]) for i in range(len(camino)-1)]
+        self.arbol_ruta = DynamicSSSP(self.G, origen)
+        self.ruta_destino = destino
+        self.dibujar_mapa()
+
     def mostrar_relaciones(self):
         if len(self.activos) == 0:
             messagebox.showinfo("Sin estados", "No hay estados seleccionados.")
@@ -619,6 +699,7 @@ class AppGrafoMexico:
         if messagebox.askyesno("Confirmar Reinicio", "¿Eliminar todos los estados y conexiones?"):
             self.G.clear(); self.activos.clear(); self.seleccion_par.clear()
             self.resalta_a = []; self.resalta_b = []
+            self.arbol_ruta = None
             self.output.delete(1.0, tk.END)
             self.reset_vista()
             self.log("🔄 Sistema reiniciado completamente\n")
@@ -3,7 +3,7 @@
 Algoritmo de Kruskal interactivo (MST) con visualización mejor balanceada.
 
 - Entrada: grafo NO dirigido (A B w = arista A--B con peso w)
-- Kruskal paso a paso con Union-Find
+- Kruskal paso a paso con Union-Find (union_find.UnionFind, por índice de nodo)
 
 Visual:
 - Izquierda: controles + explicación (tamaño más compacto).
@@ -11,7 +11,7 @@ Visual:
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
 
 import matplotlib
@@ -21,6 +21,12 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 import networkx as nx
 
+from traza_pasos import StepProducer
+from carga_aristas import parse_edge_text, load_edges
+from capa_estatica import StaticGraphLayer, edge_layer
+from cache_posiciones import LayoutCache
+from union_find import UnionFind, connected_components
+
 
 class KruskalApp:
     def __init__(self, root):
@@ -30,10 +36,11 @@ class KruskalApp:
         # Grafo y estado
         self.G = nx.Graph()
         self.pos = {}
+        self.layouts = LayoutCache()   # posiciones guardadas en disco por firma del grafo
         self.nodes = []
+        self.index = {}          # nombre de nodo -> índice en UnionFind
         self.sorted_edges = []   # lista de (u, v, w)
-        self.steps = []          # lista de pasos
-        self.current_step = -1
+        self.producer = None     # productor perezoso de pasos
 
         self._create_widgets()
         self._create_matplotlib_canvas()
@@ -93,6 +100,12 @@ D E 2"""
             command=self.reset_steps
         ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(4, 0))
 
+        ttk.Button(
+            buttons_row1,
+            text="Cargar archivo...",
+            command=self.load_edges_file
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(4, 0))
+
         buttons_row2 = ttk.Frame(top_controls)
         buttons_row2.pack(fill=tk.X, pady=(0, 4))
 
@@ -102,6 +115,12 @@ D E 2"""
             command=self.start_kruskal
         ).pack(side=tk.LEFT, expand=True, fill=tk.X)
 
+        ttk.Button(
+            buttons_row2,
+            text="Paso anterior",
+            command=self.prev_step
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(4, 0))
+
         ttk.Button(
             buttons_row2,
             text="Paso siguiente",
@@ -124,16 +143,13 @@ D E 2"""
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Capa estática en caché + blitting por paso
+        self.layer = StaticGraphLayer(self.fig, self.ax, self.canvas, edge_color="#b0bec5", edge_width=1.5)
+
     # -----------------------------------------------------------
     # Construcción del grafo
     # -----------------------------------------------------------
     def build_graph(self):
-        self.G.clear()
-        self.steps.clear()
-        self.current_step = -1
-        self.nodes = []
-        self.sorted_edges = []
-
         # Nodos
         nodes_text = self.entry_nodes.get().strip()
         if not nodes_text:
@@ -145,46 +161,54 @@ D E 2"""
             messagebox.showerror("Error", "La lista de nodos no es válida.")
             return
 
-        self.nodes = sorted(nodes)
-        self.G.add_nodes_from(self.nodes)
-
         # Aristas
         edges_text = self.text_edges.get("1.0", tk.END).strip()
         if not edges_text:
             messagebox.showerror("Error", "Debes ingresar al menos una arista.")
             return
 
-        for line in edges_text.splitlines():
-            parts = line.split()
-            if len(parts) != 3:
-                messagebox.showerror(
-                    "Error",
-                    f"La línea '{line}' no tiene formato 'u v peso'."
-                )
-                return
-            u, v, w = parts
-            if u not in self.nodes or v not in self.nodes:
-                messagebox.showerror(
-                    "Error",
-                    f"Los nodos '{u}' o '{v}' de la línea '{line}' no están en la lista de nodos."
-                )
-                return
-            try:
-                w_val = float(w)
-            except ValueError:
-                messagebox.showerror(
-                    "Error",
-                    f"El peso '{w}' en la línea '{line}' no es un número."
-                )
-                return
+        edges = parse_edge_text(edges_text, nodes=nodes)
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        self._install_graph(edges)
+
+    def load_edges_file(self):
+        """Lista de aristas desde archivo (texto, CSV o binario); los nodos salen del archivo."""
+        path = filedialog.askopenfilename(
+            title="Lista de aristas",
+            filetypes=[("Listas de aristas", "*.txt *.csv *.edgb"), ("Todos", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            edges = load_edges(path)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        if len(edges.nodes) == 0:
+            messagebox.showerror("Error", "El archivo no tiene aristas.")
+            return
+        self._install_graph(edges)
 
-            self.G.add_edge(u, v, weight=w_val)
+    def _install_graph(self, edges):
+        self.G.clear()
+        self.producer = None
+
+        self.nodes = sorted(edges.nodes.names)
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        self.G.add_nodes_from(self.nodes)
+        self.G.add_weighted_edges_from(edges.named_edges())
 
         # Layout del grafo
         if len(self.G.nodes) > 1:
-            self.pos = nx.spring_layout(self.G, seed=42)
+            self.pos = self.layouts.layout(self.G, previous=self.pos, seed=42)
         else:
             self.pos = {self.nodes[0]: (0, 0)}
+        self.layer.invalidate()
 
         # Lista de aristas ordenadas por peso
         self.sorted_edges = []
@@ -193,9 +217,21 @@ D E 2"""
             self.sorted_edges.append((u, v, w))
         self.sorted_edges.sort(key=lambda e: (e[2], e[0], e[1]))
 
+        _, count = connected_components(
+            len(self.nodes),
+            [self.index[u] for u, _, _ in self.sorted_edges],
+            [self.index[v] for _, v, _ in self.sorted_edges],
+        )
+
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Grafo construido. Pulsa 'Iniciar Kruskal'.\n")
+        if count > 1:
+            self.text_state.insert(
+                tk.END,
+                f"El grafo tiene {count} componentes conexas: el resultado será "
+                "un bosque de expansión mínima (un árbol por componente).\n"
+            )
 
     # -----------------------------------------------------------
     # Kruskal paso a paso
@@ -209,27 +245,25 @@ D E 2"""
             messagebox.showerror("Error", "El grafo no tiene aristas.")
             return
 
-        self.steps = self._compute_kruskal_steps()
-        self.current_step = 0
+        self.producer = StepProducer(self._iter_kruskal_steps())
+        self.producer.forward()
         self.show_current_step()
 
     def reset_steps(self):
-        self.steps.clear()
-        self.current_step = -1
+        self.producer = None
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Estados reiniciados.\n")
 
     def next_step(self):
-        if not self.steps:
+        if self.producer is None:
             messagebox.showinfo(
                 "Información",
                 "Primero inicia Kruskal (botón 'Iniciar Kruskal')."
             )
             return
 
-        if self.current_step < len(self.steps) - 1:
-            self.current_step += 1
+        if self.producer.forward() is not None:
             self.show_current_step()
         else:
             messagebox.showinfo(
@@ -237,101 +271,85 @@ D E 2"""
                 "Ya estás en el último paso (MST final)."
             )
 
-    # ---------- Union-Find helpers ----------
-    def _make_sets(self):
-        parent = {v: v for v in self.nodes}
-        rank = {v: 0 for v in self.nodes}
-        return parent, rank
-
-    def _find(self, parent, x):
-        if parent[x] != x:
-            parent[x] = self._find(parent, parent[x])
-        return parent[x]
-
-    def _union(self, parent, rank, x, y):
-        rx = self._find(parent, x)
-        ry = self._find(parent, y)
-        if rx == ry:
-            return False
-        if rank[rx] < rank[ry]:
-            parent[rx] = ry
-        elif rank[rx] > rank[ry]:
-            parent[ry] = rx
+    def prev_step(self):
+        if self.producer is None:
+            messagebox.showinfo(
+                "Información",
+                "Primero inicia Kruskal (botón 'Iniciar Kruskal')."
+            )
+            return
+
+        if self.producer.back() is not None:
+            self.show_current_step()
         else:
-            parent[ry] = rx
-            rank[rx] += 1
-        return True
-
-    def _components_from_parent(self, parent):
-        comp = {}
-        for v in self.nodes:
-            root = self._find(parent, v)
-            comp.setdefault(root, []).append(v)
-        for k in comp:
-            comp[k].sort()
-        return comp
-
-    def _compute_kruskal_steps(self):
-        parent, rank = self._make_sets()
-        steps = []
+            messagebox.showinfo(
+                "Información",
+                "Ya no hay pasos anteriores en el historial."
+            )
+
+    # ---------- Union-Find helpers ----------
+    def _components(self, sets):
+        """{nodo raíz: [nodos ordenados]} a partir de los índices de `sets`."""
+        names = self.nodes
+        return {
+            names[root]: [names[i] for i in members]
+            for root, members in sets.groups().items()
+        }
+
+    def _iter_kruskal_steps(self):
+        """
+        Genera los pasos de Kruskal de forma perezosa: cada arista
+        ordenada se procesa cuando se pide el paso siguiente.
+        """
+        sets = UnionFind(len(self.nodes))
+        index = self.index
 
         # Paso inicial
-        steps.append({
+        yield {
             "index": -1,
             "current_edge": None,
             "will_add": False,
             "mst_edges": [],
-            "components": self._components_from_parent(parent),
+            "components": self._components(sets),
             "is_final": False,
-        })
+        }
 
         mst_edges = []
 
         for idx, (u, v, w) in enumerate(self.sorted_edges):
-            ru = self._find(parent, u)
-            rv = self._find(parent, v)
-            will_add = (ru != rv)
+            will_add = sets.union(index[u], index[v])
 
             if will_add:
-                self._union(parent, rank, u, v)
                 mst_edges = mst_edges + [(u, v, w)]
 
-            steps.append({
+            yield {
                 "index": idx,
                 "current_edge": (u, v, w),
                 "will_add": will_add,
                 "mst_edges": mst_edges[:],
-                "components": self._components_from_parent(parent),
+                "components": self._components(sets),
                 "is_final": False,
-            })
+            }
 
         # Paso final extra solo MST
-        steps.append({
+        yield {
             "index": len(self.sorted_edges),
             "current_edge": None,
             "will_add": False,
             "mst_edges": mst_edges[:],
-            "components": self._components_from_parent(parent),
+            "components": self._components(sets),
             "is_final": True,
-        })
-
-        return steps
+        }
 
     # -----------------------------------------------------------
     # Visualización
     # -----------------------------------------------------------
     def show_current_step(self):
-        step = self.steps[self.current_step]
+        step = self.producer.current
         self.draw_graph(step)
         self.update_state_text(step)
 
     def draw_graph(self, step=None):
-        self.ax.clear()
-
-        if not self.pos:
-            self.canvas.draw()
-            return
-
         mst_edges = []
         current_edge = None
         will_add = False
@@ -344,91 +362,42 @@ D E 2"""
             is_final = step.get("is_final", False)
 
         # Union-Find con aristas del MST
-        parent = {v: v for v in self.nodes}
-        rank = {v: 0 for v in self.nodes}
-        for (u, v, w) in mst_edges:
-            self._union(parent, rank, u, v)
+        index = self.index
+        sets = UnionFind(len(self.nodes))
+        sets.union_many([index[u] for u, _, _ in mst_edges],
+                        [index[v] for _, v, _ in mst_edges])
 
-        cycle_edges, normal_edges = [], []
+        # Las aristas normales en gris ya están en la capa estática
+        cycle_edges = []
         for u, v in self.G.edges():
-            ru = self._find(parent, u)
-            rv = self._find(parent, v)
-            if ru == rv and (u, v, self.G[u][v]["weight"]) not in mst_edges:
+            if sets.connected(index[u], index[v]) and (u, v, self.G[u][v]["weight"]) not in mst_edges:
                 cycle_edges.append((u, v))
-            else:
-                normal_edges.append((u, v))
-
-        # Nodos
-        nx.draw_networkx_nodes(self.G, self.pos, node_color="#90caf9", ax=self.ax)
-        nx.draw_networkx_labels(self.G, self.pos, ax=self.ax)
-
-        # Aristas cíclicas (apagadas)
-        if cycle_edges:
-            nx.draw_networkx_edges(
-                self.G, self.pos,
-                edgelist=cycle_edges,
-                width=1,
-                edge_color="#cfd8dc",
-                alpha=0.25,
-                style="dashed",
-                ax=self.ax
-            )
 
-        # Aristas normales en gris
-        if normal_edges:
-            nx.draw_networkx_edges(
-                self.G, self.pos,
-                edgelist=normal_edges,
-                width=1.5,
-                edge_color="#b0bec5",
-                ax=self.ax
-            )
+        layers = [
+            # Aristas cíclicas (apagadas)
+            edge_layer(cycle_edges, "#cfd8dc", width=1, style="dashed", alpha=0.25, erase=True),
+            # MST en verde
+            edge_layer([(u, v) for (u, v, w) in mst_edges], "#4caf50", width=3),
+        ]
+        texts = []
 
-        # MST en verde
-        if mst_edges:
-            mst_pairs = [(u, v) for (u, v, w) in mst_edges]
-            nx.draw_networkx_edges(
-                self.G, self.pos,
-                edgelist=mst_pairs,
-                width=3,
-                edge_color="#4caf50",
-                ax=self.ax
-            )
-
-        # Arista actual (si no es el paso final)
+        # Arista actual y su peso resaltado (si no es el paso final)
         if current_edge is not None and not is_final:
             u, v, w = current_edge
             color = "#4caf50" if will_add else "#f44336"
-            nx.draw_networkx_edges(
-                self.G, self.pos,
-                edgelist=[(u, v)],
-                width=4,
-                edge_color=color,
-                ax=self.ax
-            )
+            layers.append(edge_layer([(u, v)], color, width=4))
 
-        # Etiquetas de pesos base
-        edge_labels = {(u, v): f"{d['weight']}" for u, v, d in self.G.edges(data=True)}
-        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels=edge_labels, ax=self.ax)
-
-        # Peso resaltado de la arista actual
-        if current_edge is not None and not is_final:
-            u, v, w = current_edge
             x1, y1 = self.pos[u]
             x2, y2 = self.pos[v]
             mx, my = (x1 + x2) / 2.0, (y1 + y2) / 2.0
-            color = "#4caf50" if will_add else "#f44336"
-            self.ax.text(
-                mx, my, f"{w}",
+            texts.append((mx, my, f"{w}", dict(
                 fontsize=11,
                 fontweight="bold",
                 color=color,
                 bbox=dict(boxstyle="round,pad=0.2", fc="white", ec=color, alpha=0.9),
-            )
+            )))
 
-        self.ax.set_axis_off()
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self.layer.render(self.G, self.pos, None, layers, texts)
 
     # -----------------------------------------------------------
     # Texto
@@ -13,10 +13,18 @@ Interfaz:
   - Relación original R (pares que vienen de la entrada).
   - Relación R_k (pares actuales).
   - Pares nuevos = R_k \ R (lo que se va formando con Warshall).
+- "Cierre por componentes (SCC)": la matriz final directamente, sin
+  pasos, condensando las componentes fuertemente conexas (más rápido en
+  relaciones dispersas; mismo resultado que el último Wk).
+- "¿Origen alcanza a destino?": consulta con un índice compacto
+  (indice_alcanzabilidad), sin construir la matriz n x n.
+- Al volver a construir el grafo con los mismos nodos solo se aplican las
+  aristas que cambiaron; el cierre ya calculado se actualiza arista por
+  arista (IncrementalClosure) en lugar de recalcularse.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
 
 import matplotlib
@@ -25,6 +33,15 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 import networkx as nx
+import numpy as np
+
+from traza_pasos import MatrixTrace
+from indice_alcanzabilidad import ReachabilityIndex
+from carga_aristas import parse_edge_text, load_edges
+from capa_estatica import StaticGraphLayer
+from cierre_transitivo import (
+    pack_relation, unpack_rows, iter_closure_pivots, strongly_connected, IncrementalClosure,
+)
 
 
 class WarshallApp:
@@ -36,8 +53,10 @@ class WarshallApp:
         self.G = nx.DiGraph()
         self.pos = {}
         self.nodes = []
-        self.steps = []          # lista de pasos Wk
-        self.current_step = -1
+        self.producer = None     # productor perezoso de pasos Wk
+        self.reach_index = None  # índice de alcanzabilidad (se arma en la primera consulta)
+        self.node_index = {}     # nodo -> posición en self.nodes
+        self.closure = None      # cierre final (IncrementalClosure), si ya se pidió
 
         # Pares originales de la relación (entrada)
         self.original_pairs = set()
@@ -83,7 +102,13 @@ E D"""
             controls_frame,
             text="Construir grafo dirigido",
             command=self.build_graph
-        ).pack(fill=tk.X, pady=(0, 8))
+        ).pack(fill=tk.X)
+
+        ttk.Button(
+            controls_frame,
+            text="Cargar aristas de archivo...",
+            command=self.load_edges_file
+        ).pack(fill=tk.X, pady=(2, 8))
 
         buttons_frame = ttk.Frame(controls_frame)
         buttons_frame.pack(fill=tk.X, pady=(5, 5))
@@ -100,11 +125,44 @@ E D"""
             command=self.reset_steps
         ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
 
+        step_frame = ttk.Frame(controls_frame)
+        step_frame.pack(fill=tk.X, pady=(5, 8))
+
         ttk.Button(
-            controls_frame,
+            step_frame,
+            text="Paso anterior",
+            command=self.prev_step
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X)
+
+        ttk.Button(
+            step_frame,
             text="Paso siguiente",
             command=self.next_step
-        ).pack(fill=tk.X, pady=(5, 8))
+        ).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(5, 0))
+
+        ttk.Button(
+            controls_frame,
+            text="Cierre por componentes (SCC)",
+            command=self.show_scc_closure
+        ).pack(fill=tk.X, pady=(0, 8))
+
+        # ----- Consulta de alcanzabilidad -----
+        reach_frame = ttk.LabelFrame(controls_frame, text="¿Origen alcanza a destino?")
+        reach_frame.pack(fill=tk.X, pady=(0, 8))
+
+        ttk.Label(reach_frame, text="Origen:").grid(row=0, column=0, sticky="w", padx=2, pady=2)
+        self.combo_src = ttk.Combobox(reach_frame, width=8, state="readonly")
+        self.combo_src.grid(row=0, column=1, padx=2, pady=2)
+
+        ttk.Label(reach_frame, text="Destino:").grid(row=0, column=2, sticky="w", padx=2, pady=2)
+        self.combo_dst = ttk.Combobox(reach_frame, width=8, state="readonly")
+        self.combo_dst.grid(row=0, column=3, padx=2, pady=2)
+
+        ttk.Button(
+            reach_frame,
+            text="Consultar",
+            command=self.check_reachability
+        ).grid(row=0, column=4, sticky="ew", padx=2, pady=2)
 
         # ----- Matriz grande abajo -----
         ttk.Label(controls_frame, text="Matrices Wk y relación R_k:").pack(anchor="w")
@@ -118,16 +176,13 @@ E D"""
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Capa estática en caché + blitting por paso
+        self.layer = StaticGraphLayer(self.fig, self.ax, self.canvas, arrows=True, weight_labels=False)
+
     # -----------------------------------------------------------
     # Construcción del grafo
     # -----------------------------------------------------------
     def build_graph(self):
-        self.G.clear()
-        self.steps.clear()
-        self.current_step = -1
-        self.nodes = []
-        self.original_pairs.clear()
-
         nodes_text = self.entry_nodes.get().strip()
         if not nodes_text:
             messagebox.showerror("Error", "Debes ingresar al menos un nodo.")
@@ -138,47 +193,112 @@ E D"""
             messagebox.showerror("Error", "La lista de nodos no es válida.")
             return
 
-        self.nodes = sorted(nodes)
-        self.G.add_nodes_from(self.nodes)
-
         edges_text = self.text_edges.get("1.0", tk.END).strip()
         if not edges_text:
             messagebox.showerror("Error", "Debes ingresar al menos una arista.")
             return
 
-        for line in edges_text.splitlines():
-            parts = line.split()
-            if len(parts) != 2:
-                messagebox.showerror(
-                    "Error",
-                    f"La línea '{line}' no tiene formato 'origen destino'."
-                )
-                return
-            u, v = parts
-            if u not in self.nodes or v not in self.nodes:
-                messagebox.showerror(
-                    "Error",
-                    f"Los nodos '{u}' o '{v}' de la línea '{line}' no están en la lista de nodos."
-                )
-                return
-            self.G.add_edge(u, v)  # u -> v
-            # par original de la relación de entrada
-            self.original_pairs.add((u, v))
+        edges = parse_edge_text(edges_text, nodes=nodes, weighted=False)
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        self._install_graph(edges)
+
+    def load_edges_file(self):
+        """Lista de aristas desde archivo (texto, CSV o binario); los nodos salen del archivo."""
+        path = filedialog.askopenfilename(
+            title="Lista de aristas",
+            filetypes=[("Listas de aristas", "*.txt *.csv *.edgb"), ("Todos", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            edges = load_edges(path, weighted=False)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if not edges.report.ok:
+            messagebox.showerror("Error", edges.report.summary())
+            return
+        if len(edges.nodes) == 0:
+            messagebox.showerror("Error", "El archivo no tiene aristas.")
+            return
+        self._install_graph(edges)
+
+    def _install_graph(self, edges):
+        self.producer = None
+        self.reach_index = None
+        names = edges.nodes.names
+        pairs = {(names[u], names[v]) for u, v in zip(edges.sources, edges.targets)}
+
+        if self.nodes and sorted(names) == self.nodes:
+            # Mismos nodos: solo cambian aristas
+            added, removed = self._edit_relation(pairs)
+            self.layer.invalidate()
+            self.draw_graph()
+            self.text_state.delete("1.0", tk.END)
+            self.text_state.insert(
+                tk.END,
+                f"Grafo dirigido actualizado: {added} aristas nuevas, {removed} quitadas.\n"
+            )
+            return
+
+        self.G.clear()
+        self.closure = None
+        self.original_pairs.clear()
+
+        self.nodes = sorted(names)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.G.add_nodes_from(self.nodes)
+        self.G.add_edges_from(pairs)  # u -> v
+        # pares originales de la relación de entrada
+        self.original_pairs.update(pairs)
 
         # También consideramos la diagonal como parte de la relación base
         for x in self.nodes:
             self.original_pairs.add((x, x))
 
+        # Actualizar combos de origen/destino
+        self.combo_src["values"] = self.nodes
+        self.combo_dst["values"] = self.nodes
+        if self.nodes:
+            self.combo_src.set(self.nodes[0])
+            self.combo_dst.set(self.nodes[-1])
+
         # Distribución circular para aprovechar bien el espacio
         if len(self.G.nodes) > 1:
             self.pos = nx.circular_layout(self.G)
         else:
             self.pos = {self.nodes[0]: (0, 0)}
+        self.layer.invalidate()
 
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Grafo dirigido construido correctamente.\n")
 
+    def _edit_relation(self, pairs):
+        """
+        Deja en el grafo exactamente las aristas `pairs` (mismos nodos).
+        Si el cierre ya se calculó, se actualiza con cada arista agregada
+        o quitada en lugar de recalcularse. Devuelve (agregadas, quitadas).
+        """
+        old = set(self.G.edges)
+        added = pairs - old
+        removed = old - pairs
+        self.G.remove_edges_from(removed)
+        self.G.add_edges_from(added)
+        # La diagonal sigue en la relación base aunque se quite un lazo
+        self.original_pairs -= {(u, v) for u, v in removed if u != v}
+        self.original_pairs |= added
+
+        if self.closure is not None:
+            index = self.node_index
+            for u, v in removed:
+                self.closure.delete(index[u], index[v])
+            for u, v in added:
+                self.closure.insert(index[u], index[v])
+        return len(added), len(removed)
+
     # -----------------------------------------------------------
     # Warshall paso a paso
     # -----------------------------------------------------------
@@ -187,31 +307,28 @@ E D"""
             messagebox.showerror("Error", "Primero construye un grafo.")
             return
 
-        self.steps = self._compute_warshall_steps()
-        if not self.steps:
+        self.producer = self._warshall_trace()
+        if self.producer.forward() is None:
             messagebox.showinfo("Información", "No se pudieron generar pasos.")
             return
 
-        self.current_step = 0
         self.show_current_step()
 
     def reset_steps(self):
-        self.steps.clear()
-        self.current_step = -1
+        self.producer = None
         self.draw_graph()
         self.text_state.delete("1.0", tk.END)
         self.text_state.insert(tk.END, "Estados reiniciados.\n")
 
     def next_step(self):
-        if not self.steps:
+        if self.producer is None:
             messagebox.showinfo(
                 "Información",
                 "Primero inicia Warshall (botón 'Iniciar Warshall')."
             )
             return
 
-        if self.current_step < len(self.steps) - 1:
-            self.current_step += 1
+        if self.producer.forward() is not None:
             self.show_current_step()
         else:
             messagebox.showinfo(
@@ -219,117 +336,121 @@ E D"""
                 "Ya estás en el último paso."
             )
 
-    def _compute_warshall_steps(self):
+    def prev_step(self):
+        if self.producer is None:
+            messagebox.showinfo(
+                "Información",
+                "Primero inicia Warshall (botón 'Iniciar Warshall')."
+            )
+            return
+
+        if self.producer.back() is not None:
+            self.show_current_step()
+        else:
+            messagebox.showinfo(
+                "Información",
+                "Ya no hay pasos anteriores en el historial."
+            )
+
+    def _warshall_trace(self):
         """
-        Genera las matrices Wk del algoritmo de Warshall.
-        Cada paso:
+        Pasos (perezosos, un k por vez) de las matrices Wk del algoritmo de
+        Warshall. Cada paso:
         - k_index, k_node
-        - matrix: matriz de 0/1
-        - updates: cambios en ese paso
+        - matrix: matriz de 0/1 (numpy, reconstruida desde los deltas)
+        - updates: solo las celdas que pasaron de 0 a 1 en ese paso
+          (arreglo estructurado con i, j, old_matrix, new_matrix)
+        El cierre se calcula con filas de bits (cierre_transitivo); de
+        ahí salen W0 y las celdas nuevas de cada paso.
         """
         n = len(self.nodes)
+        R = pack_relation(n, *self._edge_arrays())
+        return MatrixTrace({"matrix": unpack_rows(R, n)}, self.nodes, iter_closure_pivots(R))
+
+    def _edge_arrays(self):
+        """Aristas como (orígenes, destinos) con índices de self.nodes."""
         index = {node: i for i, node in enumerate(self.nodes)}
+        edges = list(self.G.edges)
+        return [index[u] for u, _ in edges], [index[v] for _, v in edges]
 
-        # Matriz inicial W0
-        W = [[0] * n for _ in range(n)]
-        for i in range(n):
-            W[i][i] = 1  # cada nodo se alcanza a sí mismo
+    # -----------------------------------------------------------
+    # Cierre por componentes fuertemente conexas
+    # -----------------------------------------------------------
+    def show_scc_closure(self):
+        """
+        Matriz final sin pasos: componentes fuertemente conexas (Tarjan),
+        cierre del DAG condensado y expansión a los nodos originales. El
+        cierre se calcula la primera vez; después se mantiene con las
+        ediciones del grafo (ver _edit_relation).
+        """
+        if self.G.number_of_nodes() == 0:
+            messagebox.showerror("Error", "Primero construye un grafo.")
+            return
 
-        for u, v in self.G.edges:
-            i, j = index[u], index[v]
-            W[i][j] = 1
+        n = len(self.nodes)
+        sources, targets = self._edge_arrays()
+        if self.closure is None:
+            self.closure = IncrementalClosure(n, sources, targets)
+        comp, count = strongly_connected(n, sources, targets)
 
-        steps = []
+        groups = [[] for _ in range(count)]
+        for i, c in enumerate(comp.tolist()):
+            groups[c].append(self.nodes[i])
 
-        steps.append({
-            "action": "init",
+        step = {
+            "action": "scc",
             "k_index": None,
             "k_node": None,
-            "matrix": [row[:] for row in W],
-            "updates": []
-        })
-
-        for k in range(n):
-            k_node = self.nodes[k]
-            updates = []
-
-            for i in range(n):
-                for j in range(n):
-                    old = W[i][j]
-                    new = old or (W[i][k] and W[k][j])
-
-                    if new != old:
-                        W[i][j] = new
-                        updates.append({
-                            "i": self.nodes[i],
-                            "j": self.nodes[j],
-                            "old": old,
-                            "new": new,
-                            "via": k_node,
-                            "changed": True
-                        })
-                    else:
-                        updates.append({
-                            "i": self.nodes[i],
-                            "j": self.nodes[j],
-                            "old": old,
-                            "new": new,
-                            "via": k_node,
-                            "changed": False
-                        })
-
-            steps.append({
-                "action": "k_step",
-                "k_index": k,
-                "k_node": k_node,
-                "matrix": [row[:] for row in W],
-                "updates": updates
-            })
-
-        return steps
+            "matrix": self.closure.matrix(),
+            "updates": np.empty(0, dtype=[("i", np.int32), ("j", np.int32)]),
+            "components": groups[::-1],     # en orden topológico
+        }
+        self.draw_graph()
+        self.update_state_text(step)
+
+    # -----------------------------------------------------------
+    # Consulta de alcanzabilidad
+    # -----------------------------------------------------------
+    def check_reachability(self):
+        if self.G.number_of_nodes() == 0:
+            messagebox.showerror("Error", "Primero construye un grafo.")
+            return
+
+        src = self.combo_src.get().strip()
+        dst = self.combo_dst.get().strip()
+        if src not in self.G or dst not in self.G:
+            messagebox.showerror("Error", "Origen y destino deben ser nodos válidos.")
+            return
+
+        # Una vez por grafo: O(n + m) en memoria en lugar de la matriz n x n
+        if self.reach_index is None:
+            self.reach_index = ReachabilityIndex(len(self.nodes), *self._edge_arrays())
+        i, j = self.node_index[src], self.node_index[dst]
+
+        if self.reach_index.reaches(i, j):
+            messagebox.showinfo("Alcanzabilidad", f"{src} alcanza a {dst}.")
+        else:
+            messagebox.showinfo("Alcanzabilidad", f"{src} NO alcanza a {dst}.")
 
     # -----------------------------------------------------------
     # Visualización
     # -----------------------------------------------------------
     def show_current_step(self):
-        step = self.steps[self.current_step]
+        step = self.producer.current
         self.draw_graph(step)
         self.update_state_text(step)
 
     def draw_graph(self, step=None):
-        self.ax.clear()
-
-        if not self.pos:
-            self.canvas.draw()
-            return
-
         current_k_node = None
         if step is not None:
             current_k_node = step["k_node"]
 
-        node_colors = []
-        for n in self.nodes:
-            if n == current_k_node:
-                node_colors.append("#ff9800")  # nodo k
-            else:
-                node_colors.append("#90caf9")
-
-        nx.draw_networkx_nodes(self.G, self.pos, node_color=node_colors, ax=self.ax)
-        nx.draw_networkx_labels(self.G, self.pos, ax=self.ax)
-
-        nx.draw_networkx_edges(
-            self.G,
-            self.pos,
-            edge_color="#9e9e9e",
-            arrows=True,
-            arrowstyle="->",
-            arrowsize=15,
-            ax=self.ax
-        )
+        # Solo cambia el color del nodo k; las flechas están en la capa estática
+        node_colors = {}
+        if current_k_node is not None:
+            node_colors[current_k_node] = "#ff9800"  # nodo k
 
-        self.ax.set_axis_off()
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self.layer.render(self.G, self.pos, node_colors)
 
     # -----------------------------------------------------------
     # Mostrar matriz Wk, fila/columna k y relación R_k
@@ -342,14 +463,11 @@ E D"""
         n = len(self.nodes)
         width = 4
 
-        # pares (i,j) que cambiaron en este paso
-        changed_pairs = set()
-        new_pairs_only = []  # solo los que pasan de 0 -> 1 en ESTE paso
-        for upd in step["updates"]:
-            if upd["changed"]:
-                changed_pairs.add((upd["i"], upd["j"]))
-                if upd["old"] == 0 and upd["new"] == 1:
-                    new_pairs_only.append(upd)
+        # pares (i,j) (índices) que cambiaron en este paso; en Warshall
+        # todos pasan de 0 -> 1
+        updates = step["updates"]
+        new_pairs_only = list(zip(updates["i"].tolist(), updates["j"].tolist()))
+        changed_pairs = set(new_pairs_only)
 
         k_index = step.get("k_index")
         k_node = step.get("k_node")
@@ -357,6 +475,14 @@ E D"""
         # ---- Título del paso: W0, W1, W2...
         if action == "init":
             self.text_state.insert(tk.END, "W0: matriz inicial de alcanzabilidad\n\n")
+        elif action == "scc":
+            groups = step["components"]
+            self.text_state.insert(
+                tk.END,
+                f"Wn: cierre por componentes fuertemente conexas ({len(groups)} componentes)\n"
+            )
+            comps = " ".join("{" + ",".join(g) + "}" for g in groups)
+            self.text_state.insert(tk.END, f"   → Componentes (orden topológico): {comps}\n\n")
         else:
             self.text_state.insert(
                 tk.END,
@@ -428,7 +554,7 @@ E D"""
             row_str = f"{row_label:>{width}}"
             for j in range(n):
                 cell = str(W[i][j])
-                if (self.nodes[i], self.nodes[j]) in changed_pairs:
+                if (i, j) in changed_pairs:
                     cell = cell + "*"  # celda que cambió en este paso
                 row_str += f"{cell:>{width}}"
             self.text_state.insert(tk.END, row_str + "\n")
@@ -442,16 +568,16 @@ E D"""
                     "  Ningún par nuevo se añadió con este k.\n"
                 )
             else:
-                nuevos = [f"({u['i']},{u['j']})" for u in new_pairs_only]
+                nuevos = [f"({self.nodes[i]},{self.nodes[j]})" for i, j in new_pairs_only]
                 self.text_state.insert(
                     tk.END,
                     "  R_k = R_{k-1} ∪ {" + ", ".join(nuevos) + "}\n"
                 )
-                for u in new_pairs_only:
+                for i, j in new_pairs_only:
                     self.text_state.insert(
                         tk.END,
-                        f"    {u['i']} alcanza a {u['j']} gracias a {u['via']} "
-                        f"(W: {u['old']} → {u['new']}).\n"
+                        f"    {self.nodes[i]} alcanza a {self.nodes[j]} gracias a {k_node} "
+                        f"(W: 0 → 1).\n"
                     )
 
 
@@ -0,0 +1,1026 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de los motores de grafos (sin interfaz gráfica).
+
+Uso:
+    python benchmark_grafos.py dijkstra [--edges 100000 1000000]
+    python benchmark_grafos.py bidireccional [--nodes 100000] [--queries 20]
+    python benchmark_grafos.py astar [--nodes 50000] [--queries 20]
+    python benchmark_grafos.py colas
+    python benchmark_grafos.py enteros
+    python benchmark_grafos.py cache [--nodes 100000] [--queries 200]
+    python benchmark_grafos.py ch [--nodes 100000] [--queries 1000]
+    python benchmark_grafos.py carga [--edges 1000000]
+    python benchmark_grafos.py layout [--nodes 1000 10000]
+    python benchmark_grafos.py floyd [--nodes 100 500 2000]
+    python benchmark_grafos.py pasos [--nodes 300]
+    python benchmark_grafos.py floyd-bloques [--nodes 2000] [--workers 1 2 4 8 16 32]
+    python benchmark_grafos.py apsp [--nodes 500 1000 2000]
+    python benchmark_grafos.py disco [--nodes 2000 5000] [--queries 1000]
+    python benchmark_grafos.py rutas [--nodes 1000] [--pairs 1000 10000 100000]
+    python benchmark_grafos.py incremental [--nodes 500 1000 2000]
+    python benchmark_grafos.py cierre [--nodes 1000 10000]
+    python benchmark_grafos.py alcanza [--nodes 10000 100000] [--queries 20000]
+    python benchmark_grafos.py cierre-incremental [--nodes 2000 10000] [--edits 200]
+    python benchmark_grafos.py union-find [--unions 1000000 10000000]
+
+Cada benchmark imprime una tabla con tiempos en segundos.
+
+Requisitos:
+    pip install networkx numpy
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+
+from motor_caminos import (
+    CSRGraph, dijkstra, bidirectional_dijkstra, astar, great_circle_km, admissible_scale,
+)
+from cache_resultados import GraphVersion, ResultCache
+from jerarquia_contraccion import ContractionHierarchy
+from carga_aristas import load_edges, write_binary
+from cache_posiciones import LayoutCache
+from caminos_todos_pares import (
+    initial_matrices, floyd_warshall, blocked_floyd_warshall, iter_pivots,
+    all_pairs, choose_apsp, batch_routes,
+    path_indices, insert_edge, JOHNSON_NS_PER_ARC, FLOYD_NS_PER_CELL,
+)
+from matrices_en_disco import open_or_compute
+from cierre_transitivo import (
+    pack_relation, unpack_rows, warshall_closure, iter_closure_pivots, condensed_closure,
+    words_for, IncrementalClosure,
+)
+from indice_alcanzabilidad import ReachabilityIndex
+from traza_pasos import MatrixTrace
+from union_find import UnionFind
+
+
+# -----------------------------------------------------------
+# Generadores de grafos de prueba
+# -----------------------------------------------------------
+def random_edges(n, m, seed=42, max_weight=100):
+    """
+    m aristas aleatorias (u, v, w) sobre n nodos enteros, con un camino
+    0-1-2-...-(n-1) incluido para que el grafo sea conexo.
+    """
+    rnd = random.Random(seed)
+    edges = [(i, i + 1, float(rnd.randint(1, max_weight))) for i in range(n - 1)]
+    while len(edges) < m:
+        u = rnd.randrange(n)
+        v = rnd.randrange(n)
+        if u != v:
+            edges.append((u, v, float(rnd.randint(1, max_weight))))
+    return edges
+
+
+def grid_edges(side, seed=42, max_weight=10):
+    """Malla side x side (tipo red de calles) con pesos aleatorios."""
+    rnd = random.Random(seed)
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            if c + 1 < side:
+                edges.append((u, u + 1, float(rnd.randint(1, max_weight))))
+            if r + 1 < side:
+                edges.append((u, u + side, float(rnd.randint(1, max_weight))))
+    return edges
+
+
+def road_like_graph(n, k=4, seed=42):
+    """
+    Red tipo carreteras: n puntos (lat, lon) dentro del recuadro de México,
+    cada uno unido a sus k vecinos más cercanos; peso = distancia de gran
+    círculo por un factor de rodeo entre 1.0 y 1.4.
+    """
+    rnd = random.Random(seed)
+    coords = [(rnd.uniform(14.5, 32.5), rnd.uniform(-117.0, -87.0)) for _ in range(n)]
+
+    # Cubetas de una rejilla para buscar vecinos cercanos
+    cell = 18.0 / math.sqrt(n / 1.6)
+    buckets = {}
+    for i, (lat, lon) in enumerate(coords):
+        buckets.setdefault((int(lat / cell), int(lon / cell)), []).append(i)
+
+    edges = []
+    for i, (lat, lon) in enumerate(coords):
+        ci, cj = int(lat / cell), int(lon / cell)
+        near = []
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                near.extend(buckets.get((ci + di, cj + dj), ()))
+        near.sort(key=lambda j: (coords[j][0] - lat) ** 2 + (coords[j][1] - lon) ** 2)
+        for j in near[1:k + 1]:
+            if i < j:
+                d = great_circle_km(coords[i], coords[j])
+                edges.append((i, j, d * rnd.uniform(1.0, 1.4)))
+    return coords, edges
+
+
+def csr_from_int_edges(n, edges, directed=False):
+    sources = [u for u, _, _ in edges]
+    targets = [v for _, v, _ in edges]
+    weights = [w for _, _, w in edges]
+    return CSRGraph.from_arcs(n, sources, targets, weights, directed=directed)
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+# -----------------------------------------------------------
+# Dijkstra: diccionarios de networkx vs motor CSR
+# -----------------------------------------------------------
+def dijkstra_networkx_dict(G, source):
+    """
+    El mismo bucle que usaba DijkstraApp._compute_dijkstra_iterations
+    (heapq + G[u].items()), sin guardar la traza de pasos.
+    """
+    dist = {n: math.inf for n in G.nodes}
+    prev = {n: None for n in G.nodes}
+    dist[source] = 0.0
+    visited = set()
+    pq = [(0.0, source)]
+    while pq:
+        current_dist, u = heapq.heappop(pq)
+        if u in visited or current_dist > dist[u]:
+            continue
+        for v, data in G[u].items():
+            if v in visited:
+                continue
+            new = dist[u] + data.get("weight", 1.0)
+            if new < dist[v]:
+                dist[v] = new
+                prev[v] = u
+                heapq.heappush(pq, (new, v))
+        visited.add(u)
+    return dist, prev
+
+
+def bench_dijkstra(edge_counts):
+    print("Dijkstra: networkx-dict vs CSR (motor_caminos)")
+    print(f"{'aristas':>10} {'nodos':>8} {'nx-dict':>9} {'csr build':>10} "
+          f"{'csr':>8} {'speedup':>8}")
+    for m in edge_counts:
+        n = max(2, m // 5)
+        edges = random_edges(n, m)
+
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_weighted_edges_from(edges)
+        t_nx, (dist_nx, _) = timed(dijkstra_networkx_dict, G, 0)
+
+        t_build, graph = timed(CSRGraph.from_networkx, G)
+        t_csr, (dist_csr, _) = timed(dijkstra, graph, 0)
+
+        assert all(dist_csr[graph.index[v]] == d for v, d in dist_nx.items())
+        print(f"{G.number_of_edges():>10} {n:>8} {t_nx:>9.3f} {t_build:>10.3f} "
+              f"{t_csr:>8.3f} {t_nx / t_csr:>7.2f}x")
+
+
+# -----------------------------------------------------------
+# Dijkstra bidireccional vs unidireccional (punto a punto)
+# -----------------------------------------------------------
+def bench_bidirectional(n, queries):
+    print("Punto a punto: Dijkstra (con parada en destino) vs bidireccional")
+    print(f"{'grafo':>14} {'nodos':>8} {'fijados uni':>12} {'fijados bi':>11} "
+          f"{'ratio':>6} {'t uni':>8} {'t bi':>8}")
+
+    side = int(math.isqrt(n))
+    workloads = [
+        ("aleatorio", n, random_edges(n, 3 * n)),
+        ("malla", side * side, grid_edges(side)),
+    ]
+    for name, size, edges in workloads:
+        graph = csr_from_int_edges(size, edges)
+        rnd = random.Random(1)
+        settled_uni = settled_bi = 0
+        t_uni = t_bi = 0.0
+        for _ in range(queries):
+            s, t = rnd.randrange(size), rnd.randrange(size)
+
+            dt, (dist, _) = timed(dijkstra, graph, s, t)
+            t_uni += dt
+            # Fijados por la búsqueda unidireccional = nodos más cercanos que t
+            full, _ = dijkstra(graph, s)
+            settled_uni += sum(1 for d in full if d <= full[t])
+
+            dt, (d_bi, _, settled) = timed(bidirectional_dijkstra, graph, s, t)
+            t_bi += dt
+            settled_bi += settled
+            assert d_bi == dist[t]
+
+        print(f"{name:>14} {size:>8} {settled_uni / queries:>12.0f} "
+              f"{settled_bi / queries:>11.0f} {settled_uni / max(1, settled_bi):>5.1f}x "
+              f"{t_uni / queries:>8.4f} {t_bi / queries:>8.4f}")
+
+
+# -----------------------------------------------------------
+# A* (gran círculo) vs Dijkstra en una red tipo carreteras
+# -----------------------------------------------------------
+def bench_astar(n, queries):
+    print("A* (heurística de gran círculo) vs Dijkstra, red tipo carreteras")
+    coords, edges = road_like_graph(n)
+    graph = csr_from_int_edges(n, edges)
+    graph.coords = coords
+    # Una pasada O(m) por grafo; queda guardada y las consultas la reutilizan
+    dt_scale, _ = timed(admissible_scale, graph)
+    print(f"escala admisible: {dt_scale:.3f} s (una vez por grafo)")
+
+    rnd = random.Random(1)
+    exp_dij = exp_astar = 0
+    t_dij = t_astar = 0.0
+    solved = 0
+    for _ in range(queries):
+        s, t = rnd.randrange(n), rnd.randrange(n)
+        dt, (d_dij, _, e_dij) = timed(astar, graph, s, t, heuristic=lambda v: 0.0)
+        if d_dij == math.inf:
+            continue
+        dt2, (d_astar, _, e_astar) = timed(astar, graph, s, t)
+        assert abs(d_astar - d_dij) < 1e-6 * max(1.0, d_dij)
+        solved += 1
+        exp_dij += e_dij
+        exp_astar += e_astar
+        t_dij += dt
+        t_astar += dt2
+
+    solved = max(1, solved)
+    print(f"{'método':>10} {'expandidos':>11} {'tiempo (s)':>11}")
+    print(f"{'Dijkstra':>10} {exp_dij / solved:>11.0f} {t_dij / solved:>11.4f}")
+    print(f"{'A*':>10} {exp_astar / solved:>11.0f} {t_astar / solved:>11.4f}")
+    print(f"{'ratio':>10} {exp_dij / max(1, exp_astar):>10.1f}x {t_dij / max(t_astar, 1e-9):>10.1f}x")
+
+
+# -----------------------------------------------------------
+# Colas de prioridad: heapq vs IndexedHeap vs PairingHeap
+# -----------------------------------------------------------
+def dense_edges(n, p, seed=42, max_weight=1000):
+    rnd = random.Random(seed)
+    return [(u, v, float(rnd.randint(1, max_weight)))
+            for u in range(n) for v in range(u + 1, n) if rnd.random() < p]
+
+
+def bench_queues():
+    print("Dijkstra con distintas colas de prioridad (segundos)")
+    print(f"{'carga':>8} {'nodos':>8} {'aristas':>9} {'heapq':>8} {'indexed':>8} {'pairing':>8}")
+    workloads = [
+        ("densa", 1500, dense_edges(1500, 0.5)),
+        ("dispersa", 100_000, random_edges(100_000, 300_000)),
+    ]
+    for name, n, edges in workloads:
+        graph = csr_from_int_edges(n, edges)
+        times = []
+        ref = None
+        for queue in ("heapq", "indexed", "pairing"):
+            dt, (dist, _) = timed(dijkstra, graph, 0, queue=queue)
+            if ref is None:
+                ref = dist
+            assert dist == ref
+            times.append(dt)
+        print(f"{name:>8} {n:>8} {len(edges):>9} " + " ".join(f"{t:>8.3f}" for t in times))
+
+
+# -----------------------------------------------------------
+# Pesos enteros: heapq vs Dial vs radix heap
+# -----------------------------------------------------------
+def bench_integer_weights():
+    print("Dijkstra con pesos enteros (segundos); 'auto' es la elección por defecto")
+    print(f"{'carga':>16} {'heapq':>8} {'dial':>8} {'radix':>8} {'auto':>8}")
+    workloads = [
+        ("aleatorio 1..100", 100_000, random_edges(100_000, 300_000)),
+        ("aleatorio 1..3", 100_000, random_edges(100_000, 300_000, max_weight=3)),
+        ("malla 1..10", 90_000, grid_edges(300)),
+        ("aleatorio 1..1e6", 100_000, random_edges(100_000, 300_000, max_weight=10**6)),
+    ]
+    for name, n, edges in workloads:
+        graph = csr_from_int_edges(n, edges)
+        ref = dijkstra(graph, 0, queue="heapq")
+        row = []
+        for queue in ("heapq", "dial", "radix", "auto"):
+            if queue == "dial" and graph.integer_max_weight() > 10**5:
+                row.append("-")
+                continue
+            dt, result = timed(dijkstra, graph, 0, queue=queue)
+            assert result == ref
+            row.append(f"{dt:.3f}")
+        print(f"{name:>16} " + " ".join(f"{x:>8}" for x in row))
+
+
+# -----------------------------------------------------------
+# Caché de resultados: consultas repetidas sobre el mismo grafo
+# -----------------------------------------------------------
+def bench_cache(n, queries, sources=10, seed=7):
+    edges = random_edges(n, 3 * n)
+    graph = csr_from_int_edges(n, edges)
+    G = nx.Graph()
+    G.add_weighted_edges_from(edges)
+
+    version = GraphVersion()
+    cache = ResultCache()
+    dt_version, _ = timed(version.update, G)
+
+    rnd = random.Random(seed)
+    pool = [rnd.randrange(n) for _ in range(sources)]
+    workload = [rnd.choice(pool) for _ in range(queries)]
+
+    dt_plain, _ = timed(lambda: [dijkstra(graph, s) for s in workload])
+    dt_cached, _ = timed(lambda: [
+        cache.get_or_compute((version.version, "dijkstra", s), lambda: dijkstra(graph, s))
+        for s in workload
+    ])
+
+    print(f"{queries} consultas sobre {sources} orígenes distintos, n={n}")
+    print(f"  sin caché:     {dt_plain:.3f} s")
+    print(f"  con caché:     {dt_cached:.3f} s  (aciertos={cache.hits}, fallos={cache.misses}, "
+          f"{cache.total_bytes / 2**20:.1f} MB)")
+    print(f"  firma/versión: {dt_version:.3f} s por reconstrucción del grafo")
+
+
+# -----------------------------------------------------------
+# Jerarquía de contracción: preproceso, carga y consultas punto a punto
+# -----------------------------------------------------------
+def bench_contraction(n, queries, seed=3):
+    _, edges = road_like_graph(n)
+    graph = csr_from_int_edges(n, edges)
+
+    dt_build, ch = timed(ContractionHierarchy.build, graph)
+    path = os.path.join(tempfile.gettempdir(), "jerarquia_bench.ch")
+    dt_save, _ = timed(ch.save, path)
+    dt_load, ch = timed(ContractionHierarchy.load, path)
+    os.remove(path)
+    print(f"Red tipo carreteras, n={n}, m={graph.m}, atajos={ch.shortcuts}")
+    print(f"  preproceso: {dt_build:.2f} s   guardar: {dt_save:.3f} s   cargar: {dt_load:.3f} s")
+
+    rnd = random.Random(seed)
+    pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(queries)]
+    dt_ch, results = timed(lambda: [ch.query(s, t)[0] for s, t in pairs])
+
+    sample = pairs[:min(20, queries)]
+    dt_dij, ref = timed(lambda: [dijkstra(graph, s, t)[0][t] for s, t in sample])
+    assert all(abs(a - b) < 1e-6 for a, b in zip(results, ref))
+
+    print(f"  consulta CH:        {dt_ch / queries * 1000:.3f} ms")
+    print(f"  Dijkstra con corte: {dt_dij / len(sample) * 1000:.3f} ms")
+
+
+# -----------------------------------------------------------
+# Carga de listas de aristas: texto, CSV y binario
+# -----------------------------------------------------------
+def bench_loader(m, seed=5):
+    n = max(2, m // 5)
+    rnd = random.Random(seed)
+    rows = [(f"n{rnd.randrange(n)}", f"n{rnd.randrange(n)}", rnd.randint(1, 100)) for _ in range(m)]
+
+    folder = tempfile.mkdtemp()
+    paths = {"texto": os.path.join(folder, "aristas.txt"),
+             "csv": os.path.join(folder, "aristas.csv"),
+             "binario": os.path.join(folder, "aristas.edgb")}
+    with open(paths["texto"], "w", encoding="utf-8") as f:
+        f.writelines(f"{u} {v} {w}\n" for u, v, w in rows)
+    with open(paths["csv"], "w", encoding="utf-8") as f:
+        f.write("origen,destino,peso\n")
+        f.writelines(f"{u},{v},{w}\n" for u, v, w in rows)
+    write_binary(paths["binario"], load_edges(paths["texto"]))
+
+    print(f"Carga de {m} aristas sobre ~{n} nodos (segundos)")
+    for name, path in paths.items():
+        dt, edges = timed(load_edges, path)
+        assert edges.report.ok and edges.m == m
+        size = os.path.getsize(path) / 2**20
+        print(f"  {name:>8}: {dt:.2f} s  ({size:.1f} MB)")
+        os.remove(path)
+    os.rmdir(folder)
+
+
+# -----------------------------------------------------------
+# Layout: completo vs caché en disco vs incremental
+# -----------------------------------------------------------
+def bench_layout(sizes, added=0.01, seed=42):
+    folder = tempfile.mkdtemp()
+    print(f"Layout spring (segundos); incremental = +{added:.0%} nodos nuevos")
+    print(f"{'n':>8} {'completo':>10} {'disco':>8} {'memoria':>8} {'incremental':>12}")
+    for n in sizes:
+        G = nx.Graph()
+        G.add_weighted_edges_from(random_edges(n, 2 * n, seed=seed))
+
+        layouts = LayoutCache(folder)
+        dt_full, pos = timed(layouts.layout, G, seed=seed)
+        assert layouts.last_source == "completo"
+        dt_memory, _ = timed(layouts.layout, G, seed=seed)
+        assert layouts.last_source == "memoria"
+        fresh = LayoutCache(folder)
+        dt_disk, _ = timed(fresh.layout, G, seed=seed)
+        assert fresh.last_source == "disco"
+
+        rnd = random.Random(seed)
+        H = G.copy()
+        for v in range(n, n + max(1, int(n * added))):
+            H.add_edge(v, rnd.randrange(n), weight=1.0)
+            H.add_edge(v, rnd.randrange(v), weight=1.0)
+        dt_inc, _ = timed(layouts.layout, H, previous=pos, seed=seed)
+        assert layouts.last_source == "incremental"
+
+        print(f"{n:>8} {dt_full:>10.2f} {dt_disk:>8.3f} {dt_memory:>8.3f} {dt_inc:>12.3f}")
+
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+# -----------------------------------------------------------
+# Floyd-Warshall: triple ciclo en listas vs kernel NumPy
+# -----------------------------------------------------------
+def floyd_python_lists(dist, path, pivots=None):
+    """
+    El triple ciclo que usaba FloydApp._compute_floyd_steps, sin armar los
+    registros de cada celda. pivots: solo los primeros k (para estimar).
+    """
+    n = len(dist)
+    for k in range(n if pivots is None else pivots):
+        dk = dist[k]
+        for i in range(n):
+            di = dist[i]
+            dik = di[k]
+            for j in range(n):
+                via_k = dik + dk[j]
+                if via_k < di[j]:
+                    di[j] = via_k
+                    path[i][j] = path[i][k]
+
+
+def bench_floyd(sizes, python_limit=500, seed=42):
+    print("Floyd-Warshall completo (segundos); '~' = estimado con los primeros pivotes")
+    print(f"{'n':>6} {'m':>8} {'listas':>10} {'numpy':>8} {'aceleración':>12}")
+    for n in sizes:
+        edges = random_edges(n, 4 * n, seed=seed)
+        D, P = initial_matrices(n, [u for u, _, _ in edges], [v for _, v, _ in edges],
+                                [w for _, _, w in edges])
+        dist, path = D.tolist(), P.tolist()
+
+        dt_numpy, _ = timed(floyd_warshall, D, P)
+
+        if n <= python_limit:
+            dt_lists, _ = timed(floyd_python_lists, dist, path)
+            assert dist == D.tolist()
+            mark = " "
+        else:
+            pivots = max(1, n * python_limit ** 3 // n ** 3)
+            dt_part, _ = timed(floyd_python_lists, dist, path, pivots)
+            dt_lists = dt_part * n / pivots
+            mark = "~"
+
+        print(f"{n:>6} {len(edges):>8} {mark}{dt_lists:>9.2f} {dt_numpy:>8.3f} {dt_lists / dt_numpy:>11.0f}x")
+
+
+# -----------------------------------------------------------
+# Floyd-Warshall por mosaicos en varios procesos
+# -----------------------------------------------------------
+def bench_blocked_floyd(n, worker_counts, block=128, seed=42):
+    edges = random_edges(n, 4 * n, seed=seed)
+    D, P = initial_matrices(n, [u for u, _, _ in edges], [v for _, v, _ in edges],
+                            [w for _, _, w in edges])
+    dt_ref, (ref, _) = timed(floyd_warshall, D.copy(), P.copy())
+
+    cores = os.cpu_count() or 1
+    print(f"Floyd-Warshall por mosaicos de {block}, n={n}, {cores} núcleo(s) disponibles")
+    print(f"  referencia (un proceso, por filas): {dt_ref:.2f} s")
+    print(f"{'procesos':>10} {'segundos':>10} {'vs 1 proceso':>13}")
+    base = None
+    for workers in worker_counts:
+        if workers > cores:
+            print(f"{workers:>10} {'(omitido: más procesos que núcleos)':>36}")
+            continue
+        dt, (dist, _) = timed(blocked_floyd_warshall, D.copy(), P.copy(), block, workers)
+        assert (dist == ref).all()
+        base = base or dt
+        print(f"{workers:>10} {dt:>10.2f} {base / dt:>12.1f}x")
+
+
+# -----------------------------------------------------------
+# Todos los pares: Floyd-Warshall vs Johnson y la elección automática
+# -----------------------------------------------------------
+def bench_apsp(sizes, degrees=(2, 8, 64), limit=60.0, seed=42):
+    print("Todos los pares, un proceso (segundos); '~' = estimado, no se corrió (> límite)")
+    print(f"{'n':>6} {'m':>8} {'densidad':>9} {'floyd':>9} {'johnson':>9} {'elige':>8}")
+    for n in sizes:
+        for degree in degrees:
+            m = min(degree * n, n * (n - 1) // 2)
+            edges = random_edges(n, m, seed=seed)
+            args = (n, [u for u, _, _ in edges], [v for _, v, _ in edges], [w for _, _, w in edges])
+            arcs = 2 * len(edges)
+            estimates = {"floyd": n ** 3 * FLOYD_NS_PER_CELL / 1e9,
+                         "johnson": n * (arcs + n) * JOHNSON_NS_PER_ARC / 1e9}
+
+            cells = {}
+            results = []
+            for method in ("floyd", "johnson"):
+                if estimates[method] > limit:
+                    cells[method] = f"~{estimates[method]:.0f}"
+                    continue
+                dt, (dist, _, _) = timed(all_pairs, *args, method=method, workers=1)
+                cells[method] = f"{dt:.2f}"
+                results.append(dist)
+            if len(results) == 2:
+                assert np.allclose(results[0], results[1])
+
+            print(f"{n:>6} {len(edges):>8} {arcs / n ** 2:>9.4f} {cells['floyd']:>9} "
+                  f"{cells['johnson']:>9} {choose_apsp(n, arcs):>8}")
+
+
+# -----------------------------------------------------------
+# Todos los pares en disco: matrices en memoria vs mapeadas
+# -----------------------------------------------------------
+def bench_disk_apsp(sizes, queries, degree=4, seed=42):
+    folder = tempfile.mkdtemp()
+    mb = 2 ** 20
+    print(f"Todos los pares (Johnson), {queries} consultas de ruta al azar")
+    print(f"{'n':>6} {'RAM antes MB':>13} {'disco MB':>9} {'calcular':>9} "
+          f"{'reabrir':>8} {'ruta ms':>8}")
+    for n in sizes:
+        edges = random_edges(n, degree * n, seed=seed)
+        args = (n, [u for u, _, _ in edges], [v for _, v, _ in edges], [w for _, _, w in edges])
+
+        # Antes: D float64 + P int32 completas en RAM
+        in_memory = n * n * (8 + 4)
+
+        dt_compute, store = timed(open_or_compute, *args, directory=folder,
+                                  method="johnson", workers=1)
+        on_disk = store.dist.nbytes + store.next.nbytes
+        del store
+
+        dt_open, store = timed(open_or_compute, *args, directory=folder, method="johnson")
+        rnd = random.Random(seed)
+        pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(queries)]
+        start = time.perf_counter()
+        for i, j in pairs:
+            store.distance(i, j)
+            store.route(i, j)
+        dt_query = (time.perf_counter() - start) / queries
+
+        print(f"{n:>6} {in_memory / mb:>13.0f} {on_disk / mb:>9.0f} {dt_compute:>9.2f} "
+              f"{dt_open:>8.3f} {dt_query * 1e3:>8.3f}")
+        del store
+
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+# -----------------------------------------------------------
+# Reconstrucción de rutas: un par a la vez vs por lotes
+# -----------------------------------------------------------
+def bench_routes(n, pair_counts, degree=2, seed=42):
+    edges = random_edges(n, degree * n, seed=seed)
+    D, P, _ = all_pairs(n, [u for u, _, _ in edges], [v for _, v, _ in edges],
+                        [w for _, _, w in edges])
+    rnd = np.random.default_rng(seed)
+    print(f"Reconstrucción de rutas, n={n}, m={len(edges)} (segundos)")
+    print(f"{'pares':>8} {'saltos':>9} {'uno a uno':>10} {'lotes':>8} {'mejora':>7}")
+    for count in pair_counts:
+        sources = rnd.integers(0, n, count)
+        targets = rnd.integers(0, n, count)
+
+        def one_by_one():
+            return [(D[i, j], path_indices(P, i, j)) for i, j in zip(sources, targets)]
+
+        dt_loop, routes = timed(one_by_one)
+        dt_batch, (dist, offsets, values) = timed(batch_routes, D, P, sources, targets)
+        assert all(list(values[offsets[k]:offsets[k + 1]]) == route
+                   for k, (_, route) in enumerate(routes[:1000]))
+        print(f"{count:>8} {len(values):>9} {dt_loop:>10.3f} {dt_batch:>8.3f} "
+              f"{dt_loop / dt_batch:>6.0f}x")
+
+
+# -----------------------------------------------------------
+# Arista nueva: recalcular todos los pares vs actualización incremental
+# -----------------------------------------------------------
+def bench_incremental(sizes, degree=4, inserts=10, seed=42):
+    print(f"Agregar una arista (segundos; incremental = promedio de {inserts})")
+    print(f"{'n':>6} {'recalcular':>11} {'incremental':>12} {'mejora':>7}")
+    for n in sizes:
+        edges = random_edges(n, degree * n, seed=seed)
+        sources = [u for u, _, _ in edges]
+        targets = [v for _, v, _ in edges]
+        weights = [w for _, _, w in edges]
+        D, P = initial_matrices(n, sources, targets, weights)
+        floyd_warshall(D, P)
+
+        rnd = random.Random(seed)
+        new = [(rnd.randrange(n), rnd.randrange(n), rnd.randint(1, 100)) for _ in range(inserts)]
+        start = time.perf_counter()
+        for u, v, w in new:
+            insert_edge(D, P, u, v, w)
+        dt_inc = (time.perf_counter() - start) / inserts
+
+        dt_full, (full, _) = timed(floyd_warshall, *initial_matrices(
+            n, sources + [u for u, _, _ in new], targets + [v for _, v, _ in new],
+            weights + [w for _, _, w in new]))
+        assert np.array_equal(D, full)
+        print(f"{n:>6} {dt_full:>11.2f} {dt_inc:>12.4f} {dt_full / dt_inc:>6.0f}x")
+
+
+# -----------------------------------------------------------
+# Cierre transitivo: listas de 0/1 vs matriz uint8 vs filas de bits
+# -----------------------------------------------------------
+def closure_python_lists(W, pivots):
+    """El triple ciclo que usaba WarshallApp, sobre los primeros `pivots` k."""
+    n = len(W)
+    for k in range(pivots):
+        for i in range(n):
+            for j in range(n):
+                W[i][j] = W[i][j] or (W[i][k] and W[k][j])
+
+
+def closure_uint8(W, pivots):
+    """Un pivote por vez sobre la matriz uint8 completa (sin filas de bits)."""
+    for k in range(pivots):
+        W |= W[:, k, None] & W[None, k, :]
+
+
+def bench_closure(sizes, degrees=(1.2, 3), sample=4, seed=42):
+    print("Cierre transitivo (segundos); '~' = extrapolado de los primeros pivotes")
+    print(f"{'n':>7} {'m':>8} {'cierre':>7} {'listas':>9} {'uint8':>9} {'bits':>7} {'scc':>7}")
+    for n in sizes:
+        for degree in degrees:
+            rnd = np.random.default_rng(seed)
+            m = int(degree * n)
+            sources, targets = rnd.integers(0, n, m), rnd.integers(0, n, m)
+            W = unpack_rows(pack_relation(n, sources, targets), n)
+
+            pivots = min(n, sample)
+            dt, _ = timed(closure_python_lists, W.tolist(), pivots)
+            lists = f"~{dt * n / pivots:.0f}"
+            pivots = min(n, 16 * sample)
+            dt, _ = timed(closure_uint8, W.copy(), pivots)
+            dense = f"~{dt * n / pivots:.1f}"
+
+            R = pack_relation(n, sources, targets)
+            dt_bits, _ = timed(warshall_closure, R)
+            dt_scc, condensed = timed(condensed_closure, n, sources, targets)
+            assert np.array_equal(R, condensed)
+            filled = unpack_rows(R, n).mean()
+            print(f"{n:>7} {m:>8} {filled:>6.0%} {lists:>9} {dense:>9} {dt_bits:>7.2f} "
+                  f"{dt_scc:>7.2f}")
+
+
+# -----------------------------------------------------------
+# Cierre con ediciones: recalcular vs mantener
+# -----------------------------------------------------------
+def bench_incremental_closure(sizes, edits, degrees=(1.2, 3), seed=42):
+    print(f"Cierre transitivo por edición (ms); promedio de {edits} inserciones y "
+          f"{edits} borrados al azar")
+    print(f"{'n':>7} {'m':>7} {'recalcular':>11} {'insertar':>9} {'borrar':>8} {'filas/borrado':>14}")
+    for n in sizes:
+        for degree in degrees:
+            rnd = random.Random(seed)
+            m = int(degree * n)
+            edges = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(m)]
+            sources, targets = [u for u, _ in edges], [v for _, v in edges]
+            dt_full, _ = timed(condensed_closure, n, sources, targets)
+            closure = IncrementalClosure(n, sources, targets)
+
+            new = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(edits)]
+            start = time.perf_counter()
+            for u, v in new:
+                closure.insert(u, v)
+            dt_insert = (time.perf_counter() - start) / edits
+            edges += new
+
+            rnd.shuffle(edges)
+            gone, edges = edges[:edits], edges[edits:]
+            rows = 0
+            start = time.perf_counter()
+            for u, v in gone:
+                rows += closure.delete(u, v)
+            dt_delete = (time.perf_counter() - start) / edits
+
+            assert np.array_equal(closure.R, condensed_closure(
+                n, [u for u, _ in edges], [v for _, v in edges]))
+            print(f"{n:>7} {m:>7} {dt_full * 1e3:>11.1f} {dt_insert * 1e3:>9.2f} "
+                  f"{dt_delete * 1e3:>8.2f} {rows / edits:>14.0f}")
+
+
+# -----------------------------------------------------------
+# ¿X alcanza a Y?: cierre completo vs índice compacto
+# -----------------------------------------------------------
+def bench_reachability(sizes, queries, degrees=(1.2, 1.5, 3), max_closure_bytes=2 ** 31, seed=42):
+    mb = 2 ** 20
+    print(f"Alcanzabilidad, {queries} pares al azar; '~' = no se construyó (> "
+          f"{max_closure_bytes / mb:,.0f} MB)")
+    print(f"{'n':>7} {'m':>7} {'cierre MB':>10} {'s':>6} {'índice MB':>10} {'s':>6} "
+          f"{'µs/lote':>8} {'µs/una':>7} {'búsqueda':>9} {'sí':>5}")
+    for n in sizes:
+        for degree in degrees:
+            rnd = np.random.default_rng(seed)
+            m = int(degree * n)
+            sources, targets = rnd.integers(0, n, m), rnd.integers(0, n, m)
+            a, b = rnd.integers(0, n, queries), rnd.integers(0, n, queries)
+
+            closure_bytes = n * words_for(n) * 8
+            closure = None
+            if closure_bytes <= max_closure_bytes:
+                dt_closure, closure = timed(condensed_closure, n, sources, targets)
+                closure_cell = f"{dt_closure:>6.2f}"
+            else:
+                closure_cell = f"{'~':>6}"
+
+            dt_build, index = timed(ReachabilityIndex, n, sources, targets)
+            dt_batch, answers = timed(index.query, a, b)
+            searches = index.fallbacks
+            single = min(queries, 2000)
+            dt_single, _ = timed(lambda: [index.reaches(i, j) for i, j in zip(a[:single], b[:single])])
+            if closure is not None:
+                expected = (closure[a, b >> 6] >> (b & 63).astype(np.uint64)) & np.uint64(1)
+                assert np.array_equal(answers, expected.astype(bool))
+
+            print(f"{n:>7} {m:>7} {closure_bytes / mb:>10,.0f} {closure_cell} "
+                  f"{index.nbytes() / mb:>10.1f} {dt_build:>6.2f} "
+                  f"{dt_batch / queries * 1e6:>8.1f} {dt_single / single * 1e6:>7.1f} "
+                  f"{searches / queries:>8.1%} {answers.mean():>5.0%}")
+
+
+# -----------------------------------------------------------
+# Union-Find: diccionarios + find recursivo vs array('i') vs en bloque
+# -----------------------------------------------------------
+def union_find_dicts(n, sources, targets):
+    """El Union-Find que tenía Kruskal: dicts, find recursivo, unión por rango."""
+    parent = {v: v for v in range(n)}
+    rank = {v: 0 for v in range(n)}
+
+    def find(x):
+        if parent[x] != x:
+            parent[x] = find(parent[x])
+        return parent[x]
+
+    merged = 0
+    for x, y in zip(sources, targets):
+        rx, ry = find(x), find(y)
+        if rx == ry:
+            continue
+        if rank[rx] < rank[ry]:
+            rx, ry = ry, rx
+        parent[ry] = rx
+        if rank[rx] == rank[ry]:
+            rank[rx] += 1
+        merged += 1
+    return merged
+
+
+def union_find_loop(n, sources, targets):
+    sets = UnionFind(n)
+    union = sets.union
+    return sum(union(x, y) for x, y in zip(sources, targets))
+
+
+def union_find_bulk(n, sources, targets):
+    return UnionFind(n).union_many(sources, targets)
+
+
+def bench_union_find(counts, max_dict_unions=2_000_000, seed=42):
+    print(f"Union-Find, m uniones al azar sobre n = m nodos (s); '~' = no se midió "
+          f"(> {max_dict_unions:,} uniones)")
+    print(f"{'m':>9} {'dicts':>7} {'array':>7} {'bloque':>7} {'x dicts':>8} {'MB':>6} {'conjuntos':>10}")
+    for m in counts:
+        n = m
+        rnd = np.random.default_rng(seed)
+        sources, targets = rnd.integers(0, n, m), rnd.integers(0, n, m)
+        pairs = (sources.tolist(), targets.tolist())
+
+        dt_loop, merged = timed(union_find_loop, n, *pairs)
+        dt_bulk, merged_bulk = timed(union_find_bulk, n, sources, targets)
+        assert merged_bulk == merged
+        if m <= max_dict_unions:
+            dt_dict, merged_dict = timed(union_find_dicts, n, *pairs)
+            assert merged_dict == merged
+            dict_cell, ratio = f"{dt_dict:>7.2f}", f"{dt_dict / dt_bulk:>7.1f}x"
+        else:
+            dict_cell, ratio = f"{'~':>7}", f"{'~':>8}"
+        print(f"{m:>9} {dict_cell} {dt_loop:>7.2f} {dt_bulk:>7.2f} {ratio} "
+              f"{UnionFind(n).nbytes() / 2 ** 20:>6.0f} {n - merged:>10}")
+
+
+# -----------------------------------------------------------
+# Memoria de los pasos de Floyd / Warshall: copias + dicts vs deltas
+# -----------------------------------------------------------
+def floyd_steps_dict_records(nodes, dist, path, pivots):
+    """
+    Los pasos como los guardaba FloydApp antes: un dict por celda (haya
+    cambiado o no) y copias completas de las matrices en cada k.
+    """
+    n = len(nodes)
+    steps = []
+    for k in range(pivots):
+        updates = []
+        for i in range(n):
+            for j in range(n):
+                old_d, old_p = dist[i][j], path[i][j]
+                via_k = dist[i][k] + dist[k][j]
+                changed = via_k < old_d
+                if changed:
+                    dist[i][j] = via_k
+                    path[i][j] = path[i][k]
+                updates.append({"i": nodes[i], "j": nodes[j], "old_d": old_d, "new_d": via_k,
+                                "old_p": old_p, "new_p": path[i][j], "via": nodes[k],
+                                "changed": changed})
+        steps.append({"dist": [row[:] for row in dist], "path": [row[:] for row in path],
+                      "updates": updates})
+    return steps
+
+
+def warshall_steps_dict_records(nodes, W, pivots):
+    """Igual que floyd_steps_dict_records, para los pasos que guardaba WarshallApp."""
+    n = len(nodes)
+    steps = []
+    for k in range(pivots):
+        updates = []
+        for i in range(n):
+            for j in range(n):
+                old = W[i][j]
+                new = old or (W[i][k] and W[k][j])
+                W[i][j] = new
+                updates.append({"i": nodes[i], "j": nodes[j], "old": old, "new": new,
+                                "via": nodes[k], "changed": new != old})
+        steps.append({"matrix": [row[:] for row in W], "updates": updates})
+    return steps
+
+
+def traced_peak(fn, *args):
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_step_memory(n, sample=3, seed=42):
+    edges = random_edges(n, 4 * n, seed=seed)
+    nodes = [f"n{i}" for i in range(n)]
+    sources = [u for u, _, _ in edges]
+    targets = [v for _, v, _ in edges]
+    D, P = initial_matrices(n, sources, targets, [w for _, _, w in edges])
+
+    # Antes: se mide con los primeros `sample` pivotes y se extrapola a n
+    names = [[nodes[p] if p >= 0 else "-" for p in row] for row in P.tolist()]
+    peak, _ = traced_peak(floyd_steps_dict_records, nodes, D.tolist(), names, sample)
+    old_floyd = peak * n / sample
+
+    def floyd_trace():
+        dist, path = D.copy(), P.copy()
+        trace = MatrixTrace({"dist": dist, "path": path}, nodes, iter_pivots(dist, path))
+        while trace.forward() is not None:
+            pass
+        return trace
+
+    peak_floyd, trace = traced_peak(floyd_trace)
+    changed_floyd = sum(len(trace[s]["updates"]) for s in range(1, len(trace)))
+    floyd_bytes = trace.nbytes()
+
+    def warshall_trace():
+        R = pack_relation(n, sources, targets)
+        trace = MatrixTrace({"matrix": unpack_rows(R, n)}, nodes, iter_closure_pivots(R))
+        while trace.forward() is not None:
+            pass
+        return trace
+
+    peak_warshall, trace = traced_peak(warshall_trace)
+    warshall_bytes = trace.nbytes()
+    W = unpack_rows(pack_relation(n, sources, targets), n).tolist()
+    peak, _ = traced_peak(warshall_steps_dict_records, nodes, W, sample)
+    old_warshall = peak * n / sample
+
+    mb = 2 ** 20
+    print(f"Memoria de todos los pasos, n={n}, m={len(edges)}")
+    print(f"  Floyd    antes: ~{old_floyd / mb:,.0f} MB (extrapolado de {sample} pivotes)")
+    print(f"           ahora: {floyd_bytes / mb:.1f} MB en la traza "
+          f"({changed_floyd} celdas cambiadas), pico {peak_floyd / mb:.1f} MB")
+    print(f"  Warshall antes: ~{old_warshall / mb:,.0f} MB (extrapolado de {sample} pivotes)")
+    print(f"           ahora: {warshall_bytes / mb:.1f} MB en la traza, pico {peak_warshall / mb:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de Grafos/")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("dijkstra", help="networkx-dict vs CSR")
+    p.add_argument("--edges", type=int, nargs="+", default=[100_000, 1_000_000])
+
+    p = sub.add_parser("bidireccional", help="nodos fijados: uni vs bidireccional")
+    p.add_argument("--nodes", type=int, default=100_000)
+    p.add_argument("--queries", type=int, default=20)
+
+    p = sub.add_parser("astar", help="expansiones y tiempo: Dijkstra vs A*")
+    p.add_argument("--nodes", type=int, default=50_000)
+    p.add_argument("--queries", type=int, default=20)
+
+    sub.add_parser("colas", help="heapq vs decrease-key (densa y dispersa)")
+
+    sub.add_parser("enteros", help="heapq vs Dial vs radix (pesos enteros)")
+
+    p = sub.add_parser("cache", help="consultas repetidas con y sin caché")
+    p.add_argument("--nodes", type=int, default=100_000)
+    p.add_argument("--queries", type=int, default=200)
+
+    p = sub.add_parser("carga", help="carga de aristas: texto vs CSV vs binario")
+    p.add_argument("--edges", type=int, default=1_000_000)
+
+    p = sub.add_parser("layout", help="layout: completo vs caché en disco vs incremental")
+    p.add_argument("--nodes", type=int, nargs="+", default=[1_000, 10_000])
+
+    p = sub.add_parser("floyd", help="Floyd-Warshall: listas de Python vs NumPy")
+    p.add_argument("--nodes", type=int, nargs="+", default=[100, 500, 2000])
+
+    p = sub.add_parser("floyd-bloques", help="Floyd-Warshall por mosaicos en varios procesos")
+    p.add_argument("--nodes", type=int, default=2000)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+
+    p = sub.add_parser("apsp", help="todos los pares: Floyd-Warshall vs Johnson")
+    p.add_argument("--nodes", type=int, nargs="+", default=[500, 1000, 2000])
+
+    p = sub.add_parser("disco", help="todos los pares en archivos mapeados en memoria")
+    p.add_argument("--nodes", type=int, nargs="+", default=[2000, 5000])
+    p.add_argument("--queries", type=int, default=1000)
+
+    p = sub.add_parser("rutas", help="rutas de muchos pares: una a una vs por lotes")
+    p.add_argument("--nodes", type=int, default=1000)
+    p.add_argument("--pairs", type=int, nargs="+", default=[1000, 10_000, 100_000])
+
+    p = sub.add_parser("incremental", help="arista nueva: recalcular vs insert_edge")
+    p.add_argument("--nodes", type=int, nargs="+", default=[500, 1000, 2000])
+
+    p = sub.add_parser("cierre", help="cierre transitivo: listas vs uint8 vs bits vs SCC")
+    p.add_argument("--nodes", type=int, nargs="+", default=[1000, 10_000])
+
+    p = sub.add_parser("alcanza", help="¿X alcanza a Y?: cierre completo vs índice compacto")
+    p.add_argument("--nodes", type=int, nargs="+", default=[10_000, 100_000])
+    p.add_argument("--queries", type=int, default=20_000)
+
+    p = sub.add_parser("cierre-incremental", help="cierre con ediciones: recalcular vs mantener")
+    p.add_argument("--nodes", type=int, nargs="+", default=[2000, 10_000])
+    p.add_argument("--edits", type=int, default=200)
+
+    p = sub.add_parser("union-find", help="Union-Find: dicts recursivos vs array('i') vs en bloque")
+    p.add_argument("--unions", type=int, nargs="+", default=[1_000_000, 10_000_000])
+
+    p = sub.add_parser("pasos", help="memoria de los pasos de Floyd / Warshall")
+    p.add_argument("--nodes", type=int, default=300)
+
+    p = sub.add_parser("ch", help="jerarquía de contracción vs Dijkstra punto a punto")
+    p.add_argument("--nodes", type=int, default=100_000)
+    p.add_argument("--queries", type=int, default=1000)
+
+    args = parser.parse_args()
+    if args.bench == "dijkstra":
+        bench_dijkstra(args.edges)
+    elif args.bench == "bidireccional":
+        bench_bidirectional(args.nodes, args.queries)
+    elif args.bench == "astar":
+        bench_astar(args.nodes, args.queries)
+    elif args.bench == "colas":
+        bench_queues()
+    elif args.bench == "enteros":
+        bench_integer_weights()
+    elif args.bench == "cache":
+        bench_cache(args.nodes, args.queries)
+    elif args.bench == "ch":
+        bench_contraction(args.nodes, args.queries)
+    elif args.bench == "carga":
+        bench_loader(args.edges)
+    elif args.bench == "layout":
+        bench_layout(args.nodes)
+    elif args.bench == "floyd":
+        bench_floyd(args.nodes)
+    elif args.bench == "floyd-bloques":
+        bench_blocked_floyd(args.nodes, args.workers)
+    elif args.bench == "apsp":
+        bench_apsp(args.nodes)
+    elif args.bench == "disco":
+        bench_disk_apsp(args.nodes, args.queries)
+    elif args.bench == "rutas":
+        bench_routes(args.nodes, args.pairs)
+    elif args.bench == "incremental":
+        bench_incremental(args.nodes)
+    elif args.bench == "cierre":
+        bench_closure(args.nodes)
+    elif args.bench == "alcanza":
+        bench_reachability(args.nodes, args.queries)
+    elif args.bench == "cierre-incremental":
+        bench_incremental_closure(args.nodes, args.edits)
+    elif args.bench == "union-find":
+        bench_union_find(args.unions)
+    elif args.bench == "pasos":
+        bench_step_memory(args.nodes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Caché de posiciones (layout) de los grafos, guardada en disco.
+
+nx.spring_layout es lo más lento al abrir un grafo grande y antes se
+repetía en cada "Construir grafo". LayoutCache lo evita de dos formas:
+
+- Por firma: las posiciones se guardan en un .npy cuyo nombre es un hash
+  del grafo (nodos, aristas, pesos) y de los parámetros del layout. Abrir
+  otra vez el mismo grafo solo lee el archivo.
+- Incremental: si el grafo nuevo es casi el anterior (se agregaron pocos
+  nodos), los nodos viejos conservan su lugar; los nuevos se colocan junto
+  a sus vecinos y se ajustan con unas iteraciones de Fruchterman–Reingold
+  donde solo se mueven ellos. Cuesta O(nuevos · n) por iteración en lugar
+  de rehacer todo, y el dibujo no "salta".
+
+Uso:
+    layouts = LayoutCache()
+    pos = layouts.layout(G, previous=pos_anterior, seed=42)
+"""
+
+import hashlib
+import os
+import tempfile
+
+import networkx as nx
+import numpy as np
+
+from cache_resultados import ResultCache
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "grafos", "layouts")
+
+
+def layout_key(G, params):
+    """
+    Hash hexadecimal del grafo y de los parámetros del layout. Devuelve
+    también los nodos en orden canónico (el orden en que se guardan).
+    """
+    order = sorted(G.nodes, key=repr)
+    h = hashlib.sha1()
+    h.update(repr(sorted(params.items())).encode("utf-8"))
+    h.update(b"D" if G.is_directed() else b"U")
+    h.update("\x00".join(map(repr, order)).encode("utf-8"))
+
+    edges = []
+    for u, v, d in G.edges(data=True):
+        a, b = repr(u), repr(v)
+        if not G.is_directed() and b < a:
+            a, b = b, a
+        edges.append(f"{a}\x01{b}\x01{d.get('weight', 1.0)!r}")
+    edges.sort()
+    h.update("\x00".join(edges).encode("utf-8"))
+    return h.hexdigest(), order
+
+
+class LayoutCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_files=200, max_new_fraction=0.2):
+        """
+        directory: carpeta de los .npy (None = solo en memoria).
+        max_new_fraction: hasta qué fracción de nodos nuevos se refina el
+        layout anterior en lugar de calcularlo desde cero.
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.max_new_fraction = max_new_fraction
+        self.memory = ResultCache(max_entries=16)
+        self.last_source = None     # "memoria", "disco", "incremental" o "completo"
+
+    # -----------------------------------------------------------
+    # Punto de entrada
+    # -----------------------------------------------------------
+    def layout(self, G, previous=None, iterations=50, **params):
+        """
+        Posiciones {nodo: (x, y)} de G con nx.spring_layout(G, **params).
+        previous: posiciones del grafo anterior (p. ej. self.pos de la app);
+        se usan si G agregó unos cuantos nodos. Si los nodos son los mismos
+        el layout se calcula completo (las aristas pudieron cambiar).
+        """
+        params["iterations"] = iterations
+        key, order = layout_key(G, params)
+
+        coords = self.memory.get(key)
+        if coords is not None:
+            self.last_source = "memoria"
+        else:
+            coords = self._read(key, len(order))
+            if coords is not None:
+                self.last_source = "disco"
+            else:
+                pos = self._incremental(G, previous, iterations)
+                if pos is not None:
+                    self.last_source = "incremental"
+                else:
+                    pos = nx.spring_layout(G, **params)
+                    self.last_source = "completo"
+                coords = np.array([pos[n] for n in order], dtype=float)
+                self._write(key, coords)
+            self.memory.put(key, coords)
+
+        return {n: tuple(xy) for n, xy in zip(order, coords)}
+
+    # -----------------------------------------------------------
+    # Refinamiento incremental
+    # -----------------------------------------------------------
+    def _incremental(self, G, previous, iterations):
+        """
+        Posiciones refinadas desde `previous`, o None para calcularlas desde
+        cero. Solo sirve si G agregó nodos: con los mismos nodos (o menos)
+        pudieron cambiar las aristas, y el layout anterior ya no vale.
+        """
+        if not previous:
+            return None
+        kept = [n for n in G.nodes if n in previous]
+        new = [n for n in G.nodes if n not in previous]
+        if not new or len(kept) < 2 or len(new) > self.max_new_fraction * len(G):
+            return None
+
+        pos = {n: np.asarray(previous[n], dtype=float) for n in kept}
+        refine_new_nodes(G, pos, new, iterations)
+        return pos
+
+    # -----------------------------------------------------------
+    # Disco
+    # -----------------------------------------------------------
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def _read(self, key, n):
+        if self.directory is None:
+            return None
+        try:
+            coords = np.load(self._path(key), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if coords.shape != (n, 2):
+            return None
+        return coords
+
+    def _write(self, key, coords):
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Se escribe en un temporal y se renombra: otra app que lea al
+            # mismo tiempo nunca ve un archivo a medias.
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, coords)
+            os.replace(tmp, self._path(key))
+            self._prune()
+        except OSError:
+            pass    # sin caché en disco; el layout ya está calculado
+
+    def _prune(self):
+        files = [os.path.join(self.directory, name)
+                 for name in os.listdir(self.directory) if name.endswith(".npy")]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            os.remove(path)
+
+
+def refine_new_nodes(G, pos, new, iterations=50, seed=42):
+    """
+    Agrega a `pos` los nodos de `new` y los acomoda con Fruchterman–Reingold
+    dejando fijos los demás. pos: {nodo: arreglo (x, y)} de los nodos viejos.
+    """
+    rnd = np.random.default_rng(seed)
+    fixed = np.array(list(pos.values()))
+    lo, hi = fixed.min(axis=0), fixed.max(axis=0)
+    span = max(float((hi - lo).max()), 1e-9)
+
+    # Posición inicial: centro de los vecinos ya colocados (en orden BFS
+    # para que las cadenas de nodos nuevos queden juntas)
+    pending = list(new)
+    while pending:
+        left = []
+        for n in pending:
+            near = [pos[m] for m in nx.all_neighbors(G, n) if m in pos]
+            if near:
+                pos[n] = np.mean(near, axis=0) + rnd.normal(0.0, 0.05 * span, 2)
+            else:
+                left.append(n)
+        if len(left) == len(pending):
+            # Ninguno tiene vecinos colocados: uno al azar dentro del recuadro
+            pos[left[0]] = lo + rnd.random(2) * (hi - lo)
+            left = left[1:]
+        pending = left
+
+    nodes = list(pos)
+    index = {n: i for i, n in enumerate(nodes)}
+    xy = np.array([pos[n] for n in nodes])
+    moving = np.array([index[n] for n in new])
+
+    # Aristas (en ambos sentidos) de los nodos que se mueven
+    rows, cols, weights = [], [], []
+    for r, n in enumerate(new):
+        for m, d in G[n].items():
+            rows.append(r)
+            cols.append(index[m])
+            weights.append(d.get("weight", 1.0))
+        if G.is_directed():
+            for m, d in G.pred[n].items():
+                rows.append(r)
+                cols.append(index[m])
+                weights.append(d.get("weight", 1.0))
+    rows = np.array(rows, dtype=int)
+    cols = np.array(cols, dtype=int)
+    weights = np.array(weights, dtype=float)
+
+    k = span / np.sqrt(len(nodes))     # distancia ideal entre nodos
+    t = 0.1 * span
+    dt = t / (iterations + 1)
+    x, y = xy[:, 0], xy[:, 1]
+    for _ in range(iterations):
+        # Repulsión de todos los nodos: k² / d (x e y por separado, en
+        # matrices (nuevos, n) contiguas; es lo que domina el tiempo)
+        dx = x[moving, None] - x[None, :]
+        dy = y[moving, None] - y[None, :]
+        scale = dx * dx
+        scale += dy * dy
+        np.maximum(scale, (0.01 * k) ** 2, out=scale)
+        np.divide(k * k, scale, out=scale)
+        force = np.column_stack(((dx * scale).sum(axis=1), (dy * scale).sum(axis=1)))
+
+        # Atracción por las aristas: d² / k (por el peso, como networkx)
+        if len(rows):
+            pull = xy[cols] - xy[moving[rows]]
+            length = np.sqrt((pull ** 2).sum(axis=1))
+            np.add.at(force, rows, pull * (weights * length / k)[:, None])
+
+        size = np.maximum(np.sqrt((force ** 2).sum(axis=1)), 0.01)
+        xy[moving] += force * (np.minimum(size, t) / size)[:, None]
+        t -= dt
+
+    for i in moving:
+        pos[nodes[i]] = xy[i]
+    return pos
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Caché de resultados de caminos mínimos.
+
+- GraphVersion: contador de versión de un grafo. Solo sube cuando el grafo
+  realmente cambia (nodos, aristas o pesos), así que reconstruir el mismo
+  grafo no invalida nada.
+- ResultCache: memoización LRU con tope de entradas y de memoria. Las
+  claves empiezan con la versión del grafo: (versión, tipo, origen, ...).
+  Al cambiar la versión, retain_version() libera lo que ya no sirve.
+
+Uso típico:
+
+    version = GraphVersion()
+    cache = ResultCache()
+    version.update(G)                      # tras construir / editar G
+    dist, prev = cache.get_or_compute(
+        (version.version, "dijkstra", s),
+        lambda: dijkstra(graph, s),
+    )
+"""
+
+from collections import OrderedDict
+import sys
+
+
+def graph_signature(G):
+    """Firma comparable de un grafo de networkx: nodos + aristas con peso."""
+    if G.is_directed():
+        edges = frozenset((u, v, d.get("weight", 1.0)) for u, v, d in G.edges(data=True))
+    else:
+        edges = frozenset((frozenset((u, v)), d.get("weight", 1.0)) for u, v, d in G.edges(data=True))
+    return frozenset(G.nodes), edges
+
+
+class GraphVersion:
+    def __init__(self):
+        self.version = 0
+        self._signature = None
+
+    def update(self, G):
+        """Sube la versión si G cambió desde la última llamada. True si cambió."""
+        signature = graph_signature(G)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.version += 1
+        return True
+
+    def touch(self):
+        """Marca un cambio ya conocido (p. ej. una arista editada) sin comparar."""
+        self._signature = None
+        self.version += 1
+
+
+def estimate_size(value, _depth=0):
+    """
+    Tamaño aproximado en bytes. Usa value.nbytes() si existe; si no, suma
+    sys.getsizeof recorriendo listas, tuplas, diccionarios y conjuntos.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if callable(nbytes):
+        return nbytes()
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = sys.getsizeof(value)
+    if _depth > 3:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class ResultCache:
+    def __init__(self, max_entries=256, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # clave -> (valor, bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+        # Algunos valores crecen después de guardarse (trazas perezosas)
+        value, old_size = entry
+        new_size = estimate_size(value) if hasattr(value, "nbytes") else old_size
+        if new_size != old_size:
+            self._entries[key] = (value, new_size)
+            self.total_bytes += new_size - old_size
+            self._evict()
+        return value
+
+    def put(self, key, value, nbytes=None):
+        if nbytes is None:
+            nbytes = estimate_size(value)
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        if nbytes > self.max_bytes:
+            return value    # no cabe: se devuelve sin guardar
+        self._entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+        return value
+
+    def get_or_compute(self, key, compute, nbytes=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, compute(), nbytes)
+        return value
+
+    def retain_version(self, version):
+        """Elimina las entradas de versiones distintas a `version`."""
+        for key in [k for k in self._entries if k[0] != version]:
+            self.total_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self.total_bytes > self.max_bytes):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+
+
+_MISSING = object()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Caminos mínimos de una fuente con actualización dinámica (estilo
+Ramalingam–Reps).
+
+Cuando cambia el peso de UNA arista no hace falta repetir Dijkstra
+completo: se reparan solo los nodos afectados a partir de los dist / prev
+que ya se tienen.
+
+- Si el peso BAJA (o la arista es nueva): si dist[u] + w < dist[v], v
+  mejora; se corre Dijkstra sembrado solo con v y la mejora se propaga
+  mientras siga bajando distancias.
+- Si el peso SUBE (o la arista se borra) y la arista está en el árbol de
+  caminos mínimos (prev[v] == u): los afectados son el subárbol de v.
+  Se olvidan sus distancias, cada uno toma la mejor entrada desde un
+  nodo NO afectado y se corre Dijkstra solo sobre ellos.
+
+El grafo es cualquier objeto con la interfaz de networkx (G[u] con los
+vecinos y sus atributos, G.pred en dirigidos); no se importa networkx.
+"""
+
+import heapq
+import math
+
+
+class DynamicSSSP:
+    def __init__(self, G, source, weight="weight", dist=None, prev=None):
+        """
+        dist / prev: resultado previo de Dijkstra desde source (con nombres
+        de nodo). Si no se dan, se calculan aquí.
+        """
+        self.G = G
+        self.source = source
+        self.weight = weight
+        if dist is None or prev is None:
+            dist, prev = self._dijkstra()
+        self.dist = dict(dist)
+        self.prev = dict(prev)
+
+        # Hijos de cada nodo en el árbol de caminos mínimos
+        self.children = {n: set() for n in G.nodes}
+        for v, u in self.prev.items():
+            if u is not None:
+                self.children[u].add(v)
+
+    # -----------------------------------------------------------
+    # Consultas
+    # -----------------------------------------------------------
+    def path_to(self, target):
+        """Ruta source → target (lista vacía si no hay)."""
+        if self.dist.get(target, math.inf) == math.inf:
+            return []
+        path = []
+        while target is not None:
+            path.append(target)
+            target = self.prev[target]
+        path.reverse()
+        return path
+
+    # -----------------------------------------------------------
+    # Cambios en el grafo
+    # -----------------------------------------------------------
+    def set_weight(self, u, v, weight):
+        """
+        Pone el peso de la arista u-v (la crea si no existe) y repara
+        dist / prev. Devuelve {nodo: (dist_antes, dist_después)} de los
+        nodos cuya distancia cambió.
+        """
+        old = self.G[u][v][self.weight] if self.G.has_edge(u, v) else math.inf
+        if self.G.has_edge(u, v):
+            self.G[u][v][self.weight] = weight
+        else:
+            self.G.add_edge(u, v, **{self.weight: weight})
+        return self._repair(self._arcs(u, v), increased=weight > old)
+
+    def remove_edge(self, u, v):
+        """Borra la arista u-v y repara dist / prev."""
+        self.G.remove_edge(u, v)
+        return self._repair(self._arcs(u, v), increased=True)
+
+    def _arcs(self, u, v):
+        if self.G.is_directed():
+            return [(u, v)]
+        return [(u, v), (v, u)]
+
+    # -----------------------------------------------------------
+    # Reparación
+    # -----------------------------------------------------------
+    def _arc_weight(self, a, b):
+        if not self.G.has_edge(a, b):
+            return math.inf
+        return self.G[a][b].get(self.weight, 1.0)
+
+    def _predecessors(self, x):
+        G = self.G
+        return G.pred[x] if G.is_directed() else G[x]
+
+    def _set_prev(self, v, u):
+        old = self.prev[v]
+        if old is not None:
+            self.children[old].discard(v)
+        self.prev[v] = u
+        if u is not None:
+            self.children[u].add(v)
+
+    def _repair(self, arcs, increased):
+        dist = self.dist
+        before = {}
+        heap = []
+
+        if increased:
+            # Subárboles que colgaban de las aristas que empeoraron
+            affected = set()
+            for a, b in arcs:
+                if self.prev.get(b) == a and b not in affected:
+                    stack = [b]
+                    while stack:
+                        x = stack.pop()
+                        affected.add(x)
+                        stack.extend(c for c in self.children[x] if c not in affected)
+
+            for x in affected:
+                before[x] = dist[x]
+                dist[x] = math.inf
+                self._set_prev(x, None)
+
+            # Mejor entrada de cada afectado desde la parte que sigue intacta
+            for x in affected:
+                for y, data in self._predecessors(x).items():
+                    if y in affected or dist[y] == math.inf:
+                        continue
+                    nd = dist[y] + data.get(self.weight, 1.0)
+                    if nd < dist[x]:
+                        dist[x] = nd
+                        self._set_prev(x, y)
+                if dist[x] < math.inf:
+                    heapq.heappush(heap, (dist[x], x))
+        else:
+            for a, b in arcs:
+                nd = dist[a] + self._arc_weight(a, b)
+                if nd < dist[b]:
+                    before.setdefault(b, dist[b])
+                    dist[b] = nd
+                    self._set_prev(b, a)
+                    heapq.heappush(heap, (nd, b))
+
+        # Dijkstra restringido: solo avanza mientras haya mejoras
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, data in self.G[x].items():
+                nd = d + data.get(self.weight, 1.0)
+                if nd < dist[y]:
+                    before.setdefault(y, dist[y])
+                    dist[y] = nd
+                    self._set_prev(y, x)
+                    heapq.heappush(heap, (nd, y))
+
+        return {x: (d0, dist[x]) for x, d0 in before.items() if d0 != dist[x]}
+
+    def _dijkstra(self):
+        dist = {n: math.inf for n in self.G.nodes}
+        prev = {n: None for n in self.G.nodes}
+        dist[self.source] = 0.0
+        heap = [(0.0, self.source)]
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, data in self.G[x].items():
+                nd = d + data.get(self.weight, 1.0)
+                if nd < dist[y]:
+                    dist[y] = nd
+                    prev[y] = x
+                    heapq.heappush(heap, (nd, y))
+        return dist, prev
@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+"""
+Caminos mínimos entre todos los pares (Floyd–Warshall) con NumPy.
+
+El triple ciclo en Python sobre listas anidadas hace n³ operaciones del
+intérprete. Aquí cada pivote k relaja TODA la matriz de una vez:
+
+    via = D[:, k, None] + D[None, k, :]      # dist(i, k) + dist(k, j)
+    D = minimum(D, via)
+
+y la matriz de siguiente salto se actualiza con la máscara de las celdas
+que mejoraron: P[i, j] = P[i, k] donde via < D.
+
+Cada pivote se recorre en bloques de filas que caben en caché (~256 KB
+por búfer); el kernel está limitado por memoria y así es ~1.7x más
+rápido que operar sobre la matriz completa. Los bloques sin mejoras no
+tocan P.
+
+Para miles de nodos, blocked_floyd_warshall reparte el trabajo en
+mosaicos (tiles) entre varios procesos; ver esa sección más abajo.
+
+En grafos dispersos conviene Johnson (un Dijkstra por origen, O(n·m log n)
+en lugar de O(n³)); all_pairs estima el costo de ambos con la densidad y
+elige solo. Los dos devuelven las mismas matrices D y P.
+
+Representación:
+- D: float64 (n, n), math.inf si no hay camino.
+- P: int32 (n, n), índice del primer nodo después de i en el camino a j;
+  NO_HOP (-1) si no hay camino o i == j.
+
+path_indices reconstruye una ruta; batch_routes reconstruye miles de
+pares a la vez en formato plano (offsets / values). insert_edge agrega
+una arista a matrices ya finales en O(n²).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from motor_caminos import CSRGraph, dijkstra
+
+NO_HOP = -1
+
+
+def initial_matrices(n, sources, targets, weights, directed=False):
+    """
+    D(0), P(0) a partir de arreglos paralelos de aristas (índices de nodo).
+    Si hay aristas repetidas se queda la de menor peso.
+    """
+    D = np.full((n, n), np.inf)
+    P = np.full((n, n), NO_HOP, dtype=np.int32)
+    np.fill_diagonal(D, 0.0)
+
+    s = np.asarray(sources, dtype=np.intp)
+    t = np.asarray(targets, dtype=np.intp)
+    w = np.asarray(weights, dtype=float)
+    if not directed:
+        s, t, w = np.concatenate((s, t)), np.concatenate((t, s)), np.concatenate((w, w))
+
+    # Primero las más pesadas: en asignaciones repetidas gana la última
+    order = np.argsort(-w, kind="stable")
+    s, t, w = s[order], t[order], w[order]
+    better = w < D[s, t]
+    D[s[better], t[better]] = w[better]
+    P[s[better], t[better]] = t[better]
+    return D, P
+
+
+def _block_buffers(n):
+    rows = min(n, max(8, (1 << 15) // max(n, 1)))
+    return np.empty((rows, n)), np.empty((rows, n), dtype=bool)
+
+
+def _relax_pivot(D, P, k, via, better, changes=None):
+    """
+    Relaja todo (i, j) con el pivote k. Si se da `changes`, agrega
+    (i, j, old_d, old_p) de cada bloque de filas que mejoró.
+    """
+    _relax_through(D, P, D[:, k].copy(), D[k].copy(), P[:, k].copy(), via, better, changes)
+
+
+def _relax_through(D, P, col, row, hop, via, better, changes=None):
+    """
+    D[i, j] = min(D[i, j], col[i] + row[j]); donde mejora, P[i, j] = hop[i].
+    Con col / row / hop de un pivote k es un paso de Floyd–Warshall; con
+    los de una arista nueva u → v es insert_edge.
+    """
+    n = len(D)
+    block = len(via)
+    for r0 in range(0, n, block):
+        r1 = min(n, r0 + block)
+        v, b = via[:r1 - r0], better[:r1 - r0]
+        Dr, Pr = D[r0:r1], P[r0:r1]
+        np.add(col[r0:r1, None], row, out=v)
+        np.less(v, Dr, out=b)
+        if not b.any():
+            continue
+        if changes is not None:
+            i, j = np.nonzero(b)
+            changes.append((i + r0, j, Dr[i, j], Pr[i, j]))
+        np.minimum(Dr, v, out=Dr)
+        np.copyto(Pr, hop[r0:r1, None], where=b)
+
+
+def iter_pivots(D, P):
+    """
+    Aplica Floyd–Warshall EN SU LUGAR, un pivote por vez. Después de cada
+    k entrega (k, i, j, (old_d, old_p), (new_d, new_p)): arreglos con las
+    celdas que mejoraron y sus valores antes y después (el formato de
+    eventos de traza_pasos.MatrixTrace).
+    """
+    via, better = _block_buffers(len(D))
+    for k in range(len(D)):
+        changes = []
+        _relax_pivot(D, P, k, via, better, changes)
+        if changes:
+            i, j, old_d, old_p = (np.concatenate(part) for part in zip(*changes))
+        else:
+            i = j = np.empty(0, np.intp)
+            old_d, old_p = np.empty(0), np.empty(0, np.int32)
+        yield k, i, j, (old_d, old_p), (D[i, j], P[i, j])
+
+
+def floyd_warshall(D, P):
+    """Floyd–Warshall completo EN SU LUGAR, sin registrar cambios."""
+    via, better = _block_buffers(len(D))
+    for k in range(len(D)):
+        _relax_pivot(D, P, k, via, better)
+    return D, P
+
+
+# -----------------------------------------------------------
+# Floyd–Warshall por bloques, en varios procesos
+# -----------------------------------------------------------
+# La matriz se parte en mosaicos de B x B. En la ronda kb (pivotes del
+# bloque kb):
+#   fase 1: el mosaico diagonal (kb, kb), Floyd–Warshall normal;
+#   fase 2: los mosaicos de la fila kb y de la columna kb, que solo
+#           dependen del diagonal;
+#   fase 3: todos los demás (i, j), que dependen de (i, kb) y (kb, j) ya
+#           terminados: son independientes entre sí.
+# Cada mosaico se relaja con los B pivotes seguidos mientras sigue en
+# caché. Las fases 2 y 3 se reparten entre procesos que comparten D y P
+# en memoria compartida (cada uno escribe solo sus mosaicos).
+#
+# Las distancias son las mismas que las de floyd_warshall. P puede elegir
+# otro camino de igual costo cuando hay empates.
+
+_worker = {}    # estado de cada proceso: memoria compartida, vistas y búferes
+
+
+@contextmanager
+def _shared_matrices(D, P):
+    """
+    Copia D y P a memoria compartida y entrega (D, P, nombres) de la copia;
+    al salir sin error el resultado se copia de vuelta a D y P.
+    """
+    d_shm = shared_memory.SharedMemory(create=True, size=D.nbytes)
+    p_shm = shared_memory.SharedMemory(create=True, size=P.nbytes)
+    shared_D = shared_P = None
+    try:
+        shared_D = np.ndarray(D.shape, dtype=np.float64, buffer=d_shm.buf)
+        shared_P = np.ndarray(P.shape, dtype=np.int32, buffer=p_shm.buf)
+        shared_D[...] = D
+        shared_P[...] = P
+        yield shared_D, shared_P, (d_shm.name, p_shm.name)
+        D[...] = shared_D
+        P[...] = shared_P
+    finally:
+        # Las vistas deben soltarse antes de cerrar la memoria compartida
+        shared_D = shared_P = None
+        d_shm.close()
+        d_shm.unlink()
+        p_shm.close()
+        p_shm.unlink()
+
+
+def _relax_tile(D, P, I, J, K, via, better):
+    """Relaja el mosaico D[I, J] con los pivotes k en K (slices), en orden."""
+    Dt, Pt = D[I, J], P[I, J]
+    v = via[:Dt.shape[0], :Dt.shape[1]]
+    b = better[:Dt.shape[0], :Dt.shape[1]]
+    for k in range(K.start, K.stop):
+        np.add(D[I, k, None], D[None, k, J], out=v)
+        np.less(v, Dt, out=b)
+        if b.any():
+            np.minimum(Dt, v, out=Dt)
+            np.copyto(Pt, P[I, k, None], where=b)
+
+
+def _attach(d_name, p_name, n, block, johnson=None):
+    """Inicializador de cada proceso. johnson: (grafo CSR, potenciales h)."""
+    d_shm = shared_memory.SharedMemory(name=d_name)
+    p_shm = shared_memory.SharedMemory(name=p_name)
+    _worker["shm"] = (d_shm, p_shm)    # se guardan para que no se liberen
+    _worker["D"] = np.ndarray((n, n), dtype=np.float64, buffer=d_shm.buf)
+    _worker["P"] = np.ndarray((n, n), dtype=np.int32, buffer=p_shm.buf)
+    _worker["via"] = np.empty((block, block))
+    _worker["better"] = np.empty((block, block), dtype=bool)
+    _worker["johnson"] = johnson
+
+
+def _attach_files(d_path, p_path, johnson):
+    """Como _attach, pero D y P son archivos .npy mapeados en memoria."""
+    _worker["D"] = np.load(d_path, mmap_mode="r+")
+    _worker["P"] = np.load(p_path, mmap_mode="r+")
+    _worker["johnson"] = johnson
+
+
+def _run_tiles(tiles):
+    """Tarea de un proceso: lista de (i0, i1, j0, j1, k0, k1)."""
+    D, P = _worker["D"], _worker["P"]
+    for i0, i1, j0, j1, k0, k1 in tiles:
+        _relax_tile(D, P, slice(i0, i1), slice(j0, j1), slice(k0, k1),
+                    _worker["via"], _worker["better"])
+
+
+def _rounds(n, block):
+    """Por ronda: (mosaico fase 1, mosaicos fase 2, mosaicos fase 3)."""
+    bounds = [(b, min(n, b + block)) for b in range(0, n, block)]
+    for k0, k1 in bounds:
+        others = [(b0, b1) for b0, b1 in bounds if b0 != k0]
+        phase2 = [(k0, k1, j0, j1, k0, k1) for j0, j1 in others]
+        phase2 += [(i0, i1, k0, k1, k0, k1) for i0, i1 in others]
+        phase3 = [(i0, i1, j0, j1, k0, k1) for i0, i1 in others for j0, j1 in others]
+        yield (k0, k1, k0, k1, k0, k1), phase2, phase3
+
+
+def _chunks(items, parts):
+    """Reparte mosaicos u orígenes en `parts` tareas de tamaño parecido."""
+    parts = max(1, min(parts, len(items)))
+    return [items[p::parts] for p in range(parts)]
+
+
+def blocked_floyd_warshall(D, P, block=128, workers=None):
+    """
+    Floyd–Warshall por mosaicos EN SU LUGAR sobre D y P (ver arriba).
+    workers: número de procesos (None = os.cpu_count()); con 1, o si la
+    matriz cabe en un solo mosaico, todo corre en este proceso.
+    """
+    n = len(D)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or n <= block:
+        via = np.empty((block, block))
+        better = np.empty((block, block), dtype=bool)
+        for diagonal, phase2, phase3 in _rounds(n, block):
+            for i0, i1, j0, j1, k0, k1 in [diagonal] + phase2 + phase3:
+                _relax_tile(D, P, slice(i0, i1), slice(j0, j1), slice(k0, k1), via, better)
+        return D, P
+
+    with _shared_matrices(D, P) as (shared_D, shared_P, names):
+        with ProcessPoolExecutor(workers, initializer=_attach,
+                                 initargs=names + (n, block)) as pool:
+            via = np.empty((block, block))
+            better = np.empty((block, block), dtype=bool)
+            for (i0, i1, j0, j1, k0, k1), phase2, phase3 in _rounds(n, block):
+                _relax_tile(shared_D, shared_P, slice(i0, i1), slice(j0, j1), slice(k0, k1),
+                            via, better)
+                # Cada fase espera a que terminen todas sus tareas
+                list(pool.map(_run_tiles, _chunks(phase2, workers)))
+                list(pool.map(_run_tiles, _chunks(phase3, 4 * workers)))
+    return D, P
+
+
+# -----------------------------------------------------------
+# Johnson: Bellman–Ford + un Dijkstra por origen
+# -----------------------------------------------------------
+# Costos medidos para elegir estrategia (CPython + NumPy):
+JOHNSON_NS_PER_ARC = 400    # Dijkstra de motor_caminos, por (arco + nodo) y por origen
+FLOYD_NS_PER_CELL = 3.5     # kernel de floyd_warshall, por celda y por pivote
+PARALLEL_MIN_NODES = 512    # con menos nodos no se paga el arranque de procesos
+
+
+def _arc_arrays(sources, targets, weights, directed):
+    s = np.asarray(sources, dtype=np.intp)
+    t = np.asarray(targets, dtype=np.intp)
+    w = np.asarray(weights, dtype=float)
+    if not directed:
+        s, t, w = np.concatenate((s, t)), np.concatenate((t, s)), np.concatenate((w, w))
+    return s, t, w
+
+
+def potentials(n, s, t, w):
+    """
+    Bellman–Ford (vectorizado por arcos) desde un nodo virtual unido con
+    peso 0 a todos: h tal que w(u, v) + h[u] - h[v] >= 0 en cada arco.
+    Lanza ValueError si hay un ciclo de peso negativo.
+    """
+    h = np.zeros(n)
+    if len(w) == 0 or w.min() >= 0:
+        return h
+    for _ in range(n + 1):
+        new = h.copy()
+        np.minimum.at(new, t, h[s] + w)
+        if (new == h).all():
+            return h
+        h = new
+    raise ValueError("El grafo tiene un ciclo de peso negativo.")
+
+
+def _first_hops(prev, s):
+    """
+    Fila s de P a partir del árbol de Dijkstra (prev): el primer salto
+    hacia v es el ancestro de v cuyo padre es s. Se busca saltando de
+    ancestro en ancestro con punteros dobles: O(n log profundidad).
+    """
+    nodes = np.arange(len(prev))
+    up = np.where((prev == s) | (prev < 0), nodes, prev)
+    while True:
+        nxt = up[up]
+        if (nxt == up).all():
+            break
+        up = nxt
+    hops = np.where(prev[up] == s, up, NO_HOP)
+    hops[s] = NO_HOP
+    return hops
+
+
+def _johnson_rows(graph, h, rows, D, P):
+    for s in rows:
+        dist, prev = dijkstra(graph, s)
+        D[s] = np.asarray(dist) - h[s] + h
+        P[s] = _first_hops(np.asarray(prev), s)
+
+
+def _run_sources(rows):
+    graph, h = _worker["johnson"]
+    _johnson_rows(graph, h, rows, _worker["D"], _worker["P"])
+    if isinstance(_worker["D"], np.memmap):
+        _worker["D"].flush()
+        _worker["P"].flush()
+
+
+def johnson(n, sources, targets, weights, directed=False, workers=1, out=None):
+    """
+    Johnson: reponderación con Bellman–Ford y un Dijkstra por origen,
+    repartidos entre `workers` procesos. Devuelve D, P como floyd_warshall.
+
+    out: (D, P) ya creados donde escribir, fila por fila. Si son archivos
+    mapeados (np.memmap, ver matrices_en_disco), cada proceso abre los
+    archivos y nunca hace falta tener las matrices completas en memoria.
+    """
+    s, t, w = _arc_arrays(sources, targets, weights, directed)
+    h = potentials(n, s, t, w)
+    # Pesos reponderados (>= 0; se corta el error de redondeo)
+    reweighted = np.maximum(w + h[s] - h[t], 0.0)
+    graph = CSRGraph.from_arcs(n, s.tolist(), t.tolist(), reweighted.tolist(), directed=True)
+
+    if out is None:
+        D = np.empty((n, n))
+        P = np.empty((n, n), dtype=np.int32)
+    else:
+        D, P = out
+    if workers <= 1 or n < PARALLEL_MIN_NODES:
+        _johnson_rows(graph, h, range(n), D, P)
+        return D, P
+
+    tasks = _chunks(list(range(n)), 4 * workers)
+    if isinstance(D, np.memmap):
+        D.flush()
+        P.flush()
+        with ProcessPoolExecutor(workers, initializer=_attach_files,
+                                 initargs=(D.filename, P.filename, (graph, h))) as pool:
+            list(pool.map(_run_sources, tasks))
+        return D, P
+
+    with _shared_matrices(D, P) as (_, _, names):
+        with ProcessPoolExecutor(workers, initializer=_attach,
+                                 initargs=names + (n, 1, (graph, h))) as pool:
+            list(pool.map(_run_sources, tasks))
+    return D, P
+
+
+# -----------------------------------------------------------
+# Elección automática
+# -----------------------------------------------------------
+def choose_apsp(n, arcs, workers=1):
+    """
+    "johnson" o "floyd" según el costo estimado: n·(arcos + n) contra n³,
+    es decir, según la densidad arcos / n².
+    """
+    parallel = workers if workers > 1 and n >= PARALLEL_MIN_NODES else 1
+    johnson_ns = n * (arcs + n) * JOHNSON_NS_PER_ARC / parallel
+    floyd_ns = n ** 3 * FLOYD_NS_PER_CELL / parallel
+    return "johnson" if johnson_ns < floyd_ns else "floyd"
+
+
+def all_pairs(n, sources, targets, weights, directed=False, method="auto", workers=None):
+    """
+    Caminos mínimos entre todos los pares: (D, P, método usado).
+    method: "auto" (ver choose_apsp), "floyd" o "johnson".
+    workers: procesos (None = os.cpu_count()).
+    Lanza ValueError si hay un ciclo de peso negativo.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if method == "auto":
+        arcs = len(sources) if directed else 2 * len(sources)
+        method = choose_apsp(n, arcs, workers)
+
+    if method == "johnson":
+        D, P = johnson(n, sources, targets, weights, directed, workers)
+    elif method == "floyd":
+        D, P = initial_matrices(n, sources, targets, weights, directed)
+        if workers > 1 and n >= PARALLEL_MIN_NODES:
+            blocked_floyd_warshall(D, P, workers=workers)
+        else:
+            floyd_warshall(D, P)
+        if (np.diagonal(D) < 0).any():
+            raise ValueError("El grafo tiene un ciclo de peso negativo.")
+    else:
+        raise ValueError(f"Método desconocido: {method!r}")
+    return D, P, method
+
+
+# -----------------------------------------------------------
+# Actualización incremental (una arista nueva o más barata)
+# -----------------------------------------------------------
+# Si D y P ya son finales y se agrega el arco u → v con peso w, el único
+# camino nuevo posible es i ⇝ u → v ⇝ j, y lo usa una sola vez (sin
+# ciclos negativos). Basta una pasada como la de un pivote:
+#
+#     D[i, j] = min(D[i, j], D[i, u] + w + D[v, j])
+#
+# y donde mejora, el primer salto es el de i hacia u (v si i == u).
+# O(n²) en lugar de O(n³). No sirve para borrar aristas ni subir pesos:
+# ahí los caminos que las usaban deben recalcularse.
+
+def insert_edge(D, P, u, v, w, directed=False):
+    """
+    Agrega (o abarata) la arista u - v con peso w a matrices D, P ya
+    finales, EN SU LUGAR. Devuelve cuántas celdas mejoraron. ValueError
+    si la arista formaría un ciclo negativo (D y P no se modifican).
+    """
+    if w + D[v, u] < 0 or (not directed and w < 0):
+        raise ValueError("La arista forma un ciclo de peso negativo.")
+
+    via, better = _block_buffers(len(D))
+    changes = []
+    for a, b in ((u, v),) if directed else ((u, v), (v, u)):
+        hop = P[:, a].copy()
+        hop[a] = b
+        _relax_through(D, P, D[:, a] + w, D[b].copy(), hop, via, better, changes)
+    return sum(len(i) for i, _, _, _ in changes)
+
+
+# -----------------------------------------------------------
+# Reconstrucción de rutas
+# -----------------------------------------------------------
+def path_indices(P, i, j):
+    """Índices del camino i → j según la matriz de siguiente salto ([] si no hay)."""
+    if i != j and P[i, j] == NO_HOP:
+        return []
+    path = [i]
+    for _ in range(len(P)):
+        if i == j:
+            return path
+        i = int(P[i, j])
+        path.append(i)
+    return []   # ciclo: la matriz no es de Floyd–Warshall
+
+
+def batch_routes(D, P, sources, targets):
+    """
+    Reconstruye muchas rutas a la vez. sources / targets: arreglos de
+    índices del mismo largo (un par por posición).
+
+    Devuelve (dist, offsets, values): la ruta del par k son los índices
+    values[offsets[k]:offsets[k + 1]] (vacía si no hay camino; [i] si
+    i == j) y dist[k] su distancia total (inf si no hay camino).
+
+    En lugar de seguir un par hasta el final y pasar al siguiente, todos
+    los pares avanzan un salto por iteración con una sola lectura
+    vectorizada de P: el número de iteraciones es el de la ruta más
+    larga, no la suma de todas.
+    """
+    sources = np.asarray(sources, dtype=np.intp)
+    targets = np.asarray(targets, dtype=np.intp)
+    if sources.shape != targets.shape or sources.ndim != 1:
+        raise ValueError("sources y targets deben ser arreglos 1-D del mismo largo.")
+    dist = np.asarray(D[sources, targets], dtype=np.float64)
+
+    reachable = (sources == targets) | (np.asarray(P[sources, targets]) != NO_HOP)
+    pending = np.flatnonzero(reachable & (sources != targets))
+    current = sources[pending]
+
+    # hops[t]: (pares que dieron el salto t + 1, nodo al que llegaron)
+    hops = []
+    for _ in range(len(P)):
+        if len(pending) == 0:
+            break
+        current = np.asarray(P[current, targets[pending]], dtype=np.intp)
+        hops.append((pending, current))
+        going = current != targets[pending]
+        pending = pending[going]
+        current = current[going]
+    else:
+        if len(pending):
+            # Ciclo: la matriz no es de Floyd–Warshall (como en path_indices)
+            reachable[pending] = False
+
+    lengths = np.zeros(len(sources), dtype=np.int64)
+    lengths[reachable] = 1
+    for pairs, _ in hops:
+        lengths[pairs] += 1
+    lengths[~reachable] = 0
+
+    offsets = np.zeros(len(sources) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.empty(offsets[-1], dtype=np.int32)
+    start = offsets[:-1][reachable]
+    values[start] = sources[reachable]
+    for t, (pairs, nodes) in enumerate(hops, start=1):
+        keep = reachable[pairs]
+        values[offsets[pairs[keep]] + t] = nodes[keep]
+    dist[~reachable] = np.inf
+    return dist, offsets, values
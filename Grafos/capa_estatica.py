@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Dibujo por capas para los visualizadores paso a paso.
+
+Antes, cada paso hacía ax.clear() y volvía a dibujar TODO el grafo con
+networkx (nodos, aristas, pesos) antes de canvas.draw(). Con miles de
+nodos eso tarda segundos por paso, casi todo en dibujar textos.
+
+StaticGraphLayer dibuja lo que no cambia UNA vez por grafo y lo guarda
+como imágenes:
+
+- fondo: aristas en gris (canvas.copy_from_bbox),
+- pesos: etiquetas de peso sobre fondo transparente,
+- nombres: etiquetas de los nodos sobre fondo transparente.
+
+En cada paso se restaura el fondo y se pinta encima, en este orden:
+aristas resaltadas, imagen de pesos, nodos (una colección por color, que
+Agg dibuja como un solo marcador repetido), imagen de nombres y textos
+extra; al final canvas.blit(). Son unos pocos artistas por paso sin
+importar el tamaño del grafo.
+
+Uso desde una app:
+    self.layer = StaticGraphLayer(self.fig, self.ax, self.canvas)
+    self.layer.invalidate()                       # al reconstruir el grafo
+    self.layer.render(G, pos,
+                      node_colors={"A": "#ff9800"},
+                      edge_layers=[edge_layer([("A", "B")], "#f44336", width=4)])
+"""
+
+from matplotlib.collections import LineCollection
+import networkx as nx
+import numpy as np
+
+NODE_SIZE = 300     # mismo tamaño por omisión que networkx
+
+
+def edge_layer(edges, color, width=1.0, style="solid", alpha=None, erase=False):
+    """
+    Aristas a resaltar en un paso. erase=True borra antes la arista gris
+    del fondo (para estilos más tenues que el gris base).
+    """
+    return {"edges": list(edges), "color": color, "width": width,
+            "style": style, "alpha": alpha, "erase": erase}
+
+
+class StaticGraphLayer:
+    def __init__(self, fig, ax, canvas, node_color="#90caf9", edge_color="#9e9e9e",
+                 edge_width=1.0, arrows=False, weight_labels=True):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.node_color = node_color
+        self.edge_color = edge_color
+        self.edge_width = edge_width
+        self.arrows = arrows
+        self.weight_labels = weight_labels
+
+        self._valid = False
+        self._background = None
+        self._overlays = []         # imágenes (x0, y0, píxeles) de pesos y de nombres
+        self._positions = None      # arreglo (n, 2) con las posiciones de los nodos
+        self._node_order = []
+        self._edge_artists = []
+        self._weight_texts = []
+        self._name_texts = []
+        self._last = None           # argumentos del último paso dibujado
+        self._capturing = False
+
+        # Tras un redibujado completo (p. ej. al cambiar el tamaño de la
+        # ventana) se vuelven a capturar las capas y se pinta el último paso.
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def invalidate(self):
+        """El grafo o sus posiciones cambiaron: la capa estática se rehace."""
+        self._valid = False
+
+    # -----------------------------------------------------------
+    # Capa estática
+    # -----------------------------------------------------------
+    def _build(self, G, pos):
+        ax = self.ax
+        ax.clear()
+
+        if self.arrows:
+            edges = nx.draw_networkx_edges(G, pos, edge_color=self.edge_color, width=self.edge_width,
+                                           arrows=True, arrowstyle="->", arrowsize=15, ax=ax)
+        else:
+            edges = nx.draw_networkx_edges(G, pos, edge_color=self.edge_color,
+                                           width=self.edge_width, ax=ax)
+        self._edge_artists = edges if isinstance(edges, list) else [edges]
+
+        self._weight_texts = []
+        if self.weight_labels:
+            labels = {(u, v): f'{d["weight"]}' for u, v, d in G.edges(data=True)}
+            self._weight_texts = list(
+                nx.draw_networkx_edge_labels(G, pos, edge_labels=labels, ax=ax).values())
+
+        self._node_order = list(G.nodes)
+        self._positions = np.array([pos[n] for n in self._node_order], dtype=float)
+        self._name_texts = list(nx.draw_networkx_labels(G, pos, ax=ax).values())
+
+        ax.set_axis_off()
+        self.fig.tight_layout()
+        self._capture()
+        self._valid = True
+
+    def _capture(self):
+        """Tres pasadas de dibujo: fondo, pesos y nombres (estas dos transparentes)."""
+        fig, ax, canvas = self.fig, self.ax, self.canvas
+        groups = (self._edge_artists, self._weight_texts, self._name_texts)
+        face = (fig.patch.get_alpha(), ax.patch.get_alpha())
+        self._capturing = True
+        try:
+            for artist in self._weight_texts + self._name_texts:
+                artist.set_visible(False)
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(ax.bbox)
+
+            fig.patch.set_alpha(0.0)
+            ax.patch.set_alpha(0.0)
+            self._overlays = []
+            for visible in (1, 2):
+                for i, group in enumerate(groups):
+                    for artist in group:
+                        artist.set_visible(i == visible)
+                canvas.draw()
+                self._overlays.append(self._grab_overlay())
+        finally:
+            fig.patch.set_alpha(face[0])
+            ax.patch.set_alpha(face[1])
+            for group in groups:
+                for artist in group:
+                    artist.set_visible(True)
+            self._capturing = False
+
+    def _grab_overlay(self):
+        """Recorta el búfer RGBA del lienzo al área del eje (filas de abajo hacia arriba)."""
+        x0, y0, x1, y1 = (int(round(c)) for c in self.ax.bbox.extents)
+        buffer = np.asarray(self.canvas.buffer_rgba())
+        height = buffer.shape[0]
+        pixels = buffer[height - y1:height - y0, x0:x1][::-1].copy()
+        return x0, y0, pixels
+
+    def _draw_overlay(self, overlay):
+        x0, y0, pixels = overlay
+        renderer = self.canvas.get_renderer()
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, x0, y0, pixels)
+        gc.restore()
+
+    def _on_draw(self, event):
+        if self._capturing or not self._valid or self._last is None:
+            return
+        self._capture()
+        self._blit(*self._last)
+
+    # -----------------------------------------------------------
+    # Capa dinámica
+    # -----------------------------------------------------------
+    def render(self, G, pos, node_colors=None, edge_layers=(), texts=()):
+        """
+        node_colors: {nodo: color} solo de los nodos que NO tienen el color base.
+        edge_layers: lista de edge_layer(...), en orden de dibujo.
+        texts: lista de (x, y, texto, kwargs de ax.text).
+        """
+        if not pos:
+            self.ax.clear()
+            self._last = None
+            self._valid = False
+            self.canvas.draw()
+            return
+
+        if not self._valid:
+            self._last = None
+            self._build(G, pos)
+        self._last = (pos, dict(node_colors or {}), list(edge_layers), list(texts))
+        self._blit(*self._last)
+
+    def _blit(self, pos, node_colors, edge_layers, texts):
+        ax = self.ax
+        self.canvas.restore_region(self._background)
+
+        background = ax.get_facecolor()
+        for layer in edge_layers:
+            if not layer["edges"]:
+                continue
+            segments = [(pos[u], pos[v]) for u, v in layer["edges"]]
+            if layer["erase"]:
+                self._draw_transient(LineCollection(
+                    segments, colors=[background], linewidths=self.edge_width + 1.5))
+            self._draw_transient(LineCollection(
+                segments, colors=layer["color"], linewidths=layer["width"],
+                linestyles=layer["style"], alpha=layer["alpha"]))
+
+        weights, names = self._overlays
+        self._draw_overlay(weights)
+
+        # Un grupo por color: Agg dibuja muy rápido marcadores iguales
+        groups = {}
+        base = self.node_color
+        for i, n in enumerate(self._node_order):
+            groups.setdefault(node_colors.get(n, base), []).append(i)
+        for color, idx in groups.items():
+            xy = self._positions[idx]
+            self._draw_transient(ax.scatter(xy[:, 0], xy[:, 1], s=NODE_SIZE, c=color,
+                                            marker="o", zorder=2))
+        self._draw_overlay(names)
+
+        for x, y, text, kwargs in texts:
+            self._draw_transient(ax.text(x, y, text, **kwargs))
+
+        self.canvas.blit(ax.bbox)
+
+    def _draw_transient(self, artist):
+        """Dibuja un artista solo sobre el fondo actual y lo quita del eje."""
+        if artist.axes is None:
+            self.ax.add_collection(artist, autolim=False)
+        artist.set_animated(True)
+        self.ax.draw_artist(artist)
+        artist.remove()
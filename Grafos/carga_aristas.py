@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+Carga masiva de listas de aristas para las apps de grafos.
+
+- Formatos:
+    texto:   "u v peso" (o "u v" sin peso) separado por espacios; las
+             líneas vacías y las que empiezan con '#' se ignoran.
+    CSV:     "u,v,peso" (o "u,v"); si la primera fila no tiene un peso
+             numérico se toma como encabezado.
+    binario: ver write_binary(); columnas int32 / float64 que se leen
+             directamente con array.frombytes.
+- Los archivos se leen con mmap, una línea a la vez, sin cargar todo el
+  texto en memoria.
+- Los nodos se validan contra una NodeTable (diccionario nombre -> índice),
+  así que cada búsqueda es O(1) en lugar de `u in lista`.
+- Los errores no detienen la lectura: se juntan en un LoadReport y se
+  muestran todos juntos al final.
+
+Uso:
+    edges = load_edges("red.csv")                     # nodos tomados del archivo
+    edges = parse_edge_text(texto, nodes=["A", "B"])  # valida contra la lista
+    if not edges.report.ok:
+        print(edges.report.summary())
+"""
+
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+from motor_caminos import CSRGraph
+
+_BINARY_MAGIC = b"EDGB"
+# magic, versión, banderas (1 = con pesos), reservado, n nodos, m aristas
+_BINARY_HEADER = struct.Struct("<4sBBHIQ")
+_NAME_LENGTH = struct.Struct("<H")
+
+
+class NodeTable:
+    def __init__(self, names=(), frozen=False):
+        """
+        frozen=True: solo se aceptan los nodos dados (los demás son error).
+        frozen=False: los nodos nuevos se agregan al encontrarlos.
+        """
+        self.names = []
+        self.index = {}
+        for name in names:
+            self.add(name)
+        self.frozen = frozen
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def add(self, name):
+        i = self.index.get(name)
+        if i is None:
+            i = len(self.names)
+            self.index[name] = i
+            self.names.append(name)
+        return i
+
+    def lookup(self, name):
+        """Índice del nodo; -1 si no existe y la tabla está congelada."""
+        i = self.index.get(name)
+        if i is None:
+            return -1 if self.frozen else self.add(name)
+        return i
+
+
+class LoadReport:
+    def __init__(self, max_samples=20):
+        self.max_samples = max_samples
+        self.count = 0
+        self.samples = []   # (línea, mensaje) de los primeros errores
+
+    @property
+    def ok(self):
+        return self.count == 0
+
+    def error(self, line_no, message):
+        self.count += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((line_no, message))
+
+    def summary(self):
+        lines = [f"Se encontraron {self.count} error(es):"]
+        lines.extend(f"  línea {line_no}: {message}" for line_no, message in self.samples)
+        if self.count > len(self.samples):
+            lines.append(f"  ... y {self.count - len(self.samples)} más.")
+        return "\n".join(lines)
+
+
+class EdgeList:
+    """Aristas como tres arreglos paralelos de índices y pesos."""
+
+    def __init__(self, nodes, sources, targets, weights, report):
+        self.nodes = nodes
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+        self.report = report
+
+    @property
+    def m(self):
+        return len(self.sources)
+
+    def named_edges(self):
+        """Itera (u, v, peso) con nombres de nodo."""
+        names = self.nodes.names
+        for u, v, w in zip(self.sources, self.targets, self.weights):
+            yield names[u], names[v], w
+
+    def to_csr(self, directed=False):
+        return CSRGraph.from_arcs(len(self.nodes), self.sources, self.targets,
+                                  self.weights, self.nodes.names, directed)
+
+
+# -----------------------------------------------------------
+# Texto / CSV
+# -----------------------------------------------------------
+def _parse_lines(lines, table, weighted, delimiter, header, report):
+    fields = 3 if weighted else 2
+    expected = "'u v peso'" if weighted else "'origen destino'"
+    sources = array("i")
+    targets = array("i")
+    weights = array("d")
+    lookup = table.lookup
+    first = True
+
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        parts = line.split(delimiter)
+        if delimiter is not None:
+            parts = [p.strip() for p in parts]
+
+        if first:
+            first = False
+            if header or (header is None and delimiter == "," and weighted
+                          and len(parts) == 3 and not _is_number(parts[2])):
+                continue
+
+        if len(parts) != fields:
+            report.error(line_no, f"'{line}' no tiene formato {expected}.")
+            continue
+
+        if weighted:
+            try:
+                w = float(parts[2])
+            except ValueError:
+                report.error(line_no, f"el peso '{parts[2]}' no es un número.")
+                continue
+        else:
+            w = 1.0
+
+        u = lookup(parts[0])
+        v = lookup(parts[1])
+        if u == -1 or v == -1:
+            missing = [name for name, i in ((parts[0], u), (parts[1], v)) if i == -1]
+            report.error(line_no, f"los nodos {missing} no están en la lista de nodos.")
+            continue
+
+        sources.append(u)
+        targets.append(v)
+        weights.append(w)
+
+    return EdgeList(table, sources, targets, weights, report)
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_edge_text(text, nodes=None, weighted=True, delimiter=None):
+    """
+    Aristas desde un texto ya en memoria (p. ej. el Text de la interfaz).
+    Si se da `nodes`, se valida contra esa lista.
+    """
+    table = NodeTable(nodes, frozen=True) if nodes is not None else NodeTable()
+    return _parse_lines(text.splitlines(), table, weighted, delimiter, False, LoadReport())
+
+
+def _iter_mapped_lines(mm):
+    for raw in iter(mm.readline, b""):
+        yield raw.decode("utf-8", errors="replace")
+
+
+# -----------------------------------------------------------
+# Binario
+# -----------------------------------------------------------
+def write_binary(path, edges, weighted=True):
+    """
+    Formato binario (little-endian):
+        cabecera  magic "EDGB", versión 1, banderas, n, m
+        nombres   n veces: longitud uint16 + nombre en UTF-8
+        columnas  origen int32[m], destino int32[m], peso float64[m] (si hay pesos)
+    """
+    names = edges.nodes.names
+    with open(path, "wb") as f:
+        f.write(_BINARY_HEADER.pack(_BINARY_MAGIC, 1, 1 if weighted else 0, 0, len(names), edges.m))
+        for name in names:
+            data = str(name).encode("utf-8")
+            f.write(_NAME_LENGTH.pack(len(data)))
+            f.write(data)
+        columns = [edges.sources, edges.targets] + ([edges.weights] if weighted else [])
+        for column in columns:
+            if sys.byteorder != "little":
+                column = array(column.typecode, column)
+                column.byteswap()
+            column.tofile(f)
+
+
+def _read_binary(mm, table, weighted, report):
+    """
+    ValueError si la cabecera o la tabla de nombres están truncadas (sin
+    ellas no se puede seguir); el resto de los errores va al report.
+    """
+    if len(mm) < _BINARY_HEADER.size:
+        raise ValueError("la cabecera binaria está truncada.")
+    magic, version, flags, _, n, m = _BINARY_HEADER.unpack_from(mm, 0)
+    if magic != _BINARY_MAGIC or version != 1:
+        report.error(0, "cabecera binaria no válida.")
+        return EdgeList(table, array("i"), array("i"), array("d"), report)
+
+    # Nombres del archivo -> índices de la tabla (al menos 2 bytes por nombre)
+    offset = _BINARY_HEADER.size
+    if offset + n * _NAME_LENGTH.size > len(mm):
+        raise ValueError(f"la tabla de nombres está truncada (se esperaban {n} nodos).")
+    remap = array("i", [0]) * n
+    for i in range(n):
+        if offset + _NAME_LENGTH.size > len(mm):
+            raise ValueError(f"la tabla de nombres está truncada (nodo {i + 1} de {n}).")
+        (length,) = _NAME_LENGTH.unpack_from(mm, offset)
+        offset += _NAME_LENGTH.size
+        if offset + length > len(mm):
+            raise ValueError(f"la tabla de nombres está truncada (nodo {i + 1} de {n}).")
+        name = mm[offset:offset + length].decode("utf-8", errors="replace")
+        offset += length
+        remap[i] = table.lookup(name)
+
+    def column(typecode, size):
+        nonlocal offset
+        arr = array(typecode)
+        data = mm[offset:offset + size * m]
+        arr.frombytes(data[:len(data) - len(data) % size])   # solo elementos completos
+        offset += size * m
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr
+
+    sources = column("i", 4)
+    targets = column("i", 4)
+    if flags & 1:
+        weights = column("d", 8)
+    else:
+        weights = array("d", [1.0]) * m
+    if len(targets) != m or len(weights) != m:
+        report.error(0, f"el archivo está truncado ({len(targets)} de {m} aristas).")
+        return EdgeList(table, array("i"), array("i"), array("d"), report)
+
+    # Índices fuera de rango o nodos rechazados por la tabla
+    if list(remap) == list(range(n)):
+        bad = [k for k in range(m) if not (0 <= sources[k] < n and 0 <= targets[k] < n)]
+    else:
+        bad = []
+        for k in range(m):
+            u, v = sources[k], targets[k]
+            if 0 <= u < n and 0 <= v < n and remap[u] != -1 and remap[v] != -1:
+                sources[k] = remap[u]
+                targets[k] = remap[v]
+            else:
+                bad.append(k)
+
+    if bad:
+        for k in bad:
+            report.error(k + 1, f"arista ({sources[k]}, {targets[k]}) con nodo inválido.")
+        keep = set(range(m)) - set(bad)
+        sources = array("i", (sources[k] for k in sorted(keep)))
+        targets = array("i", (targets[k] for k in sorted(keep)))
+        weights = array("d", (weights[k] for k in sorted(keep)))
+
+    return EdgeList(table, sources, targets, weights, report)
+
+
+# -----------------------------------------------------------
+# Punto de entrada
+# -----------------------------------------------------------
+def detect_format(path):
+    with open(path, "rb") as f:
+        if f.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC:
+            return "binary"
+    return "csv" if path.lower().endswith(".csv") else "text"
+
+
+def load_edges(path, nodes=None, weighted=True, fmt=None, header=None):
+    """
+    Lee un archivo de aristas (fmt: "text", "csv", "binary" o None para
+    detectarlo). Si se da `nodes`, solo se aceptan esos nodos.
+    En binario, `weighted` no importa: lo dice la cabecera.
+
+    Los errores de líneas o aristas van al LoadReport; un binario con la
+    cabecera o la tabla de nombres truncada da ValueError con el nombre
+    del archivo.
+    """
+    table = NodeTable(nodes, frozen=True) if nodes is not None else NodeTable()
+    report = LoadReport()
+    if fmt is None:
+        fmt = detect_format(path)
+
+    if os.path.getsize(path) == 0:
+        return EdgeList(table, array("i"), array("i"), array("d"), report)
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if fmt == "binary":
+                try:
+                    return _read_binary(mm, table, weighted, report)
+                except ValueError as exc:
+                    raise ValueError(f"{os.path.basename(path)}: {exc}") from exc
+            delimiter = "," if fmt == "csv" else None
+            return _parse_lines(_iter_mapped_lines(mm), table, weighted, delimiter, header, report)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+Cierre transitivo (Warshall) con filas de bits.
+
+Antes la matriz de alcanzabilidad era una lista de listas de 0/1 y cada
+pivote k probaba W[i][k] and W[k][j] celda por celda: n³ operaciones del
+intérprete. Aquí cada fila es un bitset de n bits empacado en palabras
+uint64, y el paso del pivote k es
+
+    para toda fila i con el bit k:  fila_i |= fila_k
+
+que opera 64 columnas por instrucción. Las filas con el bit k se
+encuentran con una sola lectura vectorizada de la columna k, y el OR se
+hace sobre todas ellas de una vez.
+
+Representación:
+- R: uint64 little-endian (n, palabras), palabras = ceil(n / 64). El bit
+  j de la fila i (palabra j >> 6, bit j & 63) vale 1 si i alcanza a j.
+- unpack_rows(R, n) da la matriz de 0/1 (uint8) para mostrarla.
+
+En relaciones dispersas conviene condensed_closure: junta cada
+componente fuertemente conexa (Tarjan iterativo) en un solo nodo, cierra
+el DAG resultante en orden topológico inverso uniendo las filas de los
+sucesores, y da a cada nodo la fila de su componente. O(n + m) más una
+unión de filas por arista del DAG, en lugar de O(n³ / 64). El resultado
+es idéntico al de warshall_closure.
+
+IncrementalClosure mantiene el cierre mientras se agregan o quitan
+aristas (ver la clase).
+
+Uso:
+    R = pack_relation(n, sources, targets)
+    warshall_closure(R)                      # o: R = condensed_closure(n, sources, targets)
+    reaches(R, i, j)
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+WORD = np.dtype("<u8")
+
+
+def words_for(n):
+    return (n + WORD_BITS - 1) // WORD_BITS
+
+
+def _bits(j):
+    """Máscaras uint64 con el bit j & 63 (j escalar o arreglo)."""
+    return np.left_shift(np.uint64(1), np.asarray(j & (WORD_BITS - 1), dtype=np.uint64))
+
+
+def pack_relation(n, sources, targets, reflexive=True):
+    """
+    Filas de bits de la relación {(sources[e], targets[e])} sobre n
+    nodos; con reflexive=True también la diagonal (como W0 de Warshall).
+    """
+    R = np.zeros((n, words_for(n)), dtype=WORD)
+    s = np.asarray(sources, dtype=np.intp)
+    t = np.asarray(targets, dtype=np.intp)
+    if reflexive:
+        s = np.concatenate((s, np.arange(n)))
+        t = np.concatenate((t, np.arange(n)))
+    np.bitwise_or.at(R, (s, t >> 6), _bits(t))
+    return R
+
+
+def unpack_rows(R, n):
+    """Matriz (n_filas, n) de 0/1 en uint8 a partir de las filas de bits."""
+    R = np.ascontiguousarray(R, dtype=WORD)
+    return np.unpackbits(R.view(np.uint8), axis=1, count=n, bitorder="little")
+
+
+def column(R, k):
+    """Arreglo bool: qué filas tienen el bit k."""
+    return (R[:, k >> 6] & _bits(k)) != 0
+
+
+def reaches(R, i, j):
+    return bool(R[i, j >> 6] & _bits(j))
+
+
+def row_indices(R, i, n):
+    """Índices de los bits encendidos de la fila i."""
+    return np.flatnonzero(unpack_rows(R[i:i + 1], n)[0])
+
+
+# -----------------------------------------------------------
+# Warshall
+# -----------------------------------------------------------
+def warshall_closure(R):
+    """Cierre transitivo EN SU LUGAR. O(n³ / 64) en el peor caso."""
+    for k in range(len(R)):
+        rows = np.flatnonzero(column(R, k))
+        if len(rows) > 1:
+            R[rows] |= R[k]
+    return R
+
+
+def iter_closure_pivots(R):
+    """
+    Warshall EN SU LUGAR, un pivote por vez. Después de cada k entrega
+    (k, i, j, (old,), (new,)) con las celdas que pasaron de 0 a 1 (el
+    formato de eventos de traza_pasos.MatrixTrace).
+    """
+    n = len(R)
+    for k in range(n):
+        rows = np.flatnonzero(column(R, k))
+        gained = R[k] & ~R[rows]
+        hit = np.flatnonzero(gained.any(axis=1))
+        r, j = np.nonzero(unpack_rows(gained[hit], n))
+        rows = rows[hit]
+        R[rows] |= R[k]
+        i = rows[r]
+        yield k, i, j, (np.zeros(len(i), np.uint8),), (np.ones(len(i), np.uint8),)
+
+
+# -----------------------------------------------------------
+# Componentes fuertemente conexas y DAG condensado
+# -----------------------------------------------------------
+def _adjacency(n, sources, targets):
+    """(indptr, adj) en listas de Python: sucesores de v en adj[indptr[v]:indptr[v + 1]]."""
+    s = np.asarray(sources, dtype=np.intp)
+    t = np.asarray(targets, dtype=np.intp)
+    indptr = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(s, minlength=n), out=indptr[1:])
+    return indptr.tolist(), t[np.argsort(s, kind="stable")].tolist()
+
+
+def strongly_connected(n, sources, targets):
+    """
+    Componentes fuertemente conexas con Tarjan iterativo (una pila de
+    (nodo, siguiente arista) en lugar de recursión: no hay límite de
+    profundidad). Devuelve (comp, count): comp[v] es el número de la
+    componente de v.
+
+    Tarjan cierra cada componente después de todas las que alcanza, así
+    que los números quedan en orden topológico inverso: una arista entre
+    componentes siempre va de un número mayor a uno menor.
+    """
+    indptr, adj = _adjacency(n, sources, targets)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    comp = [-1] * n
+    stack = []
+    counter = count = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+
+        while work:
+            v, e = work[-1]
+            end = indptr[v + 1]
+            while e < end:
+                w = adj[e]
+                e += 1
+                if index[w] == -1:
+                    # Bajar a w; v sigue desde la arista e al volver
+                    work[-1] = (v, e)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                # v terminó sus aristas
+                work.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = count
+                        if w == v:
+                            break
+                    count += 1
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+
+    return np.array(comp, dtype=np.intp), count
+
+
+def condensed_closure(n, sources, targets, components=None):
+    """
+    Filas de bits del cierre reflexivo-transitivo (lo mismo que
+    warshall_closure(pack_relation(n, sources, targets))) vía el DAG de
+    componentes. components: (comp, count) de strongly_connected, si ya
+    se tiene.
+    """
+    comp, count = components if components is not None else strongly_connected(n, sources, targets)
+    s = np.asarray(sources, dtype=np.intp)
+    t = np.asarray(targets, dtype=np.intp)
+
+    # Fila de cada componente, empezando por sus propios nodos
+    C = np.zeros((count, words_for(n)), dtype=WORD)
+    members = np.arange(n)
+    np.bitwise_or.at(C, (comp, members >> 6), _bits(members))
+    _close_dag(C, comp[s], comp[t])
+    return C[comp]
+
+
+def _close_dag(C, cs, ct):
+    """
+    C[c] |= C[d] por cada arista cs → ct entre componentes, en orden
+    topológico inverso (strongly_connected: número creciente). Al
+    terminar, cada fila tiene lo de todas las componentes que alcanza.
+    """
+    count = len(C)
+    between = cs != ct
+    pairs = np.unique(cs[between] * count + ct[between])
+    dag_s, dag_t = pairs // count, pairs % count
+    indptr = np.zeros(count + 1, dtype=np.intp)
+    np.cumsum(np.bincount(dag_s, minlength=count), out=indptr[1:])
+
+    # Orden topológico inverso = orden creciente de número: los sucesores
+    # de c ya tienen su fila completa cuando se procesa c
+    for c in np.flatnonzero(indptr[1:] > indptr[:-1]):
+        C[c] |= np.bitwise_or.reduce(C[dag_t[indptr[c]:indptr[c + 1]]], axis=0)
+
+
+# -----------------------------------------------------------
+# Cierre incremental (ediciones de la relación)
+# -----------------------------------------------------------
+class IncrementalClosure:
+    """
+    Cierre reflexivo-transitivo que se mantiene al agregar o quitar
+    aristas, sin recalcularlo todo:
+
+    - insert(u, v): los únicos caminos nuevos son x ⇝ u → v ⇝ y, así que
+      basta R[x] |= R[v] para toda fila x que ya alcanza a u (la columna
+      u). O(n² / 64) en el peor caso; nada si u ya alcanzaba a v.
+    - delete(u, v): si u sigue alcanzando a v sin la arista, el cierre
+      no cambia (cada uso de la arista se reemplaza por ese otro camino);
+      se prueba con una búsqueda desde u que solo entra a nodos que
+      alcanzaban a v. Si no, solo pueden perder bits las filas que
+      alcanzaban a u (las demás nunca pasan por la arista). Esas filas
+      se recalculan con las componentes fuertemente conexas del subgrafo
+      que forman; las filas de fuera se usan tal cual como sucesores ya
+      cerrados.
+
+    Las aristas se cuentan con multiplicidad: quitar una copia de una
+    arista repetida no cambia el cierre.
+    """
+
+    def __init__(self, n, sources=(), targets=()):
+        self.n = n
+        self.out = [{} for _ in range(n)]     # out[u][v] = copias de la arista u → v
+        for u, v in zip(np.asarray(sources).tolist(), np.asarray(targets).tolist()):
+            self.out[u][v] = self.out[u].get(v, 0) + 1
+        self.R = condensed_closure(n, sources, targets)
+
+    def reaches(self, i, j):
+        return reaches(self.R, i, j)
+
+    def matrix(self):
+        """Matriz de 0/1 (uint8) del cierre actual."""
+        return unpack_rows(self.R, self.n)
+
+    def insert(self, u, v):
+        """Agrega la arista u → v. Devuelve cuántas filas se actualizaron."""
+        self.out[u][v] = self.out[u].get(v, 0) + 1
+        if reaches(self.R, u, v):
+            return 0
+        rows = np.flatnonzero(column(self.R, u))
+        self.R[rows] |= self.R[v]
+        return len(rows)
+
+    def delete(self, u, v):
+        """
+        Quita una copia de la arista u → v (KeyError si no existe).
+        Devuelve cuántas filas se recalcularon.
+        """
+        copies = self.out[u].get(v, 0)
+        if copies == 0:
+            raise KeyError(f"No existe la arista {u} → {v}.")
+        if copies > 1:
+            self.out[u][v] = copies - 1
+            return 0
+        del self.out[u][v]
+        if u == v or self._still_reaches(u, v):
+            return 0        # lazo (la diagonal está siempre) u otro camino u ⇝ v
+
+        affected = np.flatnonzero(column(self.R, u))
+        local = np.full(self.n, -1, dtype=np.intp)
+        local[affected] = np.arange(len(affected))
+        local = local.tolist()
+
+        # Aristas que salen de las filas afectadas: dentro del subgrafo
+        # (se condensan) o hacia filas que no cambian (sucesores fijos)
+        inner_s, inner_t, outer_s, outer_t = [], [], [], []
+        for a in affected.tolist():
+            la = local[a]
+            for w in self.out[a]:
+                lw = local[w]
+                if lw >= 0:
+                    inner_s.append(la)
+                    inner_t.append(lw)
+                else:
+                    outer_s.append(la)
+                    outer_t.append(w)
+
+        comp, count = strongly_connected(len(affected), inner_s, inner_t)
+        C = np.zeros((count, self.R.shape[1]), dtype=WORD)
+        np.bitwise_or.at(C, (comp, affected >> 6), _bits(affected))
+        if outer_s:
+            np.bitwise_or.at(C, comp[np.asarray(outer_s, dtype=np.intp)],
+                             self.R[np.asarray(outer_t, dtype=np.intp)])
+        inner_s = np.asarray(inner_s, dtype=np.intp)
+        inner_t = np.asarray(inner_t, dtype=np.intp)
+        _close_dag(C, comp[inner_s], comp[inner_t])
+
+        self.R[affected] = C[comp]
+        return len(affected)
+
+    def _still_reaches(self, u, v):
+        """¿u alcanza a v con las aristas actuales? BFS podada con el cierre anterior."""
+        seen = {u}
+        frontier = [u]
+        while frontier:
+            following = []
+            for x in frontier:
+                for w in self.out[x]:
+                    if w == v:
+                        return True
+                    if w not in seen and reaches(self.R, w, v):
+                        seen.add(w)
+                        following.append(w)
+            frontier = following
+        return False
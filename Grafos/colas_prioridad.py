@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Colas de prioridad direccionables para Dijkstra / Prim.
+
+Con heapq se inserta un duplicado cada vez que una distancia mejora y los
+viejos se descartan al sacarlos (la cola puede crecer hasta O(E)). Estas
+colas guardan a lo más UNA entrada por nodo y permiten bajar su clave
+(decrease-key), así que su tamaño es O(V).
+
+Los elementos son enteros 0..n-1 (índices de nodo del CSRGraph).
+
+- IndexedHeap: montículo binario con arreglo de posiciones.
+- PairingHeap: montículo de emparejamiento (pairing heap) sobre arreglos.
+
+Interfaz común:
+    q = IndexedHeap(n)            # o PairingHeap(n)
+    q.push(v, clave)              # v no debe estar en la cola
+    q.decrease_key(v, clave)      # clave nueva <= clave actual
+    q.push_or_decrease(v, clave)  # lo que aplique; True si cambió algo
+    clave, v = q.pop()
+    len(q), v in q
+"""
+
+
+class IndexedHeap:
+    def __init__(self, n):
+        self.heap = []          # nodos en orden de montículo
+        self.pos = [-1] * n     # posición de cada nodo en heap (-1 = fuera)
+        self.key = [0.0] * n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, v):
+        return self.pos[v] != -1
+
+    def _sift_up(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        v = heap[i]
+        k = key[v]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = heap[parent]
+            if key[p] <= k:
+                break
+            heap[i] = p
+            pos[p] = i
+            i = parent
+        heap[i] = v
+        pos[v] = i
+
+    def _sift_down(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        size = len(heap)
+        v = heap[i]
+        k = key[v]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and key[heap[right]] < key[heap[child]]:
+                child = right
+            c = heap[child]
+            if key[c] >= k:
+                break
+            heap[i] = c
+            pos[c] = i
+            i = child
+        heap[i] = v
+        pos[v] = i
+
+    def push(self, v, k):
+        self.key[v] = k
+        self.heap.append(v)
+        self._sift_up(len(self.heap) - 1)
+
+    def decrease_key(self, v, k):
+        self.key[v] = k
+        self._sift_up(self.pos[v])
+
+    def push_or_decrease(self, v, k):
+        if self.pos[v] == -1:
+            self.push(v, k)
+            return True
+        if k < self.key[v]:
+            self.decrease_key(v, k)
+            return True
+        return False
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        top = heap[0]
+        last = heap.pop()
+        pos[top] = -1
+        if heap:
+            heap[0] = last
+            pos[last] = 0
+            self._sift_down(0)
+        return self.key[top], top
+
+
+class PairingHeap:
+    """
+    Pairing heap con nodos implícitos: para cada elemento v se guardan
+    child[v] (primer hijo), sibling[v] (siguiente hermano) y back[v]
+    (hermano anterior, o el padre si v es el primer hijo).
+    """
+
+    def __init__(self, n):
+        self.key = [0.0] * n
+        self.child = [-1] * n
+        self.sibling = [-1] * n
+        self.back = [-1] * n
+        self.inside = bytearray(n)
+        self.root = -1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, v):
+        return self.inside[v] == 1
+
+    def _link(self, a, b):
+        """Une dos raíces; devuelve la nueva raíz."""
+        if a == -1:
+            return b
+        if b == -1:
+            return a
+        key, child, sibling, back = self.key, self.child, self.sibling, self.back
+        if key[b] < key[a]:
+            a, b = b, a
+        # b pasa a ser el primer hijo de a
+        first = child[a]
+        sibling[b] = first
+        if first != -1:
+            back[first] = b
+        back[b] = a
+        child[a] = b
+        return a
+
+    def push(self, v, k):
+        self.key[v] = k
+        self.child[v] = self.sibling[v] = self.back[v] = -1
+        self.inside[v] = 1
+        self.size += 1
+        self.root = self._link(self.root, v)
+
+    def decrease_key(self, v, k):
+        self.key[v] = k
+        if v == self.root:
+            return
+        child, sibling, back = self.child, self.sibling, self.back
+        # Desprender el subárbol de v
+        b = back[v]
+        if child[b] == v:
+            child[b] = sibling[v]
+        else:
+            sibling[b] = sibling[v]
+        if sibling[v] != -1:
+            back[sibling[v]] = b
+        sibling[v] = back[v] = -1
+        self.root = self._link(self.root, v)
+
+    def push_or_decrease(self, v, k):
+        if not self.inside[v]:
+            self.push(v, k)
+            return True
+        if k < self.key[v]:
+            self.decrease_key(v, k)
+            return True
+        return False
+
+    def pop(self):
+        top = self.root
+        sibling, back = self.sibling, self.back
+        self.inside[top] = 0
+        self.size -= 1
+
+        # Dos pasadas: emparejar de izquierda a derecha, luego unir de
+        # derecha a izquierda.
+        pairs = []
+        c = self.child[top]
+        while c != -1:
+            a = c
+            b = sibling[a]
+            c = sibling[b] if b != -1 else -1
+            sibling[a] = back[a] = -1
+            if b != -1:
+                sibling[b] = back[b] = -1
+            pairs.append(self._link(a, b))
+
+        root = -1
+        for r in reversed(pairs):
+            root = self._link(r, root)
+        self.root = root
+        self.child[top] = -1
+        return self.key[top], top
+
+
+QUEUES = {
+    "indexed": IndexedHeap,
+    "pairing": PairingHeap,
+}
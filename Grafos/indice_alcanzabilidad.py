@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Índice compacto de alcanzabilidad: "¿X alcanza a Y?" sin la matriz n x n.
+
+El cierre completo (cierre_transitivo) ocupa n² / 8 bytes: 1.2 GB con
+100 000 nodos. ReachabilityIndex guarda unas cuantas etiquetas enteras por
+componente fuertemente conexa y contesta casi todas las preguntas con
+comparaciones de enteros:
+
+1. Misma componente → sí.
+2. Orden topológico: strongly_connected numera las componentes de modo
+   que toda arista va de un número mayor a uno menor; si comp(Y) >
+   comp(X), no. Lo mismo con los niveles: si X alcanza a Y (en otra
+   componente), el camino más largo desde X hasta un sumidero es más
+   largo que el de Y, y el camino más largo desde una raíz hasta X es
+   más corto que el de Y.
+3. Intervalos de árbol (tree cover): en cada recorrido DFS del DAG
+   condensado, los nodos del subárbol de c tienen números de postorden
+   contiguos [tree_low(c), post(c)]. Si post(Y) cae ahí → sí.
+4. Intervalos de descendientes (estilo GRAIL): low(c) = mínimo postorden
+   entre TODOS los descendientes de c. Si X alcanza a Y, el intervalo
+   [low(Y), post(Y)] está dentro del de X; si no lo está → no.
+
+Cada recorrido usa otro orden de hijos al azar, lo que afina las
+etiquetas 3 y 4. Lo que queda sin decidir se resuelve con una búsqueda en
+anchura desde comp(X), vectorizada por niveles, que descarta los nodos
+cuyas etiquetas ya dicen que no llegan a Y y se detiene si alguna dice
+que sí.
+
+Memoria: O(n + m) (componentes, DAG en CSR, 2 niveles por componente y
+3 etiquetas por componente y por recorrido).
+
+Uso:
+    index = ReachabilityIndex(n, sources, targets)
+    index.reaches(i, j)
+    index.query(sources, targets)     # arreglo bool, un par por posición
+"""
+
+import numpy as np
+
+from cierre_transitivo import strongly_connected
+
+
+class ReachabilityIndex:
+    def __init__(self, n, sources, targets, traversals=3, seed=0):
+        self.n = n
+        s = np.asarray(sources, dtype=np.intp)
+        t = np.asarray(targets, dtype=np.intp)
+        comp, count = strongly_connected(n, s, t)
+        self.comp = comp.astype(np.int32)
+        self.components = count
+
+        # DAG condensado en CSR, sin aristas repetidas
+        cs, ct = comp[s], comp[t]
+        between = cs != ct
+        pairs = np.unique(cs[between] * count + ct[between])
+        dag_s, dag_t = pairs // count, pairs % count
+        self.indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dag_s, minlength=count), out=self.indptr[1:])
+        self.adj = dag_t.astype(np.int32)
+        self.height, self.depth = self._levels(dag_s)
+
+        # Etiquetas (recorridos, componentes): postorden, inicio del
+        # subárbol y mínimo postorden de los descendientes
+        rnd = np.random.default_rng(seed)
+        labels = [self._label(dag_s, rnd if r else None) for r in range(traversals)]
+        self.post, self.tree_low, self.low = (np.array(x, dtype=np.int32) for x in zip(*labels))
+
+        self._seen = np.zeros(count, dtype=bool)
+        self.fallbacks = 0      # consultas que necesitaron la búsqueda
+
+    def nbytes(self):
+        arrays = (self.comp, self.indptr, self.adj, self.height, self.depth,
+                  self.post, self.tree_low, self.low, self._seen)
+        return sum(a.nbytes for a in arrays)
+
+    # -----------------------------------------------------------
+    # Etiquetas
+    # -----------------------------------------------------------
+    def _levels(self, dag_s):
+        """
+        (height, depth): camino más largo hasta un sumidero y desde una
+        raíz. Los sucesores de c tienen número menor, así que basta
+        recorrer las componentes en orden creciente (height) o
+        decreciente (depth).
+        """
+        count = self.components
+        indptr = self.indptr.tolist()
+        adj = self.adj.tolist()
+        height = [0] * count
+        for c in range(count):
+            best = -1
+            for w in adj[indptr[c]:indptr[c + 1]]:
+                if height[w] > best:
+                    best = height[w]
+            height[c] = best + 1
+        depth = [0] * count
+        for c in range(count - 1, -1, -1):
+            level = depth[c] + 1
+            for w in adj[indptr[c]:indptr[c + 1]]:
+                if depth[w] < level:
+                    depth[w] = level
+        return np.array(height, dtype=np.int32), np.array(depth, dtype=np.int32)
+
+    def _label(self, dag_s, rnd):
+        """
+        Un recorrido DFS iterativo del DAG desde sus raíces (componentes
+        sin predecesores). rnd: None = orden de las aristas; si no, los
+        hijos de cada componente y las raíces se barajan.
+        """
+        count = self.components
+        indptr = self.indptr.tolist()
+        if rnd is None:
+            adj = self.adj.tolist()
+            roots = np.flatnonzero(np.bincount(self.adj, minlength=count) == 0)[::-1]
+        else:
+            order = np.lexsort((rnd.random(len(self.adj)), dag_s))
+            adj = self.adj[order].tolist()
+            roots = rnd.permutation(np.flatnonzero(np.bincount(self.adj, minlength=count) == 0))
+
+        post = [0] * count
+        tree_low = [0] * count
+        low = [0] * count
+        visited = [False] * count
+        counter = 0
+        for root in roots.tolist():
+            visited[root] = True
+            tree_low[root] = counter
+            work = [(root, indptr[root])]
+            while work:
+                v, e = work[-1]
+                end = indptr[v + 1]
+                while e < end:
+                    w = adj[e]
+                    e += 1
+                    if not visited[w]:
+                        work[-1] = (v, e)
+                        visited[w] = True
+                        tree_low[w] = counter
+                        work.append((w, indptr[w]))
+                        break
+                else:
+                    work.pop()
+                    post[v] = counter
+                    smallest = counter
+                    for w in adj[indptr[v]:end]:
+                        if low[w] < smallest:
+                            smallest = low[w]
+                    low[v] = smallest
+                    counter += 1
+        return post, tree_low, low
+
+    # -----------------------------------------------------------
+    # Consultas
+    # -----------------------------------------------------------
+    def _decide(self, cs, cd):
+        """
+        Decisión con etiquetas para pares de componentes: (yes, no),
+        arreglos bool; los pares con ambos en False quedan sin decidir.
+        """
+        post, tree_low, low = self.post, self.tree_low, self.low
+        post_s, post_d = post[:, cs], post[:, cd]
+        yes = (cs == cd) | ((tree_low[:, cs] <= post_d) & (post_d <= post_s)).any(axis=0)
+        inside = (low[:, cs] <= low[:, cd]) & (post_d <= post_s)
+        levels = (self.height[cs] <= self.height[cd]) | (self.depth[cs] >= self.depth[cd])
+        no = ~yes & ((cd > cs) | levels | ~inside.all(axis=0))
+        return yes, no
+
+    def _search(self, c, d):
+        """Búsqueda en anchura por niveles de c hacia d, podada con las etiquetas."""
+        self.fallbacks += 1
+        seen = self._seen
+        touched = []
+        frontier = np.array([c], dtype=np.int64)
+        found = False
+        while len(frontier):
+            starts = self.indptr[frontier]
+            lengths = self.indptr[frontier + 1] - starts
+            total = int(lengths.sum())
+            if total == 0:
+                break
+            # Índices de todas las aristas de la frontera (rangos concatenados)
+            shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            nxt = np.unique(self.adj[shift + np.arange(total)])
+            nxt = nxt[~seen[nxt]]
+            seen[nxt] = True
+            touched.append(nxt)
+
+            yes, no = self._decide(nxt, np.full(len(nxt), d))
+            if yes.any():
+                found = True
+                break
+            frontier = nxt[~no].astype(np.int64)
+
+        for nodes in touched:
+            seen[nodes] = False
+        return found
+
+    def _decide_one(self, c, d):
+        """Lo mismo que _decide para un solo par, con escalares: True, False o None."""
+        if c == d:
+            return True
+        if d > c or self.height[c] <= self.height[d] or self.depth[c] >= self.depth[d]:
+            return False
+        for post, tree_low, low in zip(self.post, self.tree_low, self.low):
+            post_d = post[d]
+            if post_d > post[c] or low[d] < low[c]:
+                return False
+            if tree_low[c] <= post_d:
+                return True
+        return None
+
+    def reaches(self, i, j):
+        """True si el nodo i alcanza al nodo j (todo nodo se alcanza a sí mismo)."""
+        c, d = int(self.comp[i]), int(self.comp[j])
+        answer = self._decide_one(c, d)
+        if answer is None:
+            answer = self._search(c, d)
+        return answer
+
+    def query(self, sources, targets):
+        """Arreglo bool: ¿sources[k] alcanza a targets[k]? Etiquetas en bloque; búsqueda solo si hace falta."""
+        cs = self.comp[np.asarray(sources, dtype=np.intp)]
+        cd = self.comp[np.asarray(targets, dtype=np.intp)]
+        yes, no = self._decide(cs, cd)
+        for k in np.flatnonzero(~yes & ~no).tolist():
+            yes[k] = self._search(int(cs[k]), int(cd[k]))
+        return yes
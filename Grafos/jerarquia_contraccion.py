@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+Jerarquía de contracción (Contraction Hierarchies) para consultas punto a
+punto repetidas sobre un grafo estático.
+
+Preproceso (una sola vez):
+- Se contraen los nodos uno por uno, del "menos importante" al "más
+  importante" (orden por diferencia de aristas con actualización
+  perezosa). Al contraer v, por cada par u -> v -> w se agrega un atajo
+  u -> w con peso w(u,v) + w(v,w), salvo que una búsqueda local de
+  testigos (Dijkstra acotado que no pasa por v) encuentre un camino
+  igual o más corto.
+- rank[v] es la posición de v en ese orden.
+- Se guardan dos grafos "hacia arriba" en CSR:
+    fwd: arcos u -> w con rank[w] > rank[u]   (búsqueda desde el origen)
+    bwd: arcos u -> w con rank[u] > rank[w], guardados en w
+         (búsqueda hacia atrás desde el destino)
+  middle[p] es el nodo contraído que reemplaza el atajo p (-1 si el arco
+  es original); con eso se desempaca el camino completo.
+
+Consulta: Dijkstra bidireccional que solo sube de rango. El camino mínimo
+pasa por el nodo de mayor rango, así que ambas búsquedas se encuentran
+ahí; cada lado se detiene cuando su mínimo en la cola ya no mejora el
+mejor cruce. Con "stall-on-demand" no se expande un nodo si se llega a
+él más barato bajando desde un nodo de rango mayor ya alcanzado.
+
+save() / load() usan un formato binario con los arreglos tal cual
+(array.tofile / fromfile), así que cargar es casi instantáneo.
+
+No depende de tkinter, matplotlib ni networkx.
+"""
+
+from array import array
+import heapq
+import json
+import math
+import struct
+import sys
+
+from motor_caminos import CSRGraph
+
+_MAGIC = b"CHv1"
+_HEADER = struct.Struct("<4sBiii")   # magic, little-endian?, n, m_fwd, m_bwd
+
+
+class ContractionHierarchy:
+    def __init__(self, rank, fwd, bwd, nodes=None):
+        """
+        rank: array("i") con el rango de cada nodo.
+        fwd / bwd: tuplas (offsets, targets, weights, middle).
+        """
+        self.rank = rank
+        self.fwd_offsets, self.fwd_targets, self.fwd_weights, self.fwd_middle = fwd
+        self.bwd_offsets, self.bwd_targets, self.bwd_weights, self.bwd_middle = bwd
+        self.nodes = list(nodes) if nodes is not None else list(range(len(rank)))
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+    @property
+    def n(self):
+        return len(self.rank)
+
+    @property
+    def shortcuts(self):
+        """Número de arcos que son atajos (no originales)."""
+        return (sum(1 for x in self.fwd_middle if x != -1)
+                + sum(1 for x in self.bwd_middle if x != -1))
+
+    # -----------------------------------------------------------
+    # Preproceso
+    # -----------------------------------------------------------
+    @classmethod
+    def build(cls, graph, settle_limit=64):
+        """
+        Construye la jerarquía a partir de un CSRGraph (dirigido o no).
+
+        settle_limit acota cada búsqueda de testigos: si se corta antes de
+        tiempo solo se agregan atajos de más, el resultado sigue siendo
+        exacto.
+        """
+        n = graph.n
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+        # Grafo restante (solo nodos sin contraer), con el arco más barato
+        # si hay paralelos.
+        out_adj = [{} for _ in range(n)]
+        in_adj = [{} for _ in range(n)]
+        for u in range(n):
+            out_u = out_adj[u]
+            for p in range(offsets[u], offsets[u + 1]):
+                v = targets[p]
+                w = weights[p]
+                if v != u and w < out_u.get(v, math.inf):
+                    out_u[v] = w
+                    in_adj[v][u] = w
+
+        middle = {}                 # (u, w) -> nodo contraído del atajo
+        deleted = [0] * n           # vecinos ya contraídos
+
+        def witness_dists(u, skip, limit, pending):
+            """Dijkstra acotado desde u en el grafo restante, sin pasar por skip."""
+            dist = {u: 0.0}
+            heap = [(0.0, u)]
+            settled = 0
+            while heap and pending and settled < settle_limit:
+                d, x = heapq.heappop(heap)
+                if d > dist[x]:
+                    continue
+                if d > limit:
+                    break
+                pending.discard(x)
+                settled += 1
+                for y, c in out_adj[x].items():
+                    if y == skip:
+                        continue
+                    nd = d + c
+                    if nd < dist.get(y, math.inf):
+                        dist[y] = nd
+                        heapq.heappush(heap, (nd, y))
+            return dist
+
+        def needed_shortcuts(v):
+            result = []
+            outs = out_adj[v]
+            for u, cu in in_adj[v].items():
+                candidates = {w: cu + cw for w, cw in outs.items() if w != u}
+                if not candidates:
+                    continue
+                dist = witness_dists(u, v, max(candidates.values()), set(candidates))
+                for w, c in candidates.items():
+                    if dist.get(w, math.inf) > c:
+                        result.append((u, w, c))
+            return result
+
+        def priority(v):
+            shortcuts = needed_shortcuts(v)
+            removed = len(out_adj[v]) + len(in_adj[v])
+            return len(shortcuts) - removed + deleted[v], shortcuts
+
+        heap = [(priority(v)[0], v) for v in range(n)]
+        heapq.heapify(heap)
+
+        rank = array("i", [0]) * n
+        up_out = [None] * n         # arcos hacia arriba de cada nodo al contraerlo
+        up_in = [None] * n
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            # Actualización perezosa: si su prioridad empeoró, vuelve a la cola
+            prio, shortcuts = priority(v)
+            if heap and prio > heap[0][0]:
+                heapq.heappush(heap, (prio, v))
+                continue
+
+            rank[v] = order
+            order += 1
+
+            for u, w, c in shortcuts:
+                if c < out_adj[u].get(w, math.inf):
+                    out_adj[u][w] = c
+                    in_adj[w][u] = c
+                    middle[(u, w)] = v
+
+            up_out[v] = [(w, c, middle.get((v, w), -1)) for w, c in out_adj[v].items()]
+            up_in[v] = [(u, c, middle.get((u, v), -1)) for u, c in in_adj[v].items()]
+            for w in out_adj[v]:
+                del in_adj[w][v]
+                deleted[w] += 1
+            for u in in_adj[v]:
+                del out_adj[u][v]
+                deleted[u] += 1
+            out_adj[v] = in_adj[v] = None
+
+        return cls(rank, _pack(up_out), _pack(up_in), graph.nodes)
+
+    # -----------------------------------------------------------
+    # Consulta
+    # -----------------------------------------------------------
+    def query(self, source, target):
+        """
+        Camino mínimo entre dos índices. Devuelve (dist, path) con path
+        como lista de índices; (inf, []) si no hay camino.
+        """
+        if source == target:
+            return 0.0, [source]
+
+        fwd = (self.fwd_offsets, self.fwd_targets, self.fwd_weights)
+        bwd = (self.bwd_offsets, self.bwd_targets, self.bwd_weights)
+        # (grafo de subida, grafo para detectar estancamiento, dist, prev, cola)
+        sides = (
+            (fwd, bwd, {source: 0.0}, {source: -1}, [(0.0, source)]),
+            (bwd, fwd, {target: 0.0}, {target: -1}, [(0.0, target)]),
+        )
+        dist_f, dist_b = sides[0][2], sides[1][2]
+        best = math.inf
+        meet = -1
+        active = [True, True]
+
+        while active[0] or active[1]:
+            for side in (0, 1):
+                if not active[side]:
+                    continue
+                (offsets, targets, weights), (s_offsets, s_targets, s_weights), dist, prev, heap = sides[side]
+                other = dist_b if side == 0 else dist_f
+
+                # Descartar entradas viejas
+                while heap and heap[0][0] > dist[heap[0][1]]:
+                    heapq.heappop(heap)
+                if not heap or heap[0][0] >= best:
+                    active[side] = False
+                    continue
+
+                d, u = heapq.heappop(heap)
+                if u in other and d + other[u] < best:
+                    best = d + other[u]
+                    meet = u
+
+                stalled = False
+                for p in range(s_offsets[u], s_offsets[u + 1]):
+                    x = s_targets[p]
+                    if x in dist and dist[x] + s_weights[p] < d:
+                        stalled = True
+                        break
+                if stalled:
+                    continue
+
+                for p in range(offsets[u], offsets[u + 1]):
+                    v = targets[p]
+                    nd = d + weights[p]
+                    if nd < dist.get(v, math.inf):
+                        dist[v] = nd
+                        prev[v] = u
+                        heapq.heappush(heap, (nd, v))
+                        if v in other and nd + other[v] < best:
+                            best = nd + other[v]
+                            meet = v
+
+        if meet == -1:
+            return math.inf, []
+
+        prev_f, prev_b = sides[0][3], sides[1][3]
+        up = []
+        x = meet
+        while x != -1:
+            up.append(x)
+            x = prev_f[x]
+        up.reverse()
+        down = []
+        x = prev_b[meet]
+        while x != -1:
+            down.append(x)
+            x = prev_b[x]
+
+        return best, self._unpack(up + down)
+
+    def distance(self, source, target):
+        return self.query(source, target)[0]
+
+    def shortest_path(self, source_name, target_name):
+        """Igual que query() pero con nombres de nodo."""
+        dist, path = self.query(self.index[source_name], self.index[target_name])
+        return dist, [self.nodes[i] for i in path]
+
+    def _arc_middle(self, a, b):
+        """Nodo intermedio del arco a -> b de la jerarquía (-1 si es original)."""
+        if self.rank[a] < self.rank[b]:
+            offsets, targets, middle, u, v = self.fwd_offsets, self.fwd_targets, self.fwd_middle, a, b
+        else:
+            offsets, targets, middle, u, v = self.bwd_offsets, self.bwd_targets, self.bwd_middle, b, a
+        for p in range(offsets[u], offsets[u + 1]):
+            if targets[p] == v:
+                return middle[p]
+        raise KeyError((a, b))
+
+    def _unpack(self, path):
+        """Reemplaza cada atajo por los dos arcos que lo forman, hasta llegar a arcos originales."""
+        result = [path[0]]
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+        while stack:
+            a, b = stack.pop()
+            mid = self._arc_middle(a, b)
+            if mid == -1:
+                result.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return result
+
+    # -----------------------------------------------------------
+    # Persistencia
+    # -----------------------------------------------------------
+    def save(self, path):
+        """
+        Formato: cabecera, rank, fwd (offsets, targets, weights, middle),
+        bwd (igual) y al final los nombres de nodo en JSON.
+        """
+        little = sys.byteorder == "little"
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, little, self.n, len(self.fwd_targets), len(self.bwd_targets)))
+            for arr in self._arrays():
+                arr.tofile(f)
+            f.write(json.dumps(self.nodes).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            magic, little, n, m_fwd, m_bwd = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} no es una jerarquía de contracción")
+            swap = bool(little) != (sys.byteorder == "little")
+
+            def read(typecode, count):
+                arr = array(typecode)
+                arr.fromfile(f, count)
+                if swap:
+                    arr.byteswap()
+                return arr
+
+            rank = read("i", n)
+            fwd = (read("i", n + 1), read("i", m_fwd), read("d", m_fwd), read("i", m_fwd))
+            bwd = (read("i", n + 1), read("i", m_bwd), read("d", m_bwd), read("i", m_bwd))
+            nodes = json.loads(f.read().decode("utf-8"))
+        return cls(rank, fwd, bwd, nodes)
+
+    def _arrays(self):
+        return (self.rank,
+                self.fwd_offsets, self.fwd_targets, self.fwd_weights, self.fwd_middle,
+                self.bwd_offsets, self.bwd_targets, self.bwd_weights, self.bwd_middle)
+
+
+def _pack(adjacency):
+    """Lista de listas (destino, peso, intermedio) -> arreglos CSR."""
+    offsets = array("i", [0])
+    targets = array("i")
+    weights = array("d")
+    middle = array("i")
+    for arcs in adjacency:
+        for v, w, mid in arcs:
+            targets.append(v)
+            weights.append(w)
+            middle.append(mid)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middle
+
+
+def build_from_networkx(G, weight="weight", settle_limit=64):
+    """Atajo: jerarquía de un grafo de networkx, con sus nombres de nodo."""
+    return ContractionHierarchy.build(CSRGraph.from_networkx(G, weight=weight), settle_limit)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Matrices de todos los pares guardadas en disco y mapeadas en memoria.
+
+Con n = 20 000 nodos, D en float64 ocupa 3.2 GB y P otro tanto en
+listas de Python: no caben. Aquí se guardan como dos archivos .npy:
+
+- dist.npy: float32 (n, n), inf si no hay camino. Los enteros hasta
+  2**24 se guardan exactos; otros pesos pierden precisión después del
+  séptimo dígito.
+- next.npy: int32 (n, n), índice del siguiente nodo (NO_HOP = -1).
+- meta.json: nombres de los nodos y método usado. Se escribe al final:
+  una carpeta sin meta.json es un cálculo que no terminó.
+
+Los archivos se abren con np.load(mmap_mode="r"): una consulta lee solo
+las páginas que toca (un elemento por salto de una ruta, una fila si se
+pide la fila) y el sistema operativo decide qué queda en memoria.
+
+Las carpetas se nombran con un hash de las aristas, así que abrir otra
+vez el mismo grafo (en esta u otra ejecución) reutiliza el resultado.
+extend_store arma la carpeta de un grafo que solo agregó o abarató
+aristas copiando la anterior y aplicando insert_edge (O(n²) por arista).
+
+Uso:
+    store = open_or_compute(n, sources, targets, weights, nodes=nombres)
+    store.distance(i, j), store.route(i, j), store.row(i)
+    dist, offsets, values = store.routes(sources, targets)
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+from caminos_todos_pares import (
+    all_pairs, batch_routes, choose_apsp, insert_edge, johnson, path_indices,
+)
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "grafos", "apsp")
+
+
+def graph_key(n, sources, targets, weights, directed=False, nodes=None):
+    """Hash hexadecimal de n, los nombres de los nodos y las aristas (índices y pesos)."""
+    h = hashlib.sha1()
+    h.update(f"{n}:{int(directed)}:".encode("ascii"))
+    if nodes is not None:
+        h.update(json.dumps(list(nodes)).encode("utf-8"))
+    for column, dtype in ((sources, np.int64), (targets, np.int64), (weights, np.float64)):
+        data = np.ascontiguousarray(column, dtype=dtype)
+        if sys.byteorder != "little":
+            data = data.byteswap()
+        h.update(data.tobytes())
+    return h.hexdigest()
+
+
+class DiskAPSP:
+    """Lector de dist / next mapeados en memoria, con caché LRU de filas."""
+
+    def __init__(self, folder, max_rows=256):
+        self.folder = folder
+        self.dist = np.load(os.path.join(folder, "dist.npy"), mmap_mode="r")
+        self.next = np.load(os.path.join(folder, "next.npy"), mmap_mode="r")
+        with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.nodes = meta["nodes"]
+        self.method = meta["method"]
+        self.max_rows = max_rows
+        self._rows = OrderedDict()
+        self._index = None
+
+    @property
+    def n(self):
+        return len(self.dist)
+
+    def indices(self, names):
+        """Índices (arreglo int) de los nodos con esos nombres."""
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(self.nodes)}
+        return np.fromiter((self._index[name] for name in names), dtype=np.intp)
+
+    def nbytes(self):
+        """Solo lo que está en memoria: las filas en caché (para ResultCache)."""
+        return 1024 + sum(d.nbytes + p.nbytes for d, p in self._rows.values())
+
+    # -----------------------------------------------------------
+    # Consultas
+    # -----------------------------------------------------------
+    def distance(self, i, j):
+        return float(self.dist[i, j])
+
+    def route(self, i, j):
+        """Índices del camino i → j ([] si no hay): un elemento leído por salto."""
+        return path_indices(self.next, i, j)
+
+    def row(self, i):
+        """(distancias, siguientes saltos) desde i, copiados a memoria."""
+        cached = self._rows.get(i)
+        if cached is not None:
+            self._rows.move_to_end(i)
+            return cached
+        cached = (np.array(self.dist[i]), np.array(self.next[i]))
+        self._rows[i] = cached
+        if len(self._rows) > self.max_rows:
+            self._rows.popitem(last=False)
+        return cached
+
+    def distances(self, sources, targets):
+        """Distancias de muchos pares (i, j): solo se leen esas celdas."""
+        return np.asarray(self.dist[np.asarray(sources), np.asarray(targets)], dtype=np.float64)
+
+    def routes(self, sources, targets):
+        """
+        (dist, offsets, values) de muchos pares; ver batch_routes. Cada
+        salto lee del archivo solo las celdas de los pares que siguen en
+        camino.
+        """
+        return batch_routes(self.dist, self.next, sources, targets)
+
+
+# -----------------------------------------------------------
+# Cálculo
+# -----------------------------------------------------------
+def _create(folder, n):
+    dist = np.lib.format.open_memmap(os.path.join(folder, "dist.npy"), mode="w+",
+                                     dtype=np.float32, shape=(n, n))
+    hops = np.lib.format.open_memmap(os.path.join(folder, "next.npy"), mode="w+",
+                                     dtype=np.int32, shape=(n, n))
+    return dist, hops
+
+
+def compute_to_disk(folder, n, sources, targets, weights, directed=False, nodes=None,
+                    method="auto", workers=None):
+    """
+    Calcula todos los pares y los deja en `folder`. Johnson escribe fila
+    por fila directo en los archivos (no necesita las matrices en
+    memoria); Floyd–Warshall necesita D y P completos en memoria y se
+    guarda al terminar, así que solo conviene si el grafo cabe.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if method == "auto":
+        arcs = len(sources) if directed else 2 * len(sources)
+        method = choose_apsp(n, arcs, workers)
+
+    os.makedirs(folder, exist_ok=True)
+    dist, hops = _create(folder, n)
+    if method == "johnson":
+        johnson(n, sources, targets, weights, directed, workers, out=(dist, hops))
+    else:
+        D, P, method = all_pairs(n, sources, targets, weights, directed, method, workers)
+        dist[...] = D
+        hops[...] = P
+        del D, P
+    dist.flush()
+    hops.flush()
+    del dist, hops
+    _write_meta(folder, n, nodes, method)
+
+
+def _write_meta(folder, n, nodes, method):
+    meta = {"nodes": list(nodes) if nodes is not None else list(range(n)), "method": method}
+    with open(os.path.join(folder, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def extend_on_disk(folder, base, added, directed=False):
+    """
+    Copia las matrices de `base` (DiskAPSP) a `folder` y les agrega las
+    aristas `added` [(u, v, w), ...] con insert_edge, directo en los
+    archivos mapeados.
+    """
+    os.makedirs(folder, exist_ok=True)
+    for name in ("dist.npy", "next.npy"):
+        shutil.copyfile(os.path.join(base.folder, name), os.path.join(folder, name))
+    dist = np.load(os.path.join(folder, "dist.npy"), mmap_mode="r+")
+    hops = np.load(os.path.join(folder, "next.npy"), mmap_mode="r+")
+    for u, v, w in added:
+        insert_edge(dist, hops, u, v, w, directed)
+    dist.flush()
+    hops.flush()
+    del dist, hops
+    _write_meta(folder, base.n, base.nodes, "incremental")
+
+
+def open_or_compute(n, sources, targets, weights, directed=False, nodes=None,
+                    directory=DEFAULT_DIRECTORY, method="auto", workers=None, max_stores=8):
+    """
+    DiskAPSP del grafo: lo abre si ya se calculó (misma carpeta = mismo
+    hash de aristas); si no, lo calcula en una carpeta temporal y la
+    renombra al terminar. Se conservan las `max_stores` más recientes.
+    """
+    key = graph_key(n, sources, targets, weights, directed, nodes)
+    return _store(directory, key, max_stores, compute_to_disk,
+                  n, sources, targets, weights, directed, nodes, method, workers)
+
+
+def extend_store(base, added, n, sources, targets, weights, directed=False, nodes=None,
+                 directory=DEFAULT_DIRECTORY, max_stores=8):
+    """
+    Como open_or_compute, para un grafo que es `base` más las aristas
+    `added` (nuevas o más baratas). sources / targets / weights son las
+    aristas del grafo completo: solo sirven para el nombre de la carpeta.
+    ValueError si alguna arista forma un ciclo negativo.
+    """
+    key = graph_key(n, sources, targets, weights, directed, nodes)
+    return _store(directory, key, max_stores, extend_on_disk, base, added, directed)
+
+
+def _store(directory, key, max_stores, build, *args):
+    """DiskAPSP de la carpeta `key`; si no existe la arma build(carpeta, *args)."""
+    folder = os.path.join(directory, key)
+    if not os.path.exists(os.path.join(folder, "meta.json")):
+        os.makedirs(directory, exist_ok=True)
+        work = tempfile.mkdtemp(dir=directory, prefix=".tmp-")
+        try:
+            build(work, *args)
+            if os.path.exists(folder):
+                shutil.rmtree(folder)       # restos de un cálculo interrumpido
+            os.replace(work, folder)
+        finally:
+            if os.path.exists(work):
+                shutil.rmtree(work, ignore_errors=True)
+        _prune(directory, max_stores)
+
+    os.utime(folder)    # más reciente para _prune
+    return DiskAPSP(folder)
+
+
+def _prune(directory, max_stores):
+    folders = [os.path.join(directory, name) for name in os.listdir(directory)
+               if not name.startswith(".")]
+    if len(folders) <= max_stores:
+        return
+    folders.sort(key=os.path.getmtime)
+    for folder in folders[:len(folders) - max_stores]:
+        shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,818 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de caminos mínimos SIN interfaz gráfica.
+
+- Grafo compacto en formato CSR (offsets / targets / weights) con nodos
+  indexados por enteros 0..n-1.
+- Dijkstra con cola de prioridad que devuelve solo dist y prev
+  (sin traza de pasos), pensado para trabajos por lotes. La cola puede
+  ser heapq (con duplicados) o una cola direccionable con decrease-key
+  de colas_prioridad ("indexed" o "pairing").
+- prim: árbol de expansión mínima con las mismas colas.
+- dijkstra_events: misma búsqueda pero emitiendo, por cada nodo fijado,
+  las relajaciones realizadas (la usa la interfaz paso a paso).
+- bidirectional_dijkstra: consulta punto a punto que busca desde el
+  origen y desde el destino a la vez y se detiene al encontrarse.
+- astar: A* punto a punto; si el grafo tiene coordenadas (lat, lon) usa
+  la distancia de gran círculo como heurística admisible.
+
+No depende de tkinter, matplotlib ni networkx.
+"""
+
+from array import array
+import heapq
+import math
+
+from colas_prioridad import QUEUES
+
+# queue="auto" usa Dial si todos los pesos son enteros no negativos y el
+# peso máximo no pasa de este valor (Dial recorre cubetas vacías).
+DIAL_MAX_WEIGHT = 1 << 12
+
+
+class CSRGraph:
+    """
+    Lista de adyacencia compacta:
+    - offsets[u] .. offsets[u+1]-1 son las posiciones de los arcos que salen de u
+    - targets[p]: nodo destino del arco p
+    - weights[p]: peso del arco p
+    - nodes: nombres originales (nodes[i] es el nombre del índice i)
+    - directed: False si cada arista está guardada en ambos sentidos
+    - coords: lista opcional de (lat, lon) por índice (para A*)
+    """
+
+    def __init__(self, offsets, targets, weights, nodes=None, directed=True, coords=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+        self.coords = coords
+        n = len(offsets) - 1
+        self.nodes = list(nodes) if nodes is not None else list(range(n))
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+    @property
+    def n(self):
+        return len(self.offsets) - 1
+
+    @property
+    def m(self):
+        return len(self.targets)
+
+    @classmethod
+    def from_arcs(cls, n, sources, targets, weights, nodes=None, directed=True):
+        """
+        Construye el CSR a partir de tres secuencias paralelas de enteros
+        (origen, destino) y pesos. Si directed=False cada arco se guarda
+        en ambos sentidos.
+        """
+        count = array("i", [0]) * (n + 1)
+        for u in sources:
+            count[u + 1] += 1
+        if not directed:
+            for v in targets:
+                count[v + 1] += 1
+
+        offsets = array("i", count)
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        m = offsets[n]
+        out_targets = array("i", [0]) * m
+        out_weights = array("d", [0.0]) * m
+        fill = array("i", offsets[:n])
+
+        for u, v, w in zip(sources, targets, weights):
+            p = fill[u]
+            out_targets[p] = v
+            out_weights[p] = w
+            fill[u] = p + 1
+            if not directed:
+                p = fill[v]
+                out_targets[p] = u
+                out_weights[p] = w
+                fill[v] = p + 1
+
+        return cls(offsets, out_targets, out_weights, nodes, directed)
+
+    @classmethod
+    def from_edges(cls, nodes, edges, directed=False):
+        """
+        edges: iterable de (u, v, w) con los NOMBRES de los nodos.
+        """
+        nodes = list(nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        sources = array("i")
+        targets = array("i")
+        weights = array("d")
+        for u, v, w in edges:
+            sources.append(index[u])
+            targets.append(index[v])
+            weights.append(w)
+        return cls.from_arcs(len(nodes), sources, targets, weights, nodes, directed)
+
+    @classmethod
+    def from_networkx(cls, G, weight="weight", nodes=None, coords=None):
+        """
+        Convierte un grafo de networkx (dirigido o no) conservando el orden
+        de vecinos de G[u]. Los índices siguen el orden de `nodes`
+        (por defecto, el de G.nodes).
+
+        coords: diccionario {nodo: (lat, lon)}. Si no se da y todos los
+        nodos tienen atributos "lat" y "lon", se toman de ahí.
+        """
+        nodes = list(G.nodes) if nodes is None else list(nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        sources = array("i")
+        targets = array("i")
+        weights = array("d")
+        for u in nodes:
+            i = index[u]
+            for v, data in G[u].items():
+                sources.append(i)
+                targets.append(index[v])
+                weights.append(data.get(weight, 1.0))
+        graph = cls.from_arcs(len(nodes), sources, targets, weights, nodes, directed=True)
+        graph.directed = G.is_directed()
+
+        if coords is None and nodes and all("lat" in G.nodes[u] and "lon" in G.nodes[u] for u in nodes):
+            coords = {u: (G.nodes[u]["lat"], G.nodes[u]["lon"]) for u in nodes}
+        if coords is not None:
+            graph.coords = [coords[u] for u in nodes]
+        return graph
+
+    def neighbors(self, u):
+        """Pares (v, w) de los arcos que salen de u."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def integer_max_weight(self):
+        """
+        Peso máximo si TODOS los pesos son enteros no negativos y finitos
+        (aunque estén guardados como float); None si no.
+        """
+        if not hasattr(self, "_integer_max_weight"):
+            result = None
+            if all(w >= 0 and math.isfinite(w) and w == int(w) for w in self.weights):
+                result = int(max(self.weights, default=0))
+            self._integer_max_weight = result
+        return self._integer_max_weight
+
+    def reverse(self):
+        """Grafo con todos los arcos invertidos (el mismo si no es dirigido)."""
+        if not self.directed:
+            return self
+        n = self.n
+        sources = array("i", [0]) * self.m
+        for u in range(n):
+            for p in range(self.offsets[u], self.offsets[u + 1]):
+                sources[p] = u
+        return CSRGraph.from_arcs(n, self.targets, sources, self.weights, self.nodes, directed=True)
+
+
+# -----------------------------------------------------------
+# Dijkstra
+# -----------------------------------------------------------
+def choose_queue(graph):
+    """
+    Cola para queue="auto": Dial con pesos enteros pequeños, si no heapq.
+
+    El radix heap queda como opción explícita: en CPython heapq (escrito
+    en C) le gana cuando los pesos enteros son grandes.
+    """
+    max_weight = graph.integer_max_weight()
+    if max_weight is not None and max_weight <= DIAL_MAX_WEIGHT:
+        return "dial"
+    return "heapq"
+
+
+def dijkstra(graph, source, target=None, queue="auto"):
+    """
+    Dijkstra sobre un CSRGraph.
+
+    - source / target: índices enteros de nodo.
+    - Si se da target, se detiene en cuanto target queda fijado.
+    - queue: "heapq" (duplicados + descarte perezoso), "indexed" o
+      "pairing" (decrease-key, una entrada por nodo), "dial" o "radix"
+      (cubetas, solo pesos enteros) o "auto" (ver choose_queue).
+
+    Devuelve (dist, prev): listas de longitud n; dist[v] = inf si v no es
+    alcanzable y prev[v] = -1 si v no tiene predecesor.
+    """
+    if queue == "auto":
+        queue = choose_queue(graph)
+    if queue in ("dial", "radix") and graph.integer_max_weight() is None:
+        raise ValueError(f"La cola '{queue}' requiere pesos enteros no negativos.")
+    if queue == "dial":
+        return _dijkstra_dial(graph, source, target)
+    if queue == "radix":
+        return _dijkstra_radix(graph, source, target)
+    if queue != "heapq":
+        return _dijkstra_decrease_key(graph, source, target, QUEUES[queue])
+
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    dist = [math.inf] * n
+    prev = [-1] * n
+    done = bytearray(n)
+    dist[source] = 0.0
+
+    pq = [(0.0, source)]
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while pq:
+        d_u, u = pop(pq)
+        if done[u]:
+            continue
+        done[u] = 1
+        if u == target:
+            break
+
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            if done[v]:
+                continue
+            new = d_u + weights[p]
+            if new < dist[v]:
+                dist[v] = new
+                prev[v] = u
+                push(pq, (new, v))
+
+    return dist, prev
+
+
+def _dijkstra_decrease_key(graph, source, target, queue_class):
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    dist = [math.inf] * n
+    prev = [-1] * n
+    dist[source] = 0.0
+
+    pq = queue_class(n)
+    pq.push(source, 0.0)
+    push = pq.push
+    decrease = pq.decrease_key
+    pop = pq.pop
+
+    while len(pq):
+        d_u, u = pop()
+        if u == target:
+            break
+
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            new = d_u + weights[p]
+            old = dist[v]
+            if new < old:
+                # Los nodos ya fijados nunca mejoran: no hace falta marcarlos
+                dist[v] = new
+                prev[v] = u
+                if old == math.inf:
+                    push(v, new)
+                else:
+                    decrease(v, new)
+
+    return dist, prev
+
+
+# -----------------------------------------------------------
+# Colas monótonas para pesos enteros (Dial y radix heap)
+# -----------------------------------------------------------
+# Con pesos enteros no negativos las distancias que salen de la cola nunca
+# decrecen, así que basta con cubetas de nodos (sin tuplas (dist, nodo)).
+# Las cubetas están escritas dentro del bucle de Dijkstra para no pagar
+# una llamada a método por operación.
+#
+# Dentro de una misma distancia los nodos salen en orden de índice (cada
+# cubeta se vuelve montículo de enteros al procesarla), el mismo desempate
+# que heapq con (dist, nodo): dist y prev salen idénticos a los de heapq.
+
+def _dijkstra_dial(graph, source, target):
+    """
+    Algoritmo de Dial: C + 1 cubetas circulares (C = peso máximo). Todas
+    las distancias pendientes están en [actual, actual + C], así que
+    dist % (C + 1) identifica su cubeta sin ambigüedad.
+    """
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    dist = [math.inf] * n
+    prev = [-1] * n
+    done = bytearray(n)
+    dist[source] = 0.0
+
+    nbuckets = graph.integer_max_weight() + 1
+    buckets = [[] for _ in range(nbuckets)]
+    buckets[0].append(source)
+    pending = 1
+    current = 0
+    pop = heapq.heappop
+    push = heapq.heappush
+
+    while pending:
+        bucket = buckets[current % nbuckets]
+        if not bucket:
+            current += 1
+            continue
+
+        heapq.heapify(bucket)
+        d_u = float(current)
+        while bucket:
+            u = pop(bucket)
+            pending -= 1
+            if done[u] or d_u > dist[u]:
+                continue
+            done[u] = 1
+            if u == target:
+                return dist, prev
+
+            for p in range(offsets[u], offsets[u + 1]):
+                v = targets[p]
+                if done[v]:
+                    continue
+                new = d_u + weights[p]
+                if new < dist[v]:
+                    dist[v] = new
+                    prev[v] = u
+                    if new == d_u:
+                        push(bucket, v)       # peso 0: misma cubeta
+                    else:
+                        buckets[int(new) % nbuckets].append(v)
+                    pending += 1
+        current += 1
+
+    return dist, prev
+
+
+def _dijkstra_radix(graph, source, target):
+    """
+    Radix heap: la cubeta i guarda las distancias cuyo bit más alto
+    distinto de la última distancia sacada (last) es el bit i-1; la
+    cubeta 0 (`zero`) guarda las iguales a last. Al vaciarse `zero` se
+    redistribuye la primera cubeta no vacía. Hay una cubeta por bit de la
+    mayor distancia posible ((n - 1) * peso máximo), al menos 64; cada
+    nodo baja de cubeta a lo más esa cantidad de veces.
+    """
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    dist = [math.inf] * n
+    prev = [-1] * n
+    done = bytearray(n)
+    dist[source] = 0.0
+
+    bits = max(64, ((n - 1) * graph.integer_max_weight()).bit_length())
+    buckets = [[] for _ in range(bits + 1)]
+    zero = [source]
+    last = 0
+    pending = 1
+    pop = heapq.heappop
+    push = heapq.heappush
+
+    while pending:
+        if not zero:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            items = buckets[i]
+            buckets[i] = []
+            last = min(items)[0]
+            for k, v in items:
+                j = (k ^ last).bit_length()
+                if j == 0:
+                    zero.append(v)
+                else:
+                    buckets[j].append((k, v))
+            heapq.heapify(zero)
+
+        u = pop(zero)
+        pending -= 1
+        d_u = float(last)
+        if done[u] or d_u > dist[u]:
+            continue
+        done[u] = 1
+        if u == target:
+            break
+
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            if done[v]:
+                continue
+            new = d_u + weights[p]
+            if new < dist[v]:
+                dist[v] = new
+                prev[v] = u
+                k = int(new)
+                j = (k ^ last).bit_length()
+                if j == 0:
+                    push(zero, v)
+                else:
+                    buckets[j].append((k, v))
+                pending += 1
+
+    return dist, prev
+
+
+def prim(graph, root=0, queue="indexed"):
+    """
+    Árbol de expansión mínima (Prim) del componente de `root` en un
+    CSRGraph no dirigido.
+
+    Devuelve (peso_total, aristas) con aristas = [(padre, hijo, peso)].
+    """
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    best = [math.inf] * n
+    parent = [-1] * n
+    in_tree = bytearray(n)
+    best[root] = 0.0
+
+    pq = QUEUES[queue](n)
+    pq.push(root, 0.0)
+    total = 0.0
+    edges = []
+
+    while len(pq):
+        w_u, u = pq.pop()
+        in_tree[u] = 1
+        if parent[u] != -1:
+            total += w_u
+            edges.append((parent[u], u, w_u))
+
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            w = weights[p]
+            if not in_tree[v] and w < best[v]:
+                best[v] = w
+                parent[v] = u
+                pq.push_or_decrease(v, w)
+
+    return total, edges
+
+
+def dijkstra_events(graph, source):
+    """
+    Igual que dijkstra() pero como generador: por cada nodo fijado emite
+    (u, updates) donde updates es la lista de (v, dist_antes, dist_candidata,
+    cambió) para cada vecino NO fijado de u, en el orden del CSR.
+
+    dist y prev se van modificando en sitio; el generador los devuelve
+    (StopIteration.value) al terminar.
+    """
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    dist = [math.inf] * n
+    prev = [-1] * n
+    done = bytearray(n)
+    dist[source] = 0.0
+
+    pq = [(0.0, source)]
+    settled = 0
+
+    while pq:
+        d_u, u = heapq.heappop(pq)
+        if done[u] or d_u > dist[u]:
+            continue
+
+        updates = []
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            if done[v]:
+                continue
+            old = dist[v]
+            new = d_u + weights[p]
+            if new < old:
+                dist[v] = new
+                prev[v] = u
+                updates.append((v, old, new, True))
+                heapq.heappush(pq, (new, v))
+            else:
+                updates.append((v, old, new, False))
+
+        done[u] = 1
+        settled += 1
+        yield u, updates
+
+        if settled == n:
+            break
+
+    return dist, prev
+
+
+# -----------------------------------------------------------
+# Dijkstra bidireccional (consultas punto a punto)
+# -----------------------------------------------------------
+def bidirectional_dijkstra(graph, source, target, reverse=None):
+    """
+    Distancia source -> target buscando a la vez hacia adelante (desde
+    source en graph) y hacia atrás (desde target en el grafo invertido).
+
+    En cada vuelta se avanza el lado cuya cola tenga la menor clave; se
+    lleva `best` = mejor dist_f[x] + dist_b[x] vista y la búsqueda termina
+    cuando tope_f + tope_b >= best (ningún camino más corto puede
+    quedar por descubrir).
+
+    reverse: grafo invertido ya construido (si no, se usa graph.reverse()).
+
+    Devuelve (distancia, camino, fijados): camino es la lista de índices
+    (vacía si no hay camino) y fijados el total de nodos fijados entre
+    ambos lados.
+    """
+    if reverse is None:
+        reverse = graph.reverse()
+    if source == target:
+        return 0.0, [source], 0
+
+    n = graph.n
+    sides = (graph, reverse)
+    dist = ([math.inf] * n, [math.inf] * n)
+    prev = ([-1] * n, [-1] * n)
+    done = (bytearray(n), bytearray(n))
+    pq = ([(0.0, source)], [(0.0, target)])
+    dist[0][source] = 0.0
+    dist[1][target] = 0.0
+
+    best = math.inf
+    meet = -1
+    settled = 0
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while pq[0] and pq[1]:
+        if pq[0][0][0] + pq[1][0][0] >= best:
+            break
+
+        side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d_u, u = pop(pq[side])
+        done_s = done[side]
+        if done_s[u]:
+            continue
+        done_s[u] = 1
+        settled += 1
+
+        g = sides[side]
+        dist_s, dist_o = dist[side], dist[1 - side]
+        prev_s = prev[side]
+        offsets, targets, weights = g.offsets, g.targets, g.weights
+
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            if done_s[v]:
+                continue
+            new = d_u + weights[p]
+            if new < dist_s[v]:
+                dist_s[v] = new
+                prev_s[v] = u
+                push(pq[side], (new, v))
+            if dist_o[v] != math.inf and dist_s[v] + dist_o[v] < best:
+                best = dist_s[v] + dist_o[v]
+                meet = v
+
+        if dist_o[u] != math.inf and d_u + dist_o[u] < best:
+            best = d_u + dist_o[u]
+            meet = u
+
+    if meet == -1:
+        return math.inf, [], settled
+
+    route = path_to(prev[0], meet)
+    x = meet
+    while prev[1][x] != -1:
+        x = prev[1][x]
+        route.append(x)
+    return best, route, settled
+
+
+def bidirectional_dijkstra_events(graph, source, target, reverse=None):
+    """
+    Versión paso a paso de bidirectional_dijkstra (para la interfaz).
+
+    Cada evento es un diccionario:
+    - side: 0 = búsqueda desde el origen, 1 = desde el destino
+    - current: nodo fijado en ese lado
+    - updates: (v, dist_antes, dist_candidata, cambió) de ese lado
+    - dist, prev, done: tuplas (lado 0, lado 1) con el estado VIVO
+    - best, meet: mejor distancia conocida y nodo de encuentro (-1 si no hay)
+
+    El último evento tiene "finished": True y "path" con la ruta.
+    """
+    if reverse is None:
+        reverse = graph.reverse()
+
+    n = graph.n
+    sides = (graph, reverse)
+    dist = ([math.inf] * n, [math.inf] * n)
+    prev = ([-1] * n, [-1] * n)
+    done = (bytearray(n), bytearray(n))
+    pq = ([(0.0, source)], [(0.0, target)])
+    dist[0][source] = 0.0
+    dist[1][target] = 0.0
+
+    best = 0.0 if source == target else math.inf
+    meet = source if source == target else -1
+
+    while pq[0] and pq[1]:
+        if pq[0][0][0] + pq[1][0][0] >= best:
+            break
+
+        side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d_u, u = heapq.heappop(pq[side])
+        done_s = done[side]
+        if done_s[u] or d_u > dist[side][u]:
+            continue
+
+        g = sides[side]
+        dist_s, dist_o = dist[side], dist[1 - side]
+        updates = []
+
+        for p in range(g.offsets[u], g.offsets[u + 1]):
+            v = g.targets[p]
+            if done_s[v]:
+                continue
+            old = dist_s[v]
+            new = d_u + g.weights[p]
+            if new < old:
+                dist_s[v] = new
+                prev[side][v] = u
+                updates.append((v, old, new, True))
+                heapq.heappush(pq[side], (new, v))
+            else:
+                updates.append((v, old, new, False))
+            if dist_o[v] != math.inf and dist_s[v] + dist_o[v] < best:
+                best = dist_s[v] + dist_o[v]
+                meet = v
+
+        if dist_o[u] != math.inf and d_u + dist_o[u] < best:
+            best = d_u + dist_o[u]
+            meet = u
+
+        done_s[u] = 1
+        yield {
+            "side": side, "current": u, "updates": updates,
+            "dist": dist, "prev": prev, "done": done,
+            "best": best, "meet": meet, "finished": False,
+        }
+
+    route = []
+    if meet != -1:
+        route = path_to(prev[0], meet)
+        x = meet
+        while prev[1][x] != -1:
+            x = prev[1][x]
+            route.append(x)
+
+    yield {
+        "side": None, "current": None, "updates": [],
+        "dist": dist, "prev": prev, "done": done,
+        "best": best, "meet": meet, "finished": True, "path": route,
+    }
+
+
+# -----------------------------------------------------------
+# A* con heurística geográfica
+# -----------------------------------------------------------
+EARTH_RADIUS_KM = 6371.0
+
+
+def great_circle_km(a, b):
+    """Distancia de gran círculo (haversine) entre dos (lat, lon) en km."""
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def admissible_scale(graph):
+    """
+    Mayor factor c <= 1 tal que c * gran_círculo(u, v) <= peso(u, v) en
+    todos los arcos. Con h(v) = c * gran_círculo(v, destino) la
+    heurística es consistente aunque algún costo se haya capturado por
+    debajo de la distancia real.
+
+    Recorre todos los arcos (O(m)), así que el resultado se guarda en el
+    grafo y se reutiliza mientras graph.coords sea la misma lista.
+    """
+    coords = graph.coords
+    cached = getattr(graph, "_admissible_scale", None)
+    if cached is not None and cached[0] is coords:
+        return cached[1]
+    scale = 1.0
+    for u in range(graph.n):
+        for p in range(graph.offsets[u], graph.offsets[u + 1]):
+            d = great_circle_km(coords[u], coords[graph.targets[p]])
+            if d > 0 and graph.weights[p] < scale * d:
+                scale = graph.weights[p] / d
+    scale = max(scale, 0.0)
+    graph._admissible_scale = (coords, scale)
+    return scale
+
+
+def geo_heuristic(graph, target, scale=None):
+    """
+    h(v) = scale * gran_círculo(v, target). Por defecto, la escala
+    admisible del grafo (calculada una vez por grafo y coordenadas).
+    """
+    if scale is None:
+        scale = admissible_scale(graph)
+    coords = graph.coords
+    goal = coords[target]
+    return lambda v: scale * great_circle_km(coords[v], goal)
+
+
+def astar(graph, source, target, heuristic=None):
+    """
+    A* de source a target sobre un CSRGraph.
+
+    heuristic: función h(índice) -> estimación admisible de la distancia
+    restante. Si es None, el grafo debe tener coords y se usa
+    geo_heuristic (gran círculo). Con h = 0 equivale a Dijkstra con
+    parada en el destino.
+
+    Devuelve (distancia, camino, expandidos).
+    """
+    if heuristic is None:
+        if graph.coords is None:
+            raise ValueError("El grafo no tiene coordenadas: indica una heurística.")
+        heuristic = geo_heuristic(graph, target)
+
+    n = graph.n
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+
+    dist = [math.inf] * n
+    prev = [-1] * n
+    done = bytearray(n)
+    h_cache = {}
+    dist[source] = 0.0
+
+    pq = [(heuristic(source), source)]
+    expanded = 0
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while pq:
+        _, u = pop(pq)
+        if done[u]:
+            continue
+        done[u] = 1
+        expanded += 1
+        if u == target:
+            return dist[u], path_to(prev, u), expanded
+
+        d_u = dist[u]
+        for p in range(offsets[u], offsets[u + 1]):
+            v = targets[p]
+            if done[v]:
+                continue
+            new = d_u + weights[p]
+            if new < dist[v]:
+                dist[v] = new
+                prev[v] = u
+                h = h_cache.get(v)
+                if h is None:
+                    h = h_cache[v] = heuristic(v)
+                push(pq, (new + h, v))
+
+    return math.inf, [], expanded
+
+
+def path_to(prev, target):
+    """Reconstruye la lista de índices desde el origen hasta target."""
+    if target < 0:
+        return []
+    route = [target]
+    while prev[route[-1]] != -1:
+        route.append(prev[route[-1]])
+    route.reverse()
+    return route
+
+
+def shortest_paths(graph, source_name):
+    """
+    Atajo con nombres: devuelve (dist, prev) como diccionarios
+    {nombre: valor}, con prev = None cuando no hay predecesor.
+    """
+    dist, prev = dijkstra(graph, graph.index[source_name])
+    nodes = graph.nodes
+    dist_by_name = {nodes[i]: d for i, d in enumerate(dist)}
+    prev_by_name = {nodes[i]: (nodes[p] if p != -1 else None) for i, p in enumerate(prev)}
+    return dist_by_name, prev_by_name
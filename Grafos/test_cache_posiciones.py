@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de regresión de la caché de posiciones.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import networkx as nx
+
+from cache_posiciones import LayoutCache
+
+
+def _cycle_with_chords():
+    G = nx.cycle_graph(30)
+    H = G.copy()
+    H.remove_edges_from([(i, i + 1) for i in range(0, 30, 2)])
+    H.add_edges_from([(i, (i + 15) % 30) for i in range(15)])
+    return G, H
+
+
+def test_mismos_nodos_otras_aristas_no_es_incremental():
+    layouts = LayoutCache(directory=None)
+    G, H = _cycle_with_chords()
+    p = layouts.layout(G, seed=42)
+    q = layouts.layout(H, previous=p, seed=42)
+    assert layouts.last_source == "completo"
+    assert q != p
+    assert q == LayoutCache(directory=None).layout(H, seed=42)
+
+
+def test_nodos_nuevos_conservan_los_viejos():
+    layouts = LayoutCache(directory=None)
+    G = nx.cycle_graph(30)
+    p = layouts.layout(G, seed=42)
+    H = G.copy()
+    H.add_edges_from([(0, 30), (30, 31)])
+    q = layouts.layout(H, previous=p, seed=42)
+    assert layouts.last_source == "incremental"
+    assert all(q[n] == p[n] for n in G)
+    assert set(q) == set(H)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de regresión de la carga de aristas.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import pytest
+
+from carga_aristas import load_edges, parse_edge_text, write_binary
+
+
+def test_binario_truncado_da_valueerror_o_reporte(tmp_path):
+    path = tmp_path / "red.edgb"
+    write_binary(str(path), parse_edge_text("A B 1\nB C 2\nC D 3"))
+    data = path.read_bytes()
+    broken = tmp_path / "roto.edgb"
+    for cut in range(1, len(data)):
+        broken.write_bytes(data[:cut])
+        try:
+            edges = load_edges(str(broken), fmt="binary")
+        except ValueError as exc:
+            assert "roto.edgb" in str(exc)
+        else:
+            assert not edges.report.ok
+
+
+def test_binario_completo(tmp_path):
+    path = tmp_path / "red.edgb"
+    write_binary(str(path), parse_edge_text("A B 1\nB C 2\nC D 3"))
+    edges = load_edges(str(path))
+    assert edges.report.ok and edges.m == 3
+
+
+def test_cabecera_truncada_menciona_el_archivo(tmp_path):
+    path = tmp_path / "corto.edgb"
+    path.write_bytes(b"EDGB\x01")
+    with pytest.raises(ValueError, match="corto.edgb"):
+        load_edges(str(path))
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del cierre incremental contra el cierre recalculado.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from cierre_transitivo import IncrementalClosure, condensed_closure
+
+
+def _closure(n, edges):
+    return condensed_closure(n, [u for u, _ in edges], [v for _, v in edges])
+
+
+def test_inserciones_y_borrados_igual_que_recalcular():
+    rnd = random.Random(24)
+    for _ in range(80):
+        n = rnd.randint(1, 40)
+        edges = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(rnd.randint(0, 2 * n))]
+        closure = IncrementalClosure(n, [u for u, _ in edges], [v for _, v in edges])
+        for _ in range(30):
+            if edges and rnd.random() < 0.5:
+                u, v = edges.pop(rnd.randrange(len(edges)))
+                closure.delete(u, v)
+            else:
+                u, v = rnd.randrange(n), rnd.randrange(n)
+                edges.append((u, v))
+                closure.insert(u, v)
+            assert np.array_equal(closure.R, _closure(n, edges))
+
+
+def test_borrar_arista_inexistente():
+    closure = IncrementalClosure(3, [0], [1])
+    with pytest.raises(KeyError):
+        closure.delete(1, 2)
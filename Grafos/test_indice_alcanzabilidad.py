@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de alcanzabilidad contra el cierre por componentes.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import numpy as np
+
+from cierre_transitivo import condensed_closure, unpack_rows
+from indice_alcanzabilidad import ReachabilityIndex
+
+
+def test_indice_igual_que_el_cierre():
+    rnd = np.random.default_rng(23)
+    for trial in range(120):
+        n = int(rnd.integers(1, 60))
+        m = int(rnd.integers(0, 3 * n))
+        sources, targets = rnd.integers(0, n, m), rnd.integers(0, n, m)
+        expected = unpack_rows(condensed_closure(n, sources, targets), n).astype(bool)
+
+        index = ReachabilityIndex(n, sources, targets, traversals=1 + trial % 3, seed=trial)
+        a, b = np.divmod(np.arange(n * n), n)
+        assert np.array_equal(index.query(a, b), expected[a, b])
+        for i in range(n):
+            for j in range(n):
+                assert index.reaches(i, j) == expected[i, j]
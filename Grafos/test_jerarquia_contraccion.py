@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la jerarquía de contracción contra Dijkstra.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import math
+import random
+
+from motor_caminos import CSRGraph, dijkstra
+from jerarquia_contraccion import ContractionHierarchy
+
+
+def _random_graph(rnd, directed):
+    n = rnd.randint(2, 40)
+    m = rnd.randint(0, 3 * n)
+    sources = [rnd.randrange(n) for _ in range(m)]
+    targets = [rnd.randrange(n) for _ in range(m)]
+    weights = [float(rnd.randint(1, 20)) for _ in range(m)]
+    return CSRGraph.from_arcs(n, sources, targets, weights, directed=directed)
+
+
+def _path_length(graph, path):
+    total = 0.0
+    for u, v in zip(path, path[1:]):
+        arcs = [w for x, w in graph.neighbors(u) if x == v]
+        assert arcs, f"el camino usa un arco que no existe: {u} → {v}"
+        total += min(arcs)
+    return total
+
+
+def _check(graph, ch, rnd):
+    for _ in range(10):
+        s = rnd.randrange(graph.n)
+        dist, _ = dijkstra(graph, s, queue="heapq")
+        for t in range(graph.n):
+            d, path = ch.query(s, t)
+            assert d == dist[t]
+            if math.isinf(d):
+                assert path == []
+            else:
+                assert path[0] == s and path[-1] == t
+                assert _path_length(graph, path) == d
+
+
+def test_consultas_igual_que_dijkstra():
+    rnd = random.Random(11)
+    for trial in range(60):
+        graph = _random_graph(rnd, directed=trial % 2 == 0)
+        _check(graph, ContractionHierarchy.build(graph), rnd)
+
+
+def test_consultas_despues_de_guardar_y_cargar(tmp_path):
+    rnd = random.Random(12)
+    for trial in range(10):
+        graph = _random_graph(rnd, directed=trial % 2 == 0)
+        path = tmp_path / f"ch{trial}.bin"
+        ContractionHierarchy.build(graph).save(str(path))
+        _check(graph, ContractionHierarchy.load(str(path)), rnd)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de regresión del motor de caminos.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import math
+
+import numpy as np
+
+from motor_caminos import CSRGraph, dijkstra
+from caminos_todos_pares import johnson
+
+
+def _graph_with_inf():
+    # 0 -1- 1 -inf- 2: una arista con peso infinito (parse_edge_text acepta "inf")
+    return CSRGraph.from_arcs(3, [0, 1], [1, 2], [1.0, math.inf], directed=False)
+
+
+def test_integer_max_weight_ignora_pesos_infinitos():
+    assert _graph_with_inf().integer_max_weight() is None
+
+
+def test_dijkstra_con_arista_infinita():
+    graph = _graph_with_inf()
+    assert dijkstra(graph, 0) == dijkstra(graph, 0, queue="heapq")
+    assert dijkstra(graph, 0)[0] == [0.0, 1.0, math.inf]
+
+
+def test_radix_con_pesos_de_mas_de_64_bits():
+    graph = CSRGraph.from_arcs(3, [0, 1], [1, 2], [2.0 ** 70, 3.0], directed=True)
+    assert dijkstra(graph, 0, queue="radix") == dijkstra(graph, 0, queue="heapq")
+
+
+def test_johnson_con_arista_infinita():
+    D, P = johnson(3, [0, 1], [1, 2], [1.0, math.inf])
+    assert D[0, 1] == 1.0
+    assert np.isinf(D[0, 2]) and np.isinf(D[2, 0])
+    assert P[0, 2] == -1
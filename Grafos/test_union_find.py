@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de UnionFind: union_many contra un ciclo de union.
+
+Uso:
+    python -m pytest -q Grafos
+"""
+
+import random
+
+import numpy as np
+
+from union_find import UnionFind, connected_components
+
+
+def _same_state(a, b):
+    assert a.count == b.count
+    groups_a = sorted(a.groups().values())
+    assert groups_a == sorted(b.groups().values())
+    for root, members in a.groups().items():
+        assert a.size[root] == len(members)
+    for root, members in b.groups().items():
+        assert b.size[root] == len(members)
+
+
+def test_union_many_igual_que_union():
+    rnd = random.Random(7)
+    for _ in range(300):
+        n = rnd.randint(1, 80)
+        bulk, loop = UnionFind(n), UnionFind(n)
+        # Unas uniones de a una antes, para que union_many parta de árboles
+        for _ in range(rnd.randint(0, n)):
+            u, v = rnd.randrange(n), rnd.randrange(n)
+            assert bulk.union(u, v) == loop.union(u, v)
+        for _ in range(rnd.randint(1, 3)):
+            m = rnd.randint(0, 2 * n)
+            sources = [rnd.randrange(n) for _ in range(m)]
+            targets = [rnd.randrange(n) for _ in range(m)]
+            merged = bulk.union_many(sources, targets)
+            assert merged == sum(loop.union(u, v) for u, v in zip(sources, targets))
+            _same_state(bulk, loop)
+            for u, v in zip(sources, targets):
+                assert bulk.connected(u, v)
+
+
+def test_union_many_en_cadena_y_estrella():
+    n = 1000
+    chain = UnionFind(n)
+    assert chain.union_many(np.arange(n - 1), np.arange(1, n)) == n - 1
+    assert chain.count == 1 and chain.size[chain.find(0)] == n
+
+    star = UnionFind(n)
+    assert star.union_many(np.zeros(n - 1, dtype=int), np.arange(1, n)) == n - 1
+    assert star.count == 1 and star.size[star.find(n - 1)] == n
+
+
+def test_find_sin_recursion_en_caminos_largos():
+    n = 200_000
+    sets = UnionFind(n)
+    for i in range(n - 1):
+        sets.parent[i] = i + 1
+    assert sets.find(0) == n - 1
+
+
+def test_connected_components_numera_por_nodo_menor():
+    labels, count = connected_components(6, [4, 1], [5, 3])
+    assert count == 4
+    assert labels.tolist() == [0, 1, 2, 1, 3, 3]
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""
+Trazas de pasos compactas para los visualizadores paso a paso.
+
+En lugar de guardar en cada paso una copia completa de visited, dist y
+prev (memoria O(V²)), DijkstraTrace guarda solo lo que CAMBIA en cada
+iteración:
+
+- el nodo fijado (current),
+- las relajaciones hechas (v, dist_antes, dist_candidata, cambió),
+- el prev anterior de cada entrada que cambió (para poder deshacer).
+
+Además guarda checkpoints completos cada `checkpoint_every` pasos.
+Ir al paso k = avanzar/retroceder desde la posición actual aplicando o
+deshaciendo deltas, o bien partir del checkpoint más cercano, lo que
+salga más barato. Con checkpoint_every ~ V/16 la memoria total queda
+lineal: O(V + E).
+
+Producción perezosa de pasos (protocolo común de los visualizadores):
+
+- forward(): devuelve el siguiente paso, pidiéndolo al generador solo
+  cuando hace falta; None si ya no hay más.
+- back(): devuelve el paso anterior si sigue disponible; None si no.
+- index / current: número y contenido del paso actual.
+
+StepProducer lo implementa sobre cualquier generador de pasos con un
+historial acotado (los últimos `history` pasos). DijkstraTrace lo
+implementa sobre su propio registro de deltas, que ya es lineal.
+
+MatrixTrace hace lo mismo para los algoritmos sobre matrices n x n
+(Floyd, Warshall): cada paso k guarda solo las celdas que cambiaron en un
+arreglo estructurado de NumPy (i, j, valor anterior, valor nuevo) y las
+matrices se reconstruyen en el cursor aplicando o deshaciendo deltas.
+Antes cada paso copiaba las matrices completas y un dict por celda:
+O(n³) objetos en total.
+"""
+
+from collections import deque
+import math
+import sys
+
+import numpy as np
+
+
+class StepProducer:
+    def __init__(self, steps, history=64):
+        self._steps = iter(steps)
+        self._history = deque(maxlen=history)
+        self._first = 0      # número de paso del elemento más viejo del historial
+        self.index = -1
+        self.done = False
+
+    @property
+    def current(self):
+        if self.index < self._first:
+            return None
+        return self._history[self.index - self._first]
+
+    def forward(self):
+        if self.index < self._first + len(self._history) - 1:
+            self.index += 1
+            return self.current
+
+        if self.done:
+            return None
+        try:
+            step = next(self._steps)
+        except StopIteration:
+            self.done = True
+            return None
+
+        if len(self._history) == self._history.maxlen:
+            self._first += 1
+        self._history.append(step)
+        self.index += 1
+        return step
+
+    def back(self):
+        if self.index - 1 < self._first:
+            return None
+        self.index -= 1
+        return self.current
+
+
+class DijkstraTrace:
+    def __init__(self, nodes, source, checkpoint_every=None, events=None):
+        """
+        events: iterable opcional de (current, updates). Si se da, los
+        pasos se graban a medida que forward() los necesita.
+        """
+        self.nodes = list(nodes)
+        self.source = source
+        if checkpoint_every is None:
+            checkpoint_every = max(32, len(self.nodes) // 16)
+        self.checkpoint_every = checkpoint_every
+
+        dist = {n: math.inf for n in self.nodes}
+        prev = {n: None for n in self.nodes}
+        dist[source] = 0.0
+
+        # deltas[k - 1] describe el paso k: (current, updates, old_prevs)
+        self._deltas = []
+        self._checkpoints = {0: (dist.copy(), prev.copy(), frozenset())}
+
+        # Estado al final de lo grabado (para crear checkpoints)
+        self._tail = (dist.copy(), prev.copy(), set())
+
+        # Estado en la posición del cursor (lo que se muestra)
+        self._pos = 0
+        self._dist = dist
+        self._prev = prev
+        self._visited = set()
+
+        self._events = iter(events) if events is not None else iter(())
+        self.index = -1
+        self.done = events is None
+
+        self._nbytes = 3 * self._checkpoint_nbytes()
+
+    # -----------------------------------------------------------
+    # Grabación
+    # -----------------------------------------------------------
+    def record(self, current, updates):
+        """
+        Agrega un paso: current es el nodo fijado y updates la lista de
+        (v, dist_antes, dist_candidata, cambió) de esa iteración.
+        """
+        dist, prev, visited = self._tail
+        old_prevs = []
+        for v, old, new, changed in updates:
+            if changed:
+                old_prevs.append(prev[v])
+                dist[v] = new
+                prev[v] = current
+        visited.add(current)
+
+        self._deltas.append((current, tuple(updates), tuple(old_prevs)))
+        self._nbytes += 120 + 90 * len(updates)
+
+        k = len(self._deltas)
+        if k % self.checkpoint_every == 0:
+            self._checkpoints[k] = (dist.copy(), prev.copy(), frozenset(visited))
+            self._nbytes += self._checkpoint_nbytes()
+
+    def _checkpoint_nbytes(self):
+        return 2 * sys.getsizeof(self._tail[0]) + sys.getsizeof(frozenset(self._tail[2]))
+
+    def nbytes(self):
+        """Memoria aproximada de la traza grabada hasta ahora (para cachés)."""
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._deltas) + 1
+
+    def _pull(self):
+        """Graba un paso más desde events; False si ya no hay."""
+        if self.done:
+            return False
+        try:
+            current, updates = next(self._events)
+        except StopIteration:
+            self.done = True
+            return False
+        self.record(current, updates)
+        return True
+
+    # -----------------------------------------------------------
+    # Protocolo de productor de pasos
+    # -----------------------------------------------------------
+    @property
+    def current(self):
+        if self.index < 0:
+            return None
+        return self[self.index]
+
+    def forward(self):
+        if self.index + 1 >= len(self) and not self._pull():
+            return None
+        self.index += 1
+        return self[self.index]
+
+    def back(self):
+        if self.index <= 0:
+            return None
+        self.index -= 1
+        return self[self.index]
+
+    def rewind(self):
+        """Vuelve antes del paso 0 (la traza grabada se conserva)."""
+        self.index = -1
+
+    # -----------------------------------------------------------
+    # Navegación
+    # -----------------------------------------------------------
+    def _apply(self, k):
+        current, updates, _ = self._deltas[k - 1]
+        for v, old, new, changed in updates:
+            if changed:
+                self._dist[v] = new
+                self._prev[v] = current
+        self._visited.add(current)
+
+    def _undo(self, k):
+        current, updates, old_prevs = self._deltas[k - 1]
+        changed_updates = [u for u in updates if u[3]]
+        for (v, old, new, changed), p in zip(reversed(changed_updates), reversed(old_prevs)):
+            self._dist[v] = old
+            self._prev[v] = p
+        self._visited.discard(current)
+
+    def seek(self, k):
+        """Deja el cursor en el paso k (0 <= k < len(self))."""
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+
+        base = k - k % self.checkpoint_every
+        cost_from_cursor = abs(k - self._pos)
+        cost_from_checkpoint = (k - base) + len(self.nodes) // 8
+
+        if cost_from_checkpoint < cost_from_cursor:
+            dist, prev, visited = self._checkpoints[base]
+            self._dist = dist.copy()
+            self._prev = prev.copy()
+            self._visited = set(visited)
+            self._pos = base
+
+        while self._pos < k:
+            self._pos += 1
+            self._apply(self._pos)
+        while self._pos > k:
+            self._undo(self._pos)
+            self._pos -= 1
+
+    def __getitem__(self, k):
+        """
+        Paso k con el mismo formato que usa DijkstraApp:
+        action, iter_num, current, visited, dist, prev, updates,
+        highlight_edges.
+
+        visited, dist y prev son el estado del cursor (no copias): son
+        válidos hasta la siguiente llamada a seek()/[].
+        """
+        if k < 0:
+            k += len(self)
+        self.seek(k)
+
+        if k == 0:
+            return {
+                "action": "init",
+                "iter_num": 0,
+                "current": None,
+                "visited": self._visited,
+                "dist": self._dist,
+                "prev": self._prev,
+                "updates": [],
+                "highlight_edges": []
+            }
+
+        current, updates, _ = self._deltas[k - 1]
+        return {
+            "action": "iter",
+            "iter_num": k,
+            "current": current,
+            "visited": self._visited,
+            "dist": self._dist,
+            "prev": self._prev,
+            "updates": list(updates),
+            "highlight_edges": [(current, v) for v, _, _, changed in updates if changed]
+        }
+
+
+class MatrixTrace:
+    def __init__(self, matrices, labels, events=()):
+        """
+        matrices: {nombre: matriz inicial n x n de NumPy} (se copian).
+        labels: nombres de los nodos, para k_node.
+        events: iterable de (k, i, j, old, new): i, j son arreglos con las
+        celdas que cambiaron con el pivote k; old / new son tuplas con un
+        arreglo de valores por matriz, en el orden de `matrices`.
+        """
+        self.names = list(matrices)
+        self.labels = list(labels)
+        self._state = {name: np.array(m, copy=True) for name, m in matrices.items()}
+
+        fields = [("i", np.int32), ("j", np.int32)]
+        for name in self.names:
+            dtype = self._state[name].dtype
+            fields += [("old_" + name, dtype), ("new_" + name, dtype)]
+        self.dtype = np.dtype(fields)
+
+        # deltas[s - 1] describe el paso s: (k, registros)
+        self._deltas = []
+        self._pos = 0
+
+        self._events = iter(events)
+        self.index = -1
+        self.done = False
+
+    # -----------------------------------------------------------
+    # Grabación
+    # -----------------------------------------------------------
+    def record(self, k, i, j, old, new):
+        updates = np.empty(len(i), dtype=self.dtype)
+        updates["i"] = i
+        updates["j"] = j
+        for name, o, v in zip(self.names, old, new):
+            updates["old_" + name] = o
+            updates["new_" + name] = v
+        self._deltas.append((k, updates))
+
+    def nbytes(self):
+        """Memoria de las matrices del cursor más la de los deltas grabados."""
+        size = sum(m.nbytes for m in self._state.values())
+        return size + sum(64 + updates.nbytes for _, updates in self._deltas)
+
+    def __len__(self):
+        return len(self._deltas) + 1
+
+    def _pull(self):
+        if self.done:
+            return False
+        try:
+            self.record(*next(self._events))
+        except StopIteration:
+            self.done = True
+            return False
+        return True
+
+    # -----------------------------------------------------------
+    # Protocolo de productor de pasos
+    # -----------------------------------------------------------
+    @property
+    def current(self):
+        if self.index < 0:
+            return None
+        return self[self.index]
+
+    def forward(self):
+        if self.index + 1 >= len(self) and not self._pull():
+            return None
+        self.index += 1
+        return self[self.index]
+
+    def back(self):
+        if self.index <= 0:
+            return None
+        self.index -= 1
+        return self[self.index]
+
+    def rewind(self):
+        """Vuelve antes del paso 0 (la traza grabada se conserva)."""
+        self.index = -1
+
+    # -----------------------------------------------------------
+    # Navegación
+    # -----------------------------------------------------------
+    def _write(self, s, side):
+        updates = self._deltas[s - 1][1]
+        rows, cols = updates["i"], updates["j"]
+        for name in self.names:
+            self._state[name][rows, cols] = updates[side + name]
+
+    def seek(self, s):
+        """Deja las matrices del cursor en el paso s (0 <= s < len(self))."""
+        if not 0 <= s < len(self):
+            raise IndexError(s)
+        while self._pos < s:
+            self._pos += 1
+            self._write(self._pos, "new_")
+        while self._pos > s:
+            self._write(self._pos, "old_")
+            self._pos -= 1
+
+    def __getitem__(self, s):
+        """
+        Paso s: action ("init" / "k_step"), k_index, k_node, una entrada
+        por matriz y updates (arreglo estructurado de las celdas que
+        cambiaron). Las matrices son las del cursor (no copias): son
+        válidas hasta la siguiente llamada a seek()/[].
+        """
+        if s < 0:
+            s += len(self)
+        self.seek(s)
+
+        if s == 0:
+            step = {"action": "init", "k_index": None, "k_node": None,
+                    "updates": np.empty(0, dtype=self.dtype)}
+        else:
+            k, updates = self._deltas[s - 1]
+            step = {"action": "k_step", "k_index": k, "k_node": self.labels[k],
+                    "updates": updates}
+        step.update(self._state)
+        return step
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Union-Find (conjuntos disjuntos) sobre índices enteros 0..n-1.
+
+- parent y size son array('i'): 4 bytes por nodo cada uno, sin
+  diccionarios por nombre. NumPy los ve sin copiar (np.frombuffer).
+- find es iterativo con compresión por mitades (path halving): cada nodo
+  del camino pasa a apuntar a su abuelo. No hay recursión, así que no
+  importa qué tan largo sea el camino.
+- union une por tamaño: la raíz del conjunto chico cuelga de la del
+  grande, y la altura de los árboles queda en O(log n).
+- union_many une muchos pares de una vez con NumPy (ver su docstring).
+
+Uso:
+    sets = UnionFind(n)
+    sets.union(u, v)                   # True si eran conjuntos distintos
+    sets.find(u), sets.connected(u, v)
+    sets.union_many(sources, targets)  # número de uniones hechas
+    labels, count = connected_components(n, sources, targets)
+"""
+
+from array import array
+
+import numpy as np
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = array("i", range(n))
+        self.size = array("i", [1]) * n
+        self.count = n          # número de conjuntos
+
+    def __len__(self):
+        return len(self.parent)
+
+    def nbytes(self):
+        return (len(self.parent) + len(self.size)) * self.parent.itemsize
+
+    # -----------------------------------------------------------
+    # Operaciones de a una
+    # -----------------------------------------------------------
+    def find(self, x):
+        parent = self.parent
+        p = parent[x]
+        while p != x:
+            g = parent[p]
+            parent[x] = g
+            x, p = g, parent[g]
+        return x
+
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
+
+    def union(self, x, y):
+        """Une los conjuntos de x e y; False si ya eran el mismo."""
+        rx, ry = self.find(x), self.find(y)
+        if rx == ry:
+            return False
+        size = self.size
+        if size[rx] < size[ry]:
+            rx, ry = ry, rx
+        self.parent[ry] = rx
+        size[rx] += size[ry]
+        self.count -= 1
+        return True
+
+    # -----------------------------------------------------------
+    # Operaciones en bloque (NumPy)
+    # -----------------------------------------------------------
+    def _views(self):
+        return (np.frombuffer(self.parent, dtype=np.intc),
+                np.frombuffer(self.size, dtype=np.intc))
+
+    def _roots(self, parent, x):
+        """
+        Raíces de los nodos x. Los x que no llegaron saltan a su abuelo a
+        la vez: si los nodos del camino también están en x (como las
+        raíces que union_many cuelga en una ronda) la distancia se reduce
+        a la mitad en cada vuelta.
+        """
+        roots = parent[x]
+        todo = np.flatnonzero(parent[roots] != roots)
+        while len(todo):
+            g = parent[roots[todo]]
+            parent[x[todo]] = g
+            roots[todo] = g
+            todo = todo[parent[g] != g]
+        return roots
+
+    def union_many(self, sources, targets):
+        """
+        Une los pares (sources[k], targets[k]) y devuelve cuántas uniones
+        hubo (cuántos conjuntos desaparecieron). El resultado es el mismo
+        que llamar union par por par, aunque las raíces elegidas pueden
+        ser otras.
+
+        Por rondas: se buscan las raíces de los pares que quedan; en los
+        pares con raíces distintas, la raíz menor según (tamaño, índice)
+        se cuelga de la mayor entre todas sus parejas. Como el orden no
+        cambia durante la llamada, no se forman ciclos; los tamaños se
+        suman al final. Usa un arreglo auxiliar de n enteros de 8 bytes.
+        """
+        parent, size = self._views()
+        n = len(parent)
+        a = np.asarray(sources, dtype=np.intp)
+        b = np.asarray(targets, dtype=np.intp)
+        best = None     # mayor clave de pareja por raíz chica (-1 = ninguna)
+        hooked = []
+        while len(a):
+            a, b = self._roots(parent, a), self._roots(parent, b)
+            apart = a != b
+            a, b = a[apart], b[apart]
+            if not len(a):
+                break
+            key_a = size[a].astype(np.int64) * n + a
+            key_b = size[b].astype(np.int64) * n + b
+            swap = key_a > key_b
+            small = np.where(swap, b, a)
+            big_key = np.where(swap, key_a, key_b)
+            if best is None:
+                best = np.full(n, -1, dtype=np.int64)
+            np.maximum.at(best, small, big_key)
+            parent[small] = best[small] % n
+            best[small] = -1
+            hooked.append(small)
+            a, b = small, np.where(swap, a, b)
+
+        if not hooked:
+            return 0
+        # Cada raíz colgada una sola vez: queda la posición que escribió al final
+        hooked = np.concatenate(hooked)
+        positions = np.arange(len(hooked))
+        best[hooked] = positions
+        hooked = hooked[best[hooked] == positions]
+        np.add.at(size, self._roots(parent, hooked), size[hooked])
+        self.count -= len(hooked)
+        return len(hooked)
+
+    def labels(self):
+        """Arreglo con la raíz de cada nodo (comprime todos los caminos)."""
+        parent, _ = self._views()
+        return self._roots(parent, np.arange(len(parent), dtype=np.intp))
+
+    def groups(self):
+        """{raíz: [nodos]} con los nodos de cada conjunto en orden creciente."""
+        labels = self.labels()
+        order = np.argsort(labels, kind="stable")
+        roots, starts = np.unique(labels[order], return_index=True)
+        members = np.split(order, starts[1:])
+        return {int(r): m.tolist() for r, m in zip(roots, members)}
+
+
+def connected_components(n, sources, targets):
+    """
+    (labels, count): componentes conexas del grafo no dirigido con
+    aristas (sources[k], targets[k]), numeradas 0..count-1 en el orden de
+    su nodo más chico.
+    """
+    sets = UnionFind(n)
+    sets.union_many(sources, targets)
+    # np.unique numera por raíz; se renumera por el primer nodo de cada una
+    _, first, labels = np.unique(sets.labels(), return_index=True, return_inverse=True)
+    rank = np.empty(sets.count, dtype=np.intp)
+    rank[np.argsort(first)] = np.arange(sets.count)
+    return rank[labels.ravel()], sets.count